@@ -0,0 +1,196 @@
+"""
+基准测试：点名动画每一帧的耗时
+
+对比两种做法：
+- 旧做法：每帧重新设置整段样式表，并在帧内从名单中随机抽取姓名
+- 新做法：样式通过动态属性一次设置好，动画开始前生成全部帧，每帧只切换文字
+
+每帧都调用 grab() 把标签绘制到图像，包含样式重新应用和绘制的耗时。
+
+另外测量事件循环繁忙（每 400ms 阻塞 250ms）时动画的实际总时长：
+按计时器触发次数计数的旧做法会被拖长，按经过时间推进的 RollCallAnimation 保持设定时长。
+
+运行: python benchmarks/bench_animation.py [--size 100000]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from PyQt6.QtCore import QElapsedTimer, QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication, QLabel
+
+from roll_call_animation import RollCallAnimation
+
+ROLLING_STYLE = """
+    QLabel {
+        background-color: #f45d48;
+        border: 4px solid #232323;
+        border-radius: 20px;
+        padding: 40px;
+        color: #fffffe;
+        font-size: 32px;
+        font-weight: bold;
+        qproperty-alignment: 'AlignCenter';
+    }
+"""
+PROPERTY_STYLE = """
+    QLabel {
+        background-color: #fffffe;
+        border: 4px solid #078080;
+        border-radius: 20px;
+        padding: 40px;
+        color: #232323;
+        qproperty-alignment: 'AlignCenter';
+    }
+    QLabel[state="rolling"] {
+        background-color: #f45d48;
+        border-color: #232323;
+        color: #fffffe;
+        font-size: 32px;
+        font-weight: bold;
+    }
+"""
+FRAMES = 30
+NUM = 3
+
+
+def old_frame(label, students, counter):
+    """旧做法的一帧"""
+    if counter < 10:
+        text = "正在随机点名..."
+    elif counter < 20:
+        text = "\n".join(random.choices(students, k=min(3, len(students)))[:NUM])
+    else:
+        random.choices(students, k=min(5, len(students)))  # 结果未使用
+        text = "\n".join(random.sample(students, min(NUM, len(students))))
+    label.setText(text)
+    label.setStyleSheet(ROLLING_STYLE)
+    label.grab()
+
+
+def new_frames(student_ids, names):
+    """新做法：动画开始前一次生成全部帧"""
+    frames = ["正在随机点名..."] * 10
+    picked = random.choices(student_ids, k=10 * NUM)
+    frames.extend(
+        "\n".join(names[sid] for sid in picked[i : i + NUM])
+        for i in range(0, len(picked), NUM)
+    )
+    frames.extend(
+        "\n".join(names[sid] for sid in random.sample(student_ids, NUM))
+        for _ in range(FRAMES - 20)
+    )
+    return frames
+
+
+def per_frame_ms(run) -> tuple:
+    times = []
+    for counter in range(FRAMES):
+        start = time.perf_counter()
+        run(counter)
+        times.append((time.perf_counter() - start) * 1000)
+    return sum(times) / len(times), max(times)
+
+
+def busy_event_loop(duration_ms: int):
+    """在 duration_ms 内每 400ms 阻塞事件循环 250ms"""
+    for delay in range(200, duration_ms, 400):
+        QTimer.singleShot(delay, lambda: time.sleep(0.25))
+
+
+def run_until(done) -> None:
+    loop = QEventLoop()
+    done.connect(loop.quit)
+    loop.exec()
+
+
+def counted_timer_ms(frames: int, interval_ms: int) -> int:
+    """旧做法：QTimer 每 interval_ms 触发一次，数满 frames 次结束"""
+    timer = QTimer()
+    elapsed = QElapsedTimer()
+    ticks = [0]
+
+    def tick():
+        ticks[0] += 1
+        if ticks[0] >= frames:
+            timer.stop()
+            loop.quit()
+
+    loop = QEventLoop()
+    timer.timeout.connect(tick)
+    busy_event_loop(frames * interval_ms)
+    elapsed.start()
+    timer.start(interval_ms)
+    loop.exec()
+    return elapsed.elapsed()
+
+
+def timed_animation_ms(frames, duration_ms: int) -> tuple:
+    """新做法：RollCallAnimation 按经过的时间推进"""
+    animation = RollCallAnimation()
+    animation.duration_ms = duration_ms
+    busy_event_loop(duration_ms)
+    animation.start(frames)
+    run_until(animation.finished)
+    return animation.elapsed_ms, len(animation.frame_timer.work)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量点名动画每帧的耗时")
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)  # noqa: F841
+    random.seed(0)
+    names = [f"学生{i}" for i in range(args.size)]
+    student_ids = list(range(args.size))
+
+    print(f"名单人数: {args.size}，每次动画 {FRAMES} 帧")
+    print(f"{'做法':<28} {'平均(ms/帧)':>12} {'最长(ms)':>10}")
+
+    old_label = QLabel("等待点名...")
+    old_label.resize(400, 300)
+    old_label.show()
+    old_frame(old_label, names, 0)  # 预热：首次加载字体等一次性开销不计入
+    avg, worst = per_frame_ms(lambda counter: old_frame(old_label, names, counter))
+    print(f"{'每帧设置样式表 + 帧内抽取':<28} {avg:>12.3f} {worst:>10.3f}")
+
+    new_label = QLabel("等待点名...")
+    new_label.resize(400, 300)
+    new_label.setStyleSheet(PROPERTY_STYLE)
+    new_label.show()
+    for state in ("rolling", "idle"):  # 预热，同上
+        new_label.setProperty("state", state)
+        new_label.style().unpolish(new_label)
+        new_label.style().polish(new_label)
+        new_label.grab()
+    start = time.perf_counter()
+    frames = new_frames(student_ids, names)
+    generate = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    new_label.setProperty("state", "rolling")
+    new_label.style().unpolish(new_label)
+    new_label.style().polish(new_label)
+    polish = (time.perf_counter() - start) * 1000
+
+    def new_frame(counter):
+        new_label.setText(frames[counter])
+        new_label.grab()
+
+    avg, worst = per_frame_ms(new_frame)
+    print(f"{'动态属性 + 预生成帧':<28} {avg:>12.3f} {worst:>10.3f}")
+    print(f"动画开始前：预生成 {FRAMES} 帧 {generate:.3f} ms，切换样式 {polish:.3f} ms")
+
+    print("\n事件循环繁忙时 3 秒动画的实际时长")
+    print(f"计时器计数 30 次: {counted_timer_ms(FRAMES, 100)} ms")
+    elapsed, shown = timed_animation_ms(frames, 3000)
+    print(f"按经过时间推进: {elapsed} ms（显示 {shown}/{FRAMES} 帧）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+基准测试：批量抽取（NumPy）与逐次抽取的吞吐量对比
+
+测量每秒可完成的抽取次数，以及把大名单随机分组的耗时。
+
+运行: python benchmarks/bench_batch_draw.py [--draws 1000000]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from batch_draw import fairness_summary, simulate_draws, split_groups
+from roster import id_array
+from selection_engine import SelectionEngine
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def rate(draws: int, seconds: float) -> str:
+    return f"{draws / seconds:>14,.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量批量抽取的吞吐量")
+    parser.add_argument("--draws", type=int, default=1_000_000)
+    parser.add_argument("--loop-draws", type=int, default=20_000)
+    parser.add_argument("--class-size", type=int, default=40)
+    parser.add_argument("--group-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    student_ids = id_array(range(args.class_size))
+    draws = args.draws
+    loop_draws = args.loop_draws
+    print(f"班级 {args.class_size} 人，批量抽取 {draws:,} 次，逐次抽取 {loop_draws:,} 次")
+    print(f"{'方法':<34} {'每秒抽取次数':>14}")
+    for count, unique in ((1, True), (5, True), (5, False), (30, True)):
+        label = f"每次 {count} 人{'不重复' if unique else '可重复'}"
+        batch = timed(lambda: simulate_draws(student_ids, draws, count, "random", unique))
+        loop = timed(
+            lambda: [
+                random.sample(student_ids, count)
+                if unique
+                else random.choices(student_ids, k=count)
+                for _ in range(loop_draws)
+            ]
+        )
+        print(f"{'NumPy 批量, ' + label:<34} {rate(draws, batch)}")
+        print(f"{'random 逐次, ' + label:<34} {rate(loop_draws, loop)}")
+
+    engine = SelectionEngine()
+    engine_loop = timed(
+        lambda: [
+            engine.select("班级", "deck", student_ids, 5, True) for _ in range(loop_draws)
+        ]
+    )
+    deck_batch = timed(lambda: simulate_draws(student_ids, draws, 5, "deck"))
+    print(f"{'NumPy 批量, 轮流点名 5 人':<34} {rate(draws, deck_batch)}")
+    print(f"{'抽取引擎逐次, 轮流点名 5 人':<34} {rate(loop_draws, engine_loop)}")
+
+    results = simulate_draws(student_ids, draws, 1, "random", seed=0)
+    summary = fairness_summary(student_ids, results)
+    print(
+        f"\n{draws:,} 次单人抽取的公平性: 每人 {summary['min']}-{summary['max']} 次，"
+        f"平均 {summary['mean']:.0f}，标准差 {summary['std']:.1f}"
+    )
+
+    roster = id_array(range(args.group_size))
+    grouping = timed(lambda: split_groups(roster, 1000))
+    shuffled = timed(lambda: random.sample(list(roster), len(roster)))
+    print(f"\n{args.group_size:,} 人分成 1000 组: NumPy {grouping * 1000:.1f} ms，"
+          f"random.sample 洗牌 {shuffled * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+基准测试：从文件夹批量导入 200 个班级
+
+- 解析：当前进程依次解析 与 进程池并行解析（spawn 启动，含进程启动开销）
+- 保存：逐个班级写入并保存（相当于逐个导入）与 DataStorage.import_classes 一次保存
+
+运行: python benchmarks/bench_bulk_import.py [--classes 200] [--class-size 45] [--workers N]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from bulk_import import collect_classes, list_class_files, parse_class_files
+from data_storage import DataStorage
+
+
+def create_class_files(folder: str, classes: int, class_size: int):
+    """生成 classes 个班级名单工作簿，第一列为姓名"""
+    import openpyxl
+
+    for c in range(classes):
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(["姓名", "学号"])
+        for i in range(class_size):
+            sheet.append([f"学生{c}_{i}", 20240000 + c * 100 + i])
+        workbook.save(os.path.join(folder, f"{c + 1:03d}班.xlsx"))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def save_one_by_one(data_dir: str, classes: dict) -> float:
+    """每导入一个班级保存一次"""
+    storage = DataStorage(data_dir)
+    start = time.perf_counter()
+    for class_name, names in classes.items():
+        storage.classes[class_name] = storage.roster.add_students(names)
+        storage.selection.students_changed(class_name)
+        storage.save_classes()
+        storage.save_selection_state()
+    return time.perf_counter() - start
+
+
+def save_batched(data_dir: str, classes: dict) -> float:
+    storage = DataStorage(data_dir)
+    start = time.perf_counter()
+    storage.import_classes(classes)
+    storage.flush()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量批量导入班级的耗时")
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument("--class-size", type=int, default=45)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    import openpyxl  # noqa: F401
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        folder = os.path.join(work_dir, "classes")
+        os.makedirs(folder)
+        create_class_files(folder, args.classes, args.class_size)
+        paths = list_class_files(folder)
+        workers = args.workers or os.cpu_count()
+        print(f"{len(paths)} 个班级文件，每班 {args.class_size} 人，CPU {os.cpu_count()} 核")
+
+        sequential, seconds = timed(lambda: parse_class_files(paths, workers=1))
+        print(f"当前进程依次解析:        {seconds:.2f}s")
+        if workers > 1:
+            pooled, seconds = timed(lambda: parse_class_files(paths, workers=workers))
+            print(f"进程池解析（{workers} 个进程）: {seconds:.2f}s")
+            assert pooled == sequential
+        else:
+            print("只有 1 个 CPU 核，不测量进程池（--workers 可指定进程数）")
+
+        classes, skipped = collect_classes(sequential)
+        print(f"可导入 {len(classes)} 个班级，跳过 {len(skipped)} 个")
+
+        one_by_one = save_one_by_one(os.path.join(work_dir, "data1"), classes)
+        batched = save_batched(os.path.join(work_dir, "data2"), classes)
+        print(f"逐个班级保存:  {one_by_one * 1000:.0f} ms（{len(classes)} 次写入）")
+        print(f"一次批量保存:  {batched * 1000:.0f} ms（1 次写入）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+基准测试：导入缓存
+
+对同一个工作簿依次测量：
+- 首次导入（解析并写入缓存）
+- 未修改再次导入（大小和修改时间一致，直接读缓存）
+- 只更新了修改时间（如复制、重新保存但内容未变：核对内容哈希后读缓存）
+- 修改了一行（重新解析）
+- 不使用缓存的导入
+最后用较小的总大小上限连续导入多个文件，检查按最近使用时间淘汰。
+
+运行: python benchmarks/bench_import_cache.py [--rows 100000]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from bench_excel_import import create_workbook
+from excel_importer import ExcelImporter
+from import_cache import ImportCache
+
+
+def timed_import(path: str):
+    start = time.perf_counter()
+    names = ExcelImporter.import_from_file(path)
+    return names, (time.perf_counter() - start) * 1000
+
+
+def edit_one_row(path: str):
+    """把第一名学生改名后另存，保持文件修改时间晚于缓存"""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path)
+    workbook.active.cell(row=2, column=1, value="改名的学生")
+    workbook.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量导入缓存的效果")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    import openpyxl  # noqa: F401
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "roster.xlsx")
+        create_workbook(path, args.rows)
+        # 让文件修改时间早于缓存写入时间足够久，模拟平时“几天前保存的名单”
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+
+        cache = ImportCache(os.path.join(work_dir, "cache"))
+        ExcelImporter.cache = cache
+        print(f"名单 {args.rows} 行，文件 {os.path.getsize(path) / 1024:.0f}KB")
+
+        names, ms = timed_import(path)
+        print(f"首次导入（写入缓存）: {ms:>9.1f} ms，缓存 {cache.total_bytes() / 1024:.0f}KB")
+        cached, ms = timed_import(path)
+        assert cached == names
+        print(f"未修改，再次导入:     {ms:>9.1f} ms")
+
+        os.utime(path, (old + 60, old + 60))
+        cached, ms = timed_import(path)
+        assert cached == names
+        print(f"只改了修改时间:       {ms:>9.1f} ms（核对内容哈希）")
+
+        edit_one_row(path)
+        edited, ms = timed_import(path)
+        assert edited[0] == "改名的学生" and edited[1:] == names[1:]
+        print(f"修改一行后导入:       {ms:>9.1f} ms（重新解析）")
+
+        ExcelImporter.cache = None
+        _, ms = timed_import(path)
+        print(f"不使用缓存:           {ms:>9.1f} ms")
+        print(f"命中 {cache.hits} 次，未命中 {cache.misses} 次")
+
+        # 淘汰：上限约能放下 3 个文件的缓存，导入 5 个文件后再使用第 3 个和第 1 个
+        small_dir = os.path.join(work_dir, "small")
+        paths = []
+        for i in range(5):
+            small = os.path.join(work_dir, f"class{i}.xlsx")
+            create_workbook(small, 2000)
+            os.utime(small, (old, old))
+            paths.append(small)
+        probe = ImportCache(os.path.join(work_dir, "probe"))
+        ExcelImporter.cache = probe
+        ExcelImporter.import_from_file(paths[0])
+        entry_bytes = probe.total_bytes()
+        ExcelImporter.cache = ImportCache(small_dir, entry_bytes * 3 + entry_bytes // 2)
+        for small in paths:
+            ExcelImporter.import_from_file(small)
+            time.sleep(0.01)  # 保证缓存文件的修改时间互不相同
+        ExcelImporter.import_from_file(paths[2])  # 命中，成为最近使用
+        ExcelImporter.import_from_file(paths[0])  # 已被淘汰，重新解析
+        cache = ExcelImporter.cache
+        print(
+            f"\n上限 {cache.max_bytes / 1024:.0f}KB（约 3 个文件）导入 5 个文件后: "
+            f"缓存 {len(os.listdir(small_dir))} 个文件 {cache.total_bytes() / 1024:.0f}KB，"
+            f"重新使用第 3 个和第 1 个: 命中 {cache.hits} 次，未命中 {cache.misses} 次"
+        )
+
+
+if __name__ == "__main__":
+    main()
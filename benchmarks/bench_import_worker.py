@@ -0,0 +1,137 @@
+"""
+基准测试：导入大名单时界面线程的响应
+
+界面线程上运行一个每 10ms 触发的计时器，记录相邻两次触发的最长间隔（即界面最长卡住的时间）：
+- 旧做法：在界面线程直接读取并验证
+- 新做法：ImportWorker 在 QThreadPool 中读取并验证，界面线程只处理进度信号
+
+另外测量读取开始（收到第一个进度信号）0.5 秒后请求取消，到收到 cancelled 信号的延迟。
+openpyxl 打开工作簿（读取共享字符串表）期间无法中断，取消要等到开始逐行读取后才生效。
+
+运行: python benchmarks/bench_import_worker.py [--rows 200000]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from PyQt6.QtCore import QEventLoop, QThreadPool, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from bench_excel_import import create_workbook
+from excel_importer import ExcelImporter
+from import_worker import ImportWorker
+
+HEARTBEAT_MS = 10
+
+
+class Heartbeat:
+    """记录界面线程计时器相邻两次触发的最长间隔"""
+
+    def __init__(self):
+        self.longest = 0.0
+        self._last = None
+        self._timer = QTimer()
+        self._timer.timeout.connect(self._tick)
+
+    def start(self):
+        self.longest = 0.0
+        self._last = time.perf_counter()
+        self._timer.start(HEARTBEAT_MS)
+
+    def stop(self):
+        self._timer.stop()
+        self._tick()
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.longest = max(self.longest, (now - self._last) * 1000)
+        self._last = now
+
+
+def run_on_gui_thread(path: str, heartbeat: Heartbeat) -> float:
+    """旧做法：计时器启动后在界面线程直接导入"""
+    loop = QEventLoop()
+
+    def work():
+        names = ExcelImporter.import_from_file(path)
+        ExcelImporter.summarize_validation(names)
+        loop.quit()
+
+    heartbeat.start()
+    start = time.perf_counter()
+    QTimer.singleShot(0, work)
+    loop.exec()
+    heartbeat.stop()
+    return time.perf_counter() - start
+
+
+def run_in_worker(path: str, heartbeat: Heartbeat, cancel_after_ms: int = None):
+    """新做法：在线程池中导入；返回耗时、进度信号次数、结束方式和取消延迟
+
+    cancel_after_ms 不为 None 时，在收到第一个进度信号后经过该时间请求取消。
+    """
+    loop = QEventLoop()
+    worker = ImportWorker(path)
+    progress = [0]
+    outcome = []
+    cancel_at = []
+
+    def cancel():
+        cancel_at.append(time.perf_counter())
+        worker.cancel()
+
+    def on_progress(*args):
+        progress[0] += 1
+        if progress[0] == 1 and cancel_after_ms is not None:
+            QTimer.singleShot(cancel_after_ms, cancel)
+
+    worker.signals.progress.connect(on_progress)
+    worker.signals.finished.connect(lambda *args: (outcome.append("完成"), loop.quit()))
+    worker.signals.failed.connect(lambda e: (outcome.append(f"失败: {e}"), loop.quit()))
+    worker.signals.cancelled.connect(lambda: (outcome.append("取消"), loop.quit()))
+
+    heartbeat.start()
+    start = time.perf_counter()
+    QThreadPool.globalInstance().start(worker)
+    loop.exec()
+    end = time.perf_counter()
+    heartbeat.stop()
+    cancel_delay = (end - cancel_at[0]) * 1000 if cancel_at else None
+    return end - start, progress[0], outcome[0], cancel_delay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量导入时界面线程的响应")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)  # noqa: F841
+    import openpyxl  # noqa: F401
+    import numpy  # noqa: F401
+
+    heartbeat = Heartbeat()
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "roster.xlsx")
+        create_workbook(path, args.rows)
+        print(f"名单 {args.rows} 行，界面计时器每 {HEARTBEAT_MS}ms 触发一次")
+
+        elapsed = run_on_gui_thread(path, heartbeat)
+        print(f"界面线程直接导入: 耗时 {elapsed:.2f}s，界面最长卡住 {heartbeat.longest:.0f}ms")
+
+        elapsed, signals, outcome, _ = run_in_worker(path, heartbeat)
+        print(
+            f"后台线程导入:     耗时 {elapsed:.2f}s，界面最长卡住 {heartbeat.longest:.0f}ms，"
+            f"进度信号 {signals} 次（{outcome}）"
+        )
+
+        elapsed, _, outcome, delay = run_in_worker(path, heartbeat, cancel_after_ms=500)
+        print(f"读取中途取消:     {outcome}，从请求取消到结束 {delay:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
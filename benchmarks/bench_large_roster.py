@@ -0,0 +1,107 @@
+"""
+基准测试：大名单（最多10万人）下导入、验证、保存、列表显示和点名的耗时
+
+每次修改名单都会触发的操作（保存、列表刷新、点名）应在 100ms 以内才能保持流畅。
+需要 PyQt6 才会测量列表显示（自动使用 offscreen 平台）。
+
+运行: python benchmarks/bench_large_roster.py [--sizes 1000 10000 100000]
+"""
+
+import os
+import sys
+import argparse
+import random
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from data_storage import DataStorage, SQLiteDataStorage
+from excel_importer import ExcelImporter
+from roster import Roster, id_array
+from roster_performance import RosterPerformance
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def make_list_refresh(roster: Roster):
+    """返回按学生 ID 整体刷新学生名单视图的函数；未安装 PyQt6 时返回 None"""
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication, QListView
+        from student_list_model import StudentListModel
+    except ImportError:
+        return None
+
+    app = QApplication.instance() or QApplication([])
+    model = StudentListModel(roster)
+    view = QListView()
+    view.setUniformItemSizes(True)
+    view.setModel(model)
+    view.resize(300, 500)
+    view.show()
+
+    def refresh(student_ids):
+        model.set_student_ids(id_array(student_ids))
+        app.processEvents()
+
+    return refresh
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量大名单下各操作的耗时")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    import numpy  # noqa: F401  预先导入，避免计入验证耗时
+
+    roster = Roster()
+    list_refresh = make_list_refresh(roster)
+    performance = RosterPerformance()
+    budget = RosterPerformance.INTERACTIVE_BUDGET_MS
+
+    print(f"{'人数':>8} {'操作':<14} {'耗时(ms)':>10}")
+    for size in args.sizes:
+        names = [f"学生{i}" for i in range(size)]
+        student_ids = roster.add_students(names)
+        results = {}
+        with tempfile.TemporaryDirectory() as work_dir:
+            roster_file = os.path.join(work_dir, "roster.txt")
+            with open(roster_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(names))
+            results["导入(txt)"] = timed(lambda: ExcelImporter.import_from_file(roster_file))
+            results["验证"] = timed(lambda: ExcelImporter.summarize_validation(names))
+
+            storage = DataStorage(os.path.join(work_dir, "json"))
+            storage.classes = {"大班": storage.roster.add_students(names)}
+            results["保存(JSON)*"] = timed(storage.save_classes)
+
+            sqlite_storage = SQLiteDataStorage(os.path.join(work_dir, "sqlite"))
+            sqlite_storage.classes = {"大班": sqlite_storage.roster.add_students(names)}
+            sqlite_storage.save_classes()
+            sqlite_storage.classes["大班"].extend(
+                sqlite_storage.roster.add_students(["新同学"])
+            )
+            results["保存(SQLite)*"] = timed(sqlite_storage.save_classes)
+
+        if list_refresh is not None:
+            results["列表刷新*"] = timed(lambda: list_refresh(student_ids))
+        results["点名(20人)*"] = timed(
+            lambda: roster.names_of(random.sample(student_ids, min(20, size)))
+        )
+
+        for operation, elapsed in results.items():
+            # 带 * 的是每次修改名单都会发生的操作
+            flag = "  超出预算" if operation.endswith("*") and elapsed > budget else ""
+            print(f"{size:>8} {operation:<14} {elapsed:>10.1f}{flag}")
+            if operation.endswith("*") and size >= performance.MIN_SAMPLE_SIZE:
+                performance.record(operation, size, elapsed)
+
+    print(f"\n按测量结果估算的流畅名单上限: 约 {performance.recommended_limit()} 人")
+
+
+if __name__ == "__main__":
+    main()
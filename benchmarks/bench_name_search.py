@@ -0,0 +1,68 @@
+"""
+基准测试：名单搜索（前缀索引）与逐个扫描名单的耗时对比
+
+模拟在搜索框中逐字输入，测量每次按键的查找耗时，以及索引的建立和增删耗时。
+
+运行: python benchmarks/bench_name_search.py [--size 100000]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from name_index import NameIndex, search_keys
+
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹"
+GIVEN = "伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉兰建国志文"
+LIMIT = 500
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def linear_search(names, prefix, limit):
+    """不使用索引：每次按键扫描整个名单"""
+    prefix = prefix.lower()
+    results = []
+    for name in names:
+        if any(key.startswith(prefix) for key in search_keys(name)):
+            results.append(name)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量名单搜索的耗时")
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    names = [
+        random.choice(SURNAMES) + "".join(random.choices(GIVEN, k=random.randint(1, 2)))
+        for _ in range(args.size)
+    ]
+
+    index = NameIndex()
+    print(f"名单人数: {args.size}")
+    print(f"建立索引: {timed(lambda: index.rebuild(names)):.1f} ms")
+    print(f"追加100人: {timed(lambda: index.add(f'新同学{i}' for i in range(100))):.2f} ms")
+    print(f"删除100人: {timed(lambda: index.remove(names[:100])):.2f} ms")
+
+    print(f"\n{'输入':<8} {'匹配数':>6} {'索引(ms)':>10} {'逐个扫描(ms)':>14}")
+    for query in ["z", "zh", "zhw", "张", "张伟", "zwh", "不存在"]:
+        repeat = 20
+        indexed = timed(lambda: [index.search(query, LIMIT) for _ in range(repeat)]) / repeat
+        scanned = timed(lambda: linear_search(names, query, LIMIT))
+        matches = len(index.search(query, LIMIT))
+        print(f"{query:<8} {matches:>6} {indexed:>10.3f} {scanned:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+基准测试：按姓名保存（旧格式）与按学生 ID 保存（花名册）的内存占用和统计耗时对比
+
+模拟多个班级、每天多次点名的一个学期数据，分别从 JSON 读入后测量内存峰值，
+以及按学生统计被点名次数的耗时。
+
+运行: python benchmarks/bench_roster.py [--students 100000 --draws 20000]
+"""
+
+import os
+import sys
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from roster import Roster, id_array
+
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹"
+GIVEN = "伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉兰建国志文"
+
+
+def make_data(num_students: int, num_classes: int, num_draws: int):
+    """生成旧格式和新格式的 JSON 文本"""
+    names = [
+        random.choice(SURNAMES)
+        + "".join(random.choices(GIVEN, k=random.randint(1, 2)))
+        for _ in range(num_students)
+    ]
+    per_class = num_students // num_classes
+    old_classes = {
+        f"班级{c}": names[c * per_class : (c + 1) * per_class]
+        for c in range(num_classes)
+    }
+    roster, classes = Roster.from_classes(old_classes)
+
+    old_history, new_history = [], []
+    for _ in range(num_draws):
+        student_ids = random.sample(range(len(roster)), 5)
+        meta = {
+            "timestamp": "2024-09-01T08:00:00",
+            "date": "2024-09-01",
+            "time": "08:00:00",
+        }
+        old_history.append({"names": roster.names_of(student_ids), **meta})
+        new_history.append({"ids": student_ids, **meta})
+
+    old_text = json.dumps(
+        {"classes": old_classes, "history": old_history}, ensure_ascii=False
+    )
+    new_text = json.dumps(
+        {
+            "roster": roster.to_dict(),
+            "classes": {name: ids.tolist() for name, ids in classes.items()},
+            "history": new_history,
+        },
+        ensure_ascii=False,
+    )
+    return old_text, new_text
+
+
+def load_old(text: str):
+    data = json.loads(text)
+    return data["classes"], data["history"]
+
+
+def load_new(text: str):
+    data = json.loads(text)
+    roster = Roster.from_dict(data["roster"])
+    classes = {name: id_array(ids) for name, ids in data["classes"].items()}
+    return roster, classes, data["history"]
+
+
+def measure_memory(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比按姓名与按学生 ID 保存名单的开销")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--draws", type=int, default=20_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    old_text, new_text = make_data(args.students, args.classes, args.draws)
+    (old_classes, old_history), old_mb = measure_memory(load_old, old_text)
+    (roster, _, new_history), new_mb = measure_memory(load_new, new_text)
+
+    def count_old():
+        Counter(name for record in old_history for name in record["names"])
+
+    def count_new():
+        counts = Counter(sid for record in new_history for sid in record["ids"])
+        [(roster.name(sid), count) for sid, count in counts.most_common(10)]
+
+    print(f"学生 {args.students} 人，{args.classes} 个班级，点名记录 {args.draws} 条")
+    print(f"{'':<10} {'JSON(KB)':>10} {'内存(MB)':>10} {'统计(ms)':>10}")
+    for label, text, memory_mb, count in (
+        ("按姓名", old_text, old_mb, count_old),
+        ("按学生ID", new_text, new_mb, count_new),
+    ):
+        size_kb = len(text.encode()) / 1024
+        print(f"{label:<10} {size_kb:>10.0f} {memory_mb:>10.1f} {timed(count):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+基准测试：各抽取方式的单次抽取耗时与公平性
+
+耗时部分对比抽取引擎与“每次抽取前扫描历史记录计算权重”的做法；
+公平性部分模拟一个班级连续点名，统计每人被点到次数的差距和两次被点到之间的最长间隔；
+复现部分测量按保存的种子逐条复现点名记录的速度。
+
+运行: python benchmarks/bench_selection.py [--size 100000] [--class-size 40]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from roster import id_array
+from selection_engine import (
+    REPLAY_MATCH,
+    SELECTION_MODES,
+    SelectionEngine,
+    replay_draws,
+)
+
+PICKS_PER_DRAW = 5
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def history_scan_draw(student_ids, history, count):
+    """不使用引擎：每次抽取前扫描全部历史记录，按最近被点到的时间计算权重"""
+    last_seen = {}
+    for position, sid in enumerate(history):
+        last_seen[sid] = position
+    picks = len(history)
+    size = len(student_ids)
+    weights = [
+        1.0 if sid not in last_seen else min(1.0, (picks - last_seen[sid]) / size)
+        for sid in student_ids
+    ]
+    picked = random.choices(student_ids, weights=weights, k=count)
+    history.extend(picked)
+    return picked
+
+
+def bench_speed(size: int, draws: int):
+    student_ids = id_array(range(size))
+    print(f"名单人数: {size}，每次抽取 {PICKS_PER_DRAW} 人，连续抽取 {draws} 次")
+    print(f"{'抽取方式':<24} {'首次(ms)':>10} {'之后每次(ms)':>14}")
+    for mode, title in SELECTION_MODES.items():
+        engine = SelectionEngine()
+        engine.set_seed("班级", 0)
+        first = timed(
+            lambda: engine.select("班级", mode, student_ids, PICKS_PER_DRAW, True)
+        )
+        rest = timed(
+            lambda: [
+                engine.select("班级", mode, student_ids, PICKS_PER_DRAW, True)
+                for _ in range(draws)
+            ]
+        )
+        print(f"{title:<24} {first:>10.2f} {rest / draws:>14.4f}")
+
+    history = []
+    scan = timed(
+        lambda: [
+            history_scan_draw(student_ids, history, PICKS_PER_DRAW) for _ in range(20)
+        ]
+    )
+    print(f"{'扫描历史记录计算权重':<24} {'':>10} {scan / 20:>14.4f}")
+
+
+def bench_fairness(class_size: int, rounds: int, trials: int):
+    student_ids = id_array(range(class_size))
+    draws = class_size * rounds
+    print(
+        f"\n班级 {class_size} 人，每次点 1 人，连续点名 {draws} 次（平均每人 {rounds} 次），"
+        f"{trials} 次模拟的平均值"
+    )
+    print(f"{'抽取方式':<24} {'最少次数':>8} {'最多次数':>8} {'最长间隔':>8}")
+    for mode, title in SELECTION_MODES.items():
+        totals = [0, 0, 0]
+        for trial in range(trials):
+            engine = SelectionEngine()
+            engine.set_seed("班级", trial)
+            counts = [0] * class_size
+            last = [0] * class_size
+            longest_gap = 0
+            for draw in range(1, draws + 1):
+                (sid,) = engine.select("班级", mode, student_ids, 1, True)
+                counts[sid] += 1
+                longest_gap = max(longest_gap, draw - last[sid])
+                last[sid] = draw
+            longest_gap = max([longest_gap] + [draws + 1 - seen for seen in last])
+            totals[0] += min(counts)
+            totals[1] += max(counts)
+            totals[2] += longest_gap
+        low, high, gap = (total / trials for total in totals)
+        print(f"{title:<24} {low:>8.1f} {high:>8.1f} {gap:>8.1f}")
+
+
+def bench_replay(class_size: int, draws: int):
+    student_ids = id_array(range(class_size))
+    print(f"\n复现点名记录：班级 {class_size} 人，每次点 {PICKS_PER_DRAW} 人，{draws} 条记录")
+    print(f"{'抽取方式':<24} {'总耗时(ms)':>10} {'每条(µs)':>10} {'一致':>8}")
+    for mode, title in SELECTION_MODES.items():
+        engine = SelectionEngine()
+        records = []
+        for _ in range(draws):
+            ids, info = engine.draw("班级", mode, student_ids, PICKS_PER_DRAW, True)
+            records.append({"ids": ids, "draw": info})
+        results = []
+        elapsed = timed(
+            lambda: results.extend(replay_draws(records, {"班级": student_ids}))
+        )
+        matched = results.count(REPLAY_MATCH)
+        print(f"{title:<24} {elapsed:>10.1f} {elapsed * 1000 / draws:>10.1f} {matched:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量各抽取方式的耗时与公平性")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--class-size", type=int, default=40)
+    parser.add_argument("--draws", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--replay", type=int, default=10_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    bench_speed(args.size, args.draws)
+    bench_fairness(args.class_size, args.rounds, args.trials)
+    bench_replay(args.class_size, args.replay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+基准测试：启动到首个窗口显示的耗时
+
+在独立子进程中启动程序并测量从进程开始到主窗口显示完成的时间。
+使用 --eager-excel 可在启动前先导入 pandas/openpyxl，模拟延迟导入之前的行为。
+
+运行: python benchmarks/bench_startup.py [--eager-excel] [--runs N]
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+CHILD_SCRIPT = """
+import time
+start = time.perf_counter()
+import sys
+sys.path.insert(0, {src_dir!r})
+if {eager!r}:
+    import pandas, openpyxl
+from PyQt6.QtWidgets import QApplication
+import main
+app = QApplication(sys.argv)
+window = main.RandomRollCallApp()
+window.show()
+app.processEvents()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def run_once(eager: bool) -> float:
+    script = CHILD_SCRIPT.format(src_dir=SRC_DIR, eager=eager)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    # 在临时目录运行，避免读写仓库中的 data/
+    with tempfile.TemporaryDirectory() as work_dir:
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=work_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量启动到首个窗口显示的耗时")
+    parser.add_argument("--eager-excel", action="store_true", help="启动时立即导入pandas")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    times = [run_once(args.eager_excel) for _ in range(args.runs)]
+    mode = "立即导入pandas" if args.eager_excel else "延迟导入pandas"
+    print(f"{mode}: 中位数 {statistics.median(times):.0f}ms, 最小 {min(times):.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+基准测试：原子写入（临时文件 + fsync + 重命名）相对直接覆盖写入的开销
+
+按当前的保存频率（每次批量修改合并为一次 save_classes）测量单次保存耗时。
+
+运行: python benchmarks/bench_storage_writes.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from data_storage import DataStorage
+
+
+def direct_save(storage: DataStorage):
+    """旧的写法：直接以 "w" 模式覆盖目标文件
+
+    数据和编码与 save_classes 完全相同（同样的 encode_json，同样在大名单时不缩进），
+    两者只差在临时文件、fsync 和重命名上。
+    """
+    total = storage.total_students()
+    data = {
+        "version": storage.CLASSES_FORMAT_VERSION,
+        "roster": storage.roster.to_dict(),
+        "classes": {name: ids.tolist() for name, ids in storage.classes.items()},
+        "current_class": storage.current_class,
+        "timestamp": datetime.now().isoformat(),
+    }
+    text = storage.encode_json(data, compact=total >= storage.LARGE_ROSTER_THRESHOLD)
+    with open(storage.classes_file, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def measure(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    repeat = 50
+    print(f"{'学生数':>8} {'直接写入(ms)':>14} {'原子写入(ms)':>14} {'原子+备份(ms)':>15}")
+    for num_students in (50, 1_000, 10_000):
+        with tempfile.TemporaryDirectory() as data_dir:
+            storage = DataStorage(data_dir)
+            storage.classes = {
+                f"班级{c}": storage.roster.add_students(
+                    f"学生{c}-{i}" for i in range(num_students)
+                )
+                for c in range(5)
+            }
+            direct = measure(lambda: direct_save(storage), repeat)
+            atomic = measure(storage.save_classes, repeat)
+            storage.backup_count = 3
+            backup = measure(storage.save_classes, repeat)
+            print(f"{num_students:>8} {direct:>14.2f} {atomic:>14.2f} {backup:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
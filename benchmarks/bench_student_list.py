@@ -0,0 +1,108 @@
+"""
+基准测试：学生名单列表整体重建（QListWidget）与模型/视图增量更新的耗时对比
+
+分别测量整体显示名单、追加 100 人、删除 100 人，以及删除 5000 个分散选中的行。
+自动使用 offscreen 平台，需要安装 PyQt6。
+
+运行: python benchmarks/bench_student_list.py [--sizes 10000 100000]
+"""
+
+import os
+import sys
+import argparse
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from PyQt6.QtWidgets import QApplication, QListView, QListWidget
+from roster import Roster
+from student_list_model import StudentListModel
+
+BATCH = 100
+SCATTERED = 5000
+
+
+def timed(app, func) -> float:
+    start = time.perf_counter()
+    func()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def scattered_rows(size):
+    """均匀分散在名单中的行号，模拟按住 Ctrl 逐个选中"""
+    step = max(size // SCATTERED, 1)
+    return list(range(0, size, step))[:SCATTERED]
+
+
+def bench_widget(app, names):
+    """原来的做法：每次修改后清空 QListWidget 并重新添加全部姓名"""
+    students = list(names)
+    widget = QListWidget()
+    widget.setUniformItemSizes(True)
+    widget.resize(300, 500)
+    widget.show()
+
+    def rebuild():
+        widget.clear()
+        widget.addItems(students)
+
+    results = {"整体显示": timed(app, rebuild)}
+    students.extend(f"新同学{i}" for i in range(BATCH))
+    results[f"追加{BATCH}人"] = timed(app, rebuild)
+    del students[:BATCH]
+    results[f"删除{BATCH}人"] = timed(app, rebuild)
+
+    # 原来按姓名逐个 list.remove，每次都要从头查找
+    selected = [students[row] for row in scattered_rows(len(students))]
+
+    def remove_by_name():
+        for name in selected:
+            students.remove(name)
+        rebuild()
+
+    results[f"删除{SCATTERED}个分散行"] = timed(app, remove_by_name)
+    widget.close()
+    return results
+
+
+def bench_model(app, names):
+    """模型/视图：追加和删除只通知变化的行"""
+    roster = Roster()
+    student_ids = roster.add_students(names)
+    new_ids = roster.add_students(f"新同学{i}" for i in range(BATCH))
+    model = StudentListModel(roster)
+    view = QListView()
+    view.setUniformItemSizes(True)
+    view.setModel(model)
+    view.resize(300, 500)
+    view.show()
+
+    results = {"整体显示": timed(app, lambda: model.set_student_ids(student_ids))}
+    results[f"追加{BATCH}人"] = timed(app, lambda: model.append_student_ids(new_ids))
+    results[f"删除{BATCH}人"] = timed(app, lambda: model.remove_rows(range(BATCH)))
+    rows = scattered_rows(len(model.students))
+    results[f"删除{SCATTERED}个分散行"] = timed(app, lambda: model.remove_rows(rows))
+    view.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比学生名单列表的刷新方式")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    print(f"{'人数':>8} {'操作':<14} {'QListWidget(ms)':>16} {'模型/视图(ms)':>14}")
+    for size in args.sizes:
+        names = [f"学生{i}" for i in range(size)]
+        widget_results = bench_widget(app, names)
+        model_results = bench_model(app, names)
+        for operation, elapsed in widget_results.items():
+            print(
+                f"{size:>8} {operation:<14} {elapsed:>16.1f} {model_results[operation]:>14.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+基准测试：CSV、TSV和纯文本名单的流式导入吞吐量（行/秒）
+
+运行: python benchmarks/bench_text_import.py [--rows N]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from excel_importer import ExcelImporter
+
+
+def create_file(path: str, rows: int, delimiter, encoding: str):
+    with open(path, "w", encoding=encoding, newline="") as f:
+        if delimiter is None:
+            for i in range(rows):
+                f.write(f"学生{i}\n")
+        else:
+            f.write(delimiter.join(["学号", "姓名", "班级"]) + "\n")
+            for i in range(rows):
+                f.write(delimiter.join([str(20240000 + i), f"学生{i}", f"{i % 30}班"]) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量文本名单导入吞吐量")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("roster.csv", ",", "utf-8", "姓名"),
+        ("roster.tsv", "\t", "utf-8", "姓名"),
+        ("roster_gbk.csv", ",", "gbk", "姓名"),
+        ("roster.txt", None, "utf-8", None),
+    ]
+    with tempfile.TemporaryDirectory() as work_dir:
+        for file_name, delimiter, encoding, column in cases:
+            path = os.path.join(work_dir, file_name)
+            create_file(path, args.rows, delimiter, encoding)
+
+            start = time.perf_counter()
+            names = ExcelImporter.import_from_text(path, column)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{file_name:<16} {encoding:<6} {len(names)} 行, "
+                f"{elapsed:.2f}s, {len(names) / elapsed:,.0f} 行/秒"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+基准测试：姓名验证（validate_data）在大量重复姓名输入下的耗时
+
+旧实现每发现一个新的重复姓名就重新扫描整个列表，复杂度为 O(n·d)；
+这里以同样方式实现的 legacy_duplicate_positions 作为对照。
+同时比较 NameValidator 的逐个检查与批量检查两种模式。
+
+运行: python benchmarks/bench_validate.py [--names N] [--distinct D]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from excel_importer import ExcelImporter
+from name_validator import NameValidator
+
+
+def legacy_duplicate_positions(names):
+    """旧版validate_data中的重复检测逻辑"""
+    seen = set()
+    duplicates = []
+    duplicate_indices = {}
+    for name in names:
+        if name in seen and name not in duplicates:
+            duplicates.append(name)
+            duplicate_indices[name] = [j for j, n in enumerate(names) if n == name]
+        seen.add(name)
+    return duplicate_indices
+
+
+def make_names(count: int, distinct: int):
+    rng = random.Random(42)
+    return [f"学生{rng.randrange(distinct)}" for _ in range(count)]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量姓名验证耗时")
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=20_000)
+    args = parser.parse_args()
+
+    # 预先导入，避免把NumPy导入时间计入测量
+    import numpy  # noqa: F401
+
+    names = make_names(args.names, args.distinct)
+    existing = make_names(args.names // 2, args.distinct)
+    elapsed = timed(ExcelImporter.validate_data, names, existing)
+    print(f"validate_data: {args.names} 个姓名（{args.distinct} 种）, {elapsed * 1000:.0f}ms")
+
+    # 逐个检查与批量（正则整体扫描 + NumPy）检查对比
+    modes = (
+        ("逐个检查", NameValidator(batch_threshold=len(names) + 1)),
+        ("批量检查", NameValidator()),
+    )
+    for label, validator in modes:
+        print(f"  {label}: {timed(validator.validate, names) * 1000:.0f}ms")
+    summarize = timed(NameValidator(max_errors=None).summarize, names, existing)
+    print(f"  汇总（summarize）: {summarize * 1000:.0f}ms")
+
+    # 旧算法是二次复杂度，只在较小规模上对照
+    small = names[: args.names // 10]
+    legacy = timed(legacy_duplicate_positions, small)
+    current = timed(ExcelImporter.validate_data, small)
+    print(
+        f"{len(small)} 个姓名: 旧重复检测 {legacy * 1000:.0f}ms, "
+        f"新validate_data（含全部检查）{current * 1000:.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+基准测试：加权抽样（别名表、树状数组）与逐次累加权重的耗时对比
+
+固定权重时对比建表后的单次抽取耗时；权重随抽取变化时（每抽中一人更新其权重），
+对比树状数组的单点更新与每次重新累加全部权重。
+
+运行: python benchmarks/bench_weighted_sampling.py [--size 100000]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+from bisect import bisect_right
+from itertools import accumulate
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from weighted_sampler import AliasSampler, FenwickSampler
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def cumulative_sample(weights, rng):
+    """不使用索引：每次抽取都重新累加全部权重再二分"""
+    cumulative = list(accumulate(weights))
+    return bisect_right(cumulative, rng.random() * cumulative[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量加权抽样的耗时")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--draws", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    weights = [1.0 / (1 + rng.randrange(10)) ** 2 for _ in range(args.size)]
+    draws = args.draws
+    naive_draws = 50
+    print(f"名单人数: {args.size}")
+
+    alias = None
+    fenwick = None
+
+    def build_alias():
+        nonlocal alias
+        alias = AliasSampler(weights, rng)
+
+    def build_fenwick():
+        nonlocal fenwick
+        fenwick = FenwickSampler(weights, rng)
+
+    print(f"\n{'方法':<16} {'建立(ms)':>10} {'每次抽取(µs)':>14} {'每次更新(µs)':>14}")
+    alias_build = timed(build_alias)
+    alias_draw = timed(lambda: alias.samples(draws)) * 1000 / draws
+    print(f"{'别名表':<16} {alias_build:>10.1f} {alias_draw:>14.2f} {'-':>14}")
+
+    fenwick_build = timed(build_fenwick)
+    fenwick_draw = timed(lambda: fenwick.samples(draws)) * 1000 / draws
+
+    def fenwick_updates():
+        for _ in range(draws):
+            position = fenwick.sample()
+            fenwick.update(position, fenwick.weights[position] / 4)
+
+    fenwick_update = timed(fenwick_updates) * 1000 / draws - fenwick_draw
+    print(
+        f"{'树状数组':<16} {fenwick_build:>10.1f} {fenwick_draw:>14.2f} "
+        f"{fenwick_update:>14.2f}"
+    )
+
+    naive_draw = (
+        timed(lambda: [cumulative_sample(weights, rng) for _ in range(naive_draws)])
+        * 1000
+        / naive_draws
+    )
+    choices = (
+        timed(
+            lambda: [rng.choices(range(args.size), weights) for _ in range(naive_draws)]
+        )
+        * 1000
+        / naive_draws
+    )
+    print(f"{'逐次累加权重':<16} {'-':>10} {naive_draw:>14.2f} {'-':>14}")
+    print(f"{'random.choices':<16} {'-':>10} {choices:>14.2f} {'-':>14}")
+
+    # 检查抽样分布：各权重档位被抽中的比例应与其权重占比一致
+    counts = [0] * args.size
+    for position in alias.samples(draws * 20):
+        counts[position] += 1
+    total = sum(weights)
+    heavy = [i for i, weight in enumerate(weights) if weight == 1.0]
+    expected = sum(weights[i] for i in heavy) / total
+    observed = sum(counts[i] for i in heavy) / (draws * 20)
+    print(f"\n别名表抽样检查：权重最高一档的期望占比 {expected:.3f}，实际 {observed:.3f}")
+
+
+if __name__ == "__main__":
+    main()
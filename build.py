@@ -25,7 +25,7 @@ a = Analysis(
         ('docs', 'docs'),
         ('data', 'data'),
     ],
-    hiddenimports=['excel_importer', 'pandas', 'numpy', 'openpyxl'],
+    hiddenimports=['excel_importer', 'data_storage', 'name_validator', 'roster_performance', 'student_list_model', 'name_index', 'roster', 'selection_engine', 'weighted_sampler', 'batch_draw', 'frame_timer', 'roll_call_animation', 'import_worker', 'bulk_import', 'import_cache', 'pandas', 'numpy', 'openpyxl'],
     hookspath=[],
     hooksconfig={{}},
     runtime_hooks=[],
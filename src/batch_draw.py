@@ -0,0 +1,134 @@
+"""
+批量抽取模块（不依赖界面）
+
+用 NumPy 一次生成大量抽取结果，用于公平性模拟和随机分组等批量任务。
+界面上的单次点名仍由 selection_engine 完成；这里的函数只接收学生 ID 序列，
+返回 NumPy 数组，可以在脚本或基准测试中直接调用。
+
+随机数来自 numpy.random.Generator，传入相同的 seed 得到相同的结果。
+"""
+
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 可批量模拟的抽取方式；“减少近期重复”等方式每次抽取都依赖上一次的结果，只能逐次抽取
+BATCH_MODES = ("random", "deck")
+# 分块生成时单块的最大元素数，限制不重复抽取时的临时内存
+CHUNK_ELEMENTS = 1 << 22
+# 不重复抽取时逐列抽取的最大人数（耗时随人数平方增长），超过后改用随机键排序
+SEQUENTIAL_MAX_COUNT = 16
+
+
+def as_id_array(student_ids: Sequence[int]) -> np.ndarray:
+    """把学生 ID 序列转换为 NumPy 数组；array('I') 直接共享内存，不复制"""
+    if isinstance(student_ids, np.ndarray):
+        return student_ids
+    if isinstance(student_ids, array) and student_ids.itemsize == 4:
+        return np.frombuffer(student_ids, dtype=np.uint32)
+    return np.asarray(student_ids, dtype=np.int64)
+
+
+def _unique_rows(
+    rng: np.random.Generator, class_size: int, draws: int, count: int
+) -> np.ndarray:
+    """生成 draws 行、每行 count 个互不相同的位置"""
+    if count <= SEQUENTIAL_MAX_COUNT:
+        # 逐列抽取：第 j 列在剩余的 class_size - j 个位置中均匀抽取，
+        # 再按从小到大的顺序跳过本行已抽中的位置，换算成实际位置
+        positions = np.empty((draws, count), dtype=np.int64)
+        for column in range(count):
+            values = rng.integers(0, class_size - column, size=draws)
+            chosen = np.sort(positions[:, :column], axis=1)
+            for previous in range(column):
+                values += values >= chosen[:, previous]
+            positions[:, column] = values
+        return positions
+
+    # 否则给每行的每个位置一个随机键，取最小的 count 个并按键排序
+    rows_per_chunk = max(1, CHUNK_ELEMENTS // class_size)
+    chunks = []
+    for start in range(0, draws, rows_per_chunk):
+        rows = min(rows_per_chunk, draws - start)
+        keys = rng.random((rows, class_size))
+        smallest = np.argpartition(keys, count - 1, axis=1)[:, :count]
+        order = np.argsort(np.take_along_axis(keys, smallest, axis=1), axis=1)
+        chunks.append(np.take_along_axis(smallest, order, axis=1))
+    return np.concatenate(chunks)
+
+
+def simulate_draws(
+    student_ids: Sequence[int],
+    draws: int,
+    count: int = 1,
+    mode: str = "random",
+    unique: bool = True,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    一次生成 draws 次抽取的结果
+
+    Args:
+        student_ids: 班级学生 ID
+        draws: 抽取次数
+        count: 每次抽取人数
+        mode: "random"（每次独立抽取）或 "deck"（轮流点名：每轮每人一次；
+            与界面不同，两轮交界处的一次抽取可能包含同一名学生）
+        unique: 同一次抽取中是否不重复（mode 为 "random" 时有效）
+        seed: 随机种子，None 表示随机
+
+    Returns:
+        形状为 (draws, count) 的学生 ID 数组
+    """
+    ids = as_id_array(student_ids)
+    class_size = len(ids)
+    if mode not in BATCH_MODES:
+        raise ValueError(f"抽取方式 {mode!r} 不支持批量模拟")
+    if class_size == 0:
+        raise ValueError("学生名单为空")
+    if unique and count > class_size:
+        raise ValueError(f"学生人数({class_size})少于点名人数({count})")
+    rng = np.random.default_rng(seed)
+
+    if mode == "deck":
+        # 轮流点名：把若干轮洗好的牌首尾相接，再按每次抽取人数切开
+        total = draws * count
+        rounds = -(-total // class_size)
+        decks = rng.permuted(np.tile(np.arange(class_size), (rounds, 1)), axis=1)
+        positions = decks.reshape(-1)[:total].reshape(draws, count)
+    elif unique and count > 1:
+        positions = _unique_rows(rng, class_size, draws, count)
+    else:
+        positions = rng.integers(0, class_size, size=(draws, count))
+    return ids[positions]
+
+
+def call_counts(student_ids: Sequence[int], results: np.ndarray) -> np.ndarray:
+    """统计 simulate_draws 的结果中每名学生被抽中的次数，顺序与 student_ids 一致"""
+    ids = as_id_array(student_ids)
+    order = np.argsort(ids, kind="stable")
+    positions = order[np.searchsorted(ids, results.reshape(-1), sorter=order)]
+    return np.bincount(positions, minlength=len(ids))
+
+
+def fairness_summary(student_ids: Sequence[int], results: np.ndarray) -> Dict:
+    """抽取结果的公平性指标：每人被抽中次数的最少、最多、平均值和标准差"""
+    counts = call_counts(student_ids, results)
+    return {
+        "min": int(counts.min()),
+        "max": int(counts.max()),
+        "mean": float(counts.mean()),
+        "std": float(counts.std()),
+    }
+
+
+def split_groups(
+    student_ids: Sequence[int], groups: int, seed: Optional[int] = None
+) -> List[np.ndarray]:
+    """把名单随机分成 groups 组，各组人数最多相差 1"""
+    ids = as_id_array(student_ids)
+    if groups < 1:
+        raise ValueError("分组数必须大于 0")
+    rng = np.random.default_rng(seed)
+    return np.array_split(rng.permutation(ids), groups)
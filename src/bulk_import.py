@@ -0,0 +1,159 @@
+"""
+批量导入班级模块（不依赖界面）
+
+两种来源：
+- 文件夹：其中每个名单文件（Excel、CSV、TSV、文本）对应一个班级，班级名为文件名（不含扩展名）
+- 多工作表的工作簿：每个工作表对应一个班级，班级名为工作表名
+
+文件夹中的文件较多时在进程池中并行解析（每个文件一个任务，解析和姓名验证都在子进程完成，
+只把姓名列表和验证结论传回；子进程使用与主进程相同的导入缓存）。工作簿的各工作表在同一个
+进程中依次读取：打开工作簿时要解析整张共享字符串表，按工作表拆到多个进程会重复这一步。
+
+解析结果通过 DataStorage.import_classes 一次写入所有班级，只触发一次保存。
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from excel_importer import EXCEL_FORMATS, TEXT_FORMATS, ExcelImporter
+from import_cache import ImportCache
+
+SUPPORTED_FORMATS = tuple(EXCEL_FORMATS) + tuple(TEXT_FORMATS)
+# 文件数少于该值时在当前进程中依次解析，启动进程池的开销比解析本身还大
+POOL_MIN_FILES = 8
+# 验证结果中示例问题的条数
+ERROR_SAMPLES = 3
+
+
+class ClassImport(NamedTuple):
+    """一个班级的解析结果"""
+
+    source: str  # 文件路径，工作表来源为 "路径#工作表名"
+    class_name: str
+    names: List[str]
+    error: Optional[str] = None  # 读取失败或验证出错时的说明，此时 names 为空
+    warning_count: int = 0
+
+
+class BulkImportCancelled(Exception):
+    """批量导入被取消"""
+
+
+def list_class_files(folder: str) -> List[str]:
+    """文件夹中所有支持格式的名单文件（不含子文件夹、隐藏文件和Excel临时文件），按文件名排序"""
+    if not os.path.isdir(folder):
+        raise FileNotFoundError(f"文件夹不存在: {folder}")
+    paths = []
+    for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+        if not entry.is_file() or entry.name.startswith((".", "~$")):
+            continue
+        if os.path.splitext(entry.name.lower())[1] in SUPPORTED_FORMATS:
+            paths.append(entry.path)
+    return paths
+
+
+def _checked(source: str, class_name: str, names: List[str]) -> ClassImport:
+    """验证一个班级的姓名；有错误时只返回说明，不返回姓名"""
+    summary = ExcelImporter.summarize_validation(names)
+    if not summary.valid:
+        error = summary.format_issues("error", samples_per_rule=ERROR_SAMPLES)
+        return ClassImport(source, class_name, [], error)
+    if not names:
+        return ClassImport(source, class_name, [], "没有找到有效学生姓名")
+    return ClassImport(source, class_name, names, None, summary.warning_count)
+
+
+def _init_worker(cache_dir: Optional[str], cache_max_bytes: int):
+    """子进程初始化：使用与主进程相同的导入缓存"""
+    if cache_dir is not None:
+        ExcelImporter.cache = ImportCache(cache_dir, cache_max_bytes)
+
+
+def parse_class_file(path: str) -> ClassImport:
+    """读取并验证一个名单文件（在子进程中运行，不抛出异常）"""
+    class_name = os.path.splitext(os.path.basename(path))[0].strip()
+    try:
+        names = ExcelImporter.import_from_file(path)
+    except Exception as e:
+        return ClassImport(path, class_name, [], str(e))
+    return _checked(path, class_name, names)
+
+
+def parse_workbook_sheets(path: str) -> List[ClassImport]:
+    """读取并验证工作簿中的每个工作表"""
+    sheets = ExcelImporter.import_sheets(path)
+    return [
+        _checked(f"{path}#{sheet_name}", sheet_name.strip(), names)
+        for sheet_name, names in sheets.items()
+    ]
+
+
+def parse_class_files(
+    paths: List[str],
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[ClassImport]:
+    """
+    解析多个名单文件，结果顺序与 paths 一致
+
+    Args:
+        paths: 名单文件路径
+        workers: 进程数，None 表示 CPU 核数；为 1 或文件数少于 POOL_MIN_FILES 时不使用进程池
+        progress: progress(已完成, 总数)，每完成一个文件调用一次；其中抛出的异常
+            （如 BulkImportCancelled）会取消尚未开始的文件并向外抛出
+    """
+    total = len(paths)
+    workers = min(workers or os.cpu_count() or 1, total)
+    if workers <= 1 or total < POOL_MIN_FILES:
+        results = []
+        for path in paths:
+            results.append(parse_class_file(path))
+            if progress is not None:
+                progress(len(results), total)
+        return results
+
+    # 使用 spawn：界面进程中有 Qt 的线程，fork 出的子进程可能卡在其他线程持有的锁上
+    context = multiprocessing.get_context("spawn")
+    cache = ExcelImporter.cache
+    cache_args = (cache.cache_dir, cache.max_bytes) if cache is not None else (None, 0)
+    results: Dict[int, ClassImport] = {}
+    with ProcessPoolExecutor(
+        workers, mp_context=context, initializer=_init_worker, initargs=cache_args
+    ) as executor:
+        pending = {executor.submit(parse_class_file, path): i for i, path in enumerate(paths)}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+                if progress is not None:
+                    progress(len(results), total)
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    return [results[i] for i in range(total)]
+
+
+def collect_classes(
+    results: List[ClassImport],
+) -> Tuple[Dict[str, List[str]], List[ClassImport]]:
+    """把解析结果整理为 班级名 -> 姓名列表，返回 (可导入的班级, 跳过的结果)
+
+    出错、班级名为空或与前面的文件重名的结果会被跳过，error 中说明原因。
+    """
+    classes: Dict[str, List[str]] = {}
+    skipped = []
+    for result in results:
+        if result.error is not None:
+            skipped.append(result)
+        elif not result.class_name:
+            skipped.append(result._replace(names=[], error="班级名称为空"))
+        elif result.class_name in classes:
+            skipped.append(
+                result._replace(names=[], error=f"班级 '{result.class_name}' 重名")
+            )
+        else:
+            classes[result.class_name] = result.names
+    return classes, skipped
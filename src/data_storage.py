@@ -0,0 +1,924 @@
+"""
+数据存储模块，负责学生名单、历史记录和配置的持久化
+
+默认使用 data/ 目录下的 JSON 文件；在 config.json 中设置
+"storage_backend": "sqlite" 后改用 SQLite 数据库存储班级和历史记录。
+
+班级成员和点名记录保存的是学生 ID（见 roster.py），姓名只在花名册中保存一份。
+"""
+
+import os
+import json
+import secrets
+import shutil
+import tempfile
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from array import array
+from typing import List, Dict, Optional, Tuple
+
+from roster import LEGACY_GENERATION, Roster, id_array
+from roster_performance import RosterPerformance
+from selection_engine import SelectionEngine, replay_draws
+
+try:
+    import orjson  # 可选依赖，解析大文件更快
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# 点名记录中的学生已无法在花名册中查到、记录也没有保存姓名时显示的名称
+UNKNOWN_STUDENT = "（未知学生）"
+
+# 没有 config.json 或读取失败时使用的配置
+DEFAULT_CONFIG = {
+    "num_students": 1,
+    "prevent_duplicate": True,
+    "window_geometry": [100, 100, 800, 600],
+}
+
+
+def load_json_file(path: str, load_timings: Dict[str, float]):
+    """读取并解析 JSON 文件（安装了 orjson 时使用 orjson），耗时(ms)累加到 load_timings[文件名]"""
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        data = json_loads(f.read())
+    name = os.path.basename(path)
+    load_timings[name] = load_timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+    return data
+
+
+def load_config_file(config_file: str, load_timings: Dict[str, float]) -> Dict:
+    """加载配置，文件不存在或读取失败时返回默认配置"""
+    if os.path.exists(config_file):
+        try:
+            return load_json_file(config_file, load_timings)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            print(f"读取配置文件失败: {e}")
+        except Exception as e:
+            print(f"加载配置时发生未知错误: {e}")
+    return dict(DEFAULT_CONFIG)
+
+
+class DataStorage:
+    """数据存储类，管理学生名单和历史记录"""
+
+    # 追加日志中的记录数达到该值时，合并写回 history.json
+    HISTORY_COMPACT_THRESHOLD = 200
+    # 标记为待保存后等待的秒数，期间的多次修改合并为一次写入
+    SAVE_DEBOUNCE_SECONDS = 0.5
+    # 所有班级总人数达到该值时进入大名单模式：classes.json 不再缩进，写入更快、文件更小
+    LARGE_ROSTER_THRESHOLD = 5000
+    # classes.json 的格式版本：1 为班级 -> 姓名列表，2 为花名册 + 班级 -> 学生 ID 列表
+    CLASSES_FORMAT_VERSION = 2
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        backup_count: int = 0,
+        config: Optional[Dict] = None,
+        load_timings: Optional[Dict[str, float]] = None,
+    ):
+        """config 为已读取的配置（None 时读取 config.json），load_timings 为此前的读取耗时"""
+        self.data_dir = data_dir
+        self.backup_count = backup_count  # 每个文件保留的滚动备份数，0 表示不备份
+        self.students_file = os.path.join(data_dir, "students.json")
+        self.classes_file = os.path.join(
+            data_dir, "classes.json"
+        )  # New file for multiple classes
+        self.history_file = os.path.join(data_dir, "history.json")
+        self.history_log_file = os.path.join(
+            data_dir, "history.jsonl"
+        )  # Append-only log, one record per line
+        self.config_file = os.path.join(data_dir, "config.json")
+        self.selection_file = os.path.join(
+            data_dir, "selection.json"
+        )  # 轮流点名、减少近期重复等抽取方式的状态
+
+        # 确保数据目录存在
+        os.makedirs(data_dir, exist_ok=True)
+
+        # 延迟写入状态：待保存的数据分区及后台定时器
+        self._dirty = set()
+        self._save_timer = None
+        self._lock = threading.RLock()
+        self.performance = RosterPerformance()  # 名单操作耗时统计
+
+        # 初始化数据
+        self.history_log_count = 0  # 日志中尚未压缩的记录数
+        # 追加日志的编号（写在日志第一行）和其中的记录总数（含已合并的），
+        # 合并时写入 history.json，用于跳过日志中已经合并过的记录
+        self.history_log_id: Optional[str] = None
+        self.history_log_records = 0
+        # 文件名 -> 启动时读取解析耗时(ms)
+        self.load_timings: Dict[str, float] = dict(load_timings or {})
+        # classes.json 只读取一次，同时得到花名册、班级列表和当前班级
+        self.roster, self.classes, self.current_class = self.load_classes_file()
+        self.history = self.load_history()
+        self.config = config if config is not None else self.load_config()
+        self.selection = SelectionEngine(
+            self.load_selection_state(), call_counts=self.call_counts
+        )
+        self.selection.resume(self.history)
+        self.report_load_timings()
+
+    def read_json_file(self, path: str):
+        """读取并解析 JSON 文件（安装了 orjson 时使用 orjson），记录耗时"""
+        return load_json_file(path, self.load_timings)
+
+    def record_load_timing(self, name: str, start: float):
+        """累加某个文件自 start 起的读取耗时"""
+        elapsed = (time.perf_counter() - start) * 1000
+        self.load_timings[name] = self.load_timings.get(name, 0.0) + elapsed
+
+    def report_load_timings(self):
+        """配置了 report_load_timings 时，输出启动时每个数据文件的读取耗时"""
+        if self.load_timings and self.config.get("report_load_timings", False):
+            details = ", ".join(
+                f"{name} {ms:.1f}ms" for name, ms in self.load_timings.items()
+            )
+            print(f"数据加载耗时: {details}")
+
+    @staticmethod
+    def encode_json(data, compact: bool = False) -> str:
+        """把数据编码为 JSON 文本；compact 为 True 时不缩进"""
+        # 先一次性编码再写入：json.dump 逐个片段写文件，条目多时慢数倍
+        if compact:
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+    def write_json_file(self, path: str, data, compact: bool = False):
+        """原子地写入 JSON 文件：先写临时文件并 fsync，再重命名覆盖目标文件
+
+        写入过程中崩溃或断电时，目标文件要么是旧内容，要么是完整的新内容。
+        compact 为 True 时不缩进。
+        """
+        text = self.encode_json(data, compact)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".",
+            prefix=f".{os.path.basename(path)}.",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.backup_count > 0 and os.path.exists(path):
+                self.rotate_backups(path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._fsync_dir(os.path.dirname(path) or ".")
+
+    def rotate_backups(self, path: str):
+        """滚动备份：path.1.bak 为最近一次的旧版本，最多保留 backup_count 份"""
+        for i in range(self.backup_count - 1, 0, -1):
+            older = f"{path}.{i}.bak"
+            if os.path.exists(older):
+                os.replace(older, f"{path}.{i + 1}.bak")
+        shutil.copyfile(path, f"{path}.1.bak")
+
+    @staticmethod
+    def _fsync_dir(dir_path: str):
+        """同步目录项，确保重命名本身落盘（Windows 不支持打开目录，直接跳过）"""
+        if os.name != "posix":
+            return
+        fd = os.open(dir_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def load_students(self) -> List[str]:
+        """加载学生名单"""
+        if os.path.exists(self.students_file):
+            try:
+                data = self.read_json_file(self.students_file)
+                return data.get("students", [])
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"读取学生名单文件失败: {e}")
+                return []
+            except Exception as e:
+                print(f"加载学生名单时发生未知错误: {e}")
+                return []
+        return []
+
+    def load_classes_file(self) -> Tuple[Roster, Dict[str, array], str]:
+        """读取一次 classes.json，返回 (花名册, 班级 -> 学生 ID 数组, 当前班级)"""
+        if os.path.exists(self.classes_file):
+            try:
+                data = self.read_json_file(self.classes_file)
+                current_class = data.get("current_class", "默认班级")
+                if data.get("version", 1) >= 2:
+                    roster = Roster.from_dict(data.get("roster", {}))
+                    classes = {
+                        name: id_array(ids)
+                        for name, ids in data.get("classes", {}).items()
+                    }
+                    return roster, classes, current_class
+                # 旧格式保存的是姓名，每个名单条目登记为一个新学生
+                roster, classes = Roster.from_classes(data.get("classes", {}))
+                return roster, classes, current_class
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"读取班级列表文件失败: {e}")
+            except Exception as e:
+                print(f"加载班级列表时发生未知错误: {e}")
+        # 文件不存在或读取失败时尝试从旧格式迁移
+        roster, classes = Roster.from_classes(self.migrate_from_old_format())
+        return roster, classes, "默认班级"
+
+    def load_classes(self) -> Dict[str, array]:
+        """加载所有班级列表（学生 ID 数组）"""
+        return self.load_classes_file()[1]
+
+    def migrate_from_old_format(self) -> Dict[str, List[str]]:
+        """从旧格式迁移数据到新格式"""
+        # If there's an existing students.json, move it to a default class
+        if os.path.exists(self.students_file):
+            try:
+                old_data = self.read_json_file(self.students_file)
+                old_students = old_data.get("students", [])
+                if old_students:
+                    return {"默认班级": old_students}
+            except Exception:
+                pass  # If migration fails, start fresh
+        return {"默认班级": []}
+
+    def load_current_class(self) -> str:
+        """加载当前选中的班级"""
+        return self.load_classes_file()[2]
+
+    def mark_dirty(self, *sections: str):
+        """标记数据分区（"classes"、"config"、"selection"）待保存，短暂延迟后在后台线程统一写入"""
+        with self._lock:
+            self._dirty.update(sections)
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DEBOUNCE_SECONDS, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """立即写入所有待保存的数据分区"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            dirty, self._dirty = self._dirty, set()
+
+            if "classes" in dirty:
+                self.save_classes()
+            if "config" in dirty:
+                self.save_config(self.config)
+            if "selection" in dirty:
+                self.save_selection_state()
+
+    def total_students(self) -> int:
+        """所有班级的总人数"""
+        return sum(len(students) for students in self.classes.values())
+
+    def save_classes(self):
+        """保存所有班级列表"""
+        total = self.total_students()
+        try:
+            # 确保数据目录存在
+            os.makedirs(self.data_dir, exist_ok=True)
+
+            with self.performance.measure("save_classes", total):
+                # 复制一份快照，避免后台写入时界面线程修改名单；
+                # 先复制班级再复制花名册，保证班级引用的学生 ID 都在花名册中
+                classes = {
+                    name: students.tolist() for name, students in self.classes.items()
+                }
+                data = {
+                    "version": self.CLASSES_FORMAT_VERSION,
+                    "roster": self.roster.to_dict(),
+                    "classes": classes,
+                    "current_class": self.current_class,
+                    "timestamp": datetime.now().isoformat(),
+                }
+                self.write_json_file(
+                    self.classes_file,
+                    data,
+                    compact=total >= self.LARGE_ROSTER_THRESHOLD,
+                )
+        except (OSError, IOError) as e:
+            print(f"保存班级列表失败: {e}")
+        except Exception as e:
+            print(f"保存班级列表时发生未知错误: {e}")
+
+    def get_current_student_ids(self) -> array:
+        """获取当前班级的学生 ID 数组（与 self.classes 中的是同一个对象）"""
+        if self.current_class not in self.classes:
+            # If current class doesn't exist, create it with empty list
+            self.classes[self.current_class] = id_array()
+        return self.classes[self.current_class]
+
+    def get_current_students(self) -> List[str]:
+        """获取当前班级的学生姓名列表"""
+        return self.roster.names_of(self.get_current_student_ids())
+
+    def set_current_student_ids(self, student_ids: array):
+        """设置当前班级的学生 ID 数组"""
+        self.classes[self.current_class] = student_ids
+        self.selection.students_changed(self.current_class)
+        self.mark_dirty("classes")
+
+    def import_classes(self, classes: Dict[str, List[str]]) -> Tuple[List[str], List[str]]:
+        """批量新建或更新班级：已有班级的名单整体替换为导入的姓名，全部班级只保存一次
+
+        更新已有班级时，与原名单同名的学生沿用原来的 ID（点名记录和统计仍然对应），
+        只为新出现的姓名登记新学生。返回 (新建的班级, 更新的班级)。
+        """
+        created, updated = [], []
+        with self._lock:
+            for class_name, students in classes.items():
+                current = self.classes.get(class_name)
+                if current is None:
+                    created.append(class_name)
+                    self.classes[class_name] = self.roster.add_students(students)
+                else:
+                    updated.append(class_name)
+                    self.classes[class_name] = self.roster.match_students(
+                        students, current
+                    )
+                self.selection.students_changed(class_name)
+        self.mark_dirty("classes", "selection")
+        return created, updated
+
+    def record_student_ids(self, record: Dict) -> Optional[List[int]]:
+        """返回记录中的学生 ID；只保存了姓名的旧记录、花名册重建前的记录返回 None
+
+        花名册文件损坏或丢失后重建时学生 ID 重新编号，此前记录中的 ID 可能查不到或指向别人。
+        """
+        student_ids = record.get("ids")
+        if student_ids is None:
+            return None
+        if record.get("roster", self.roster.generation) != self.roster.generation:
+            return None
+        if not self.roster.knows(student_ids):
+            return None
+        return student_ids
+
+    def record_names(self, record: Dict) -> List[str]:
+        """返回一条点名记录中的姓名
+
+        学生 ID 仍然有效时按 ID 查姓名，否则使用记录中保存的姓名；
+        两者都没有时（只保存了 ID 的记录）每人显示为 UNKNOWN_STUDENT。
+        """
+        student_ids = self.record_student_ids(record)
+        if student_ids is not None:
+            return self.roster.names_of(student_ids)
+        if "names" in record:
+            return record["names"]
+        return [UNKNOWN_STUDENT] * len(record.get("ids", ()))
+
+    def call_counts(self) -> Counter:
+        """历史记录中每个学生被点到的次数（只统计保存了学生 ID 的记录）"""
+        counts = Counter()
+        for record in self.history:
+            counts.update(record.get("ids", ()))
+        return counts
+
+    def replay_history(self) -> List[str]:
+        """用当前班级名单复现全部点名记录，返回与 self.history 一一对应的核对结果"""
+        results = replay_draws(reversed(self.history), self.classes)
+        results.reverse()
+        return results
+
+    def save_students(self, students: List[str]):
+        """保存学生名单（现在是当前选中班级的名单），每个姓名登记为一个新学生"""
+        self.set_current_student_ids(self.roster.add_students(students))
+        # Also save to old format for compatibility (deprecated)
+        try:
+            # 确保数据目录存在
+            os.makedirs(self.data_dir, exist_ok=True)
+
+            data = {"students": students, "timestamp": datetime.now().isoformat()}
+            self.write_json_file(self.students_file, data)
+        except (OSError, IOError) as e:
+            print(f"保存学生名单失败: {e}")
+        except Exception as e:
+            print(f"保存学生名单时发生未知错误: {e}")
+
+    def load_history(self) -> List[Dict]:
+        """加载历史记录（合并 history.json 与追加日志，最新的在前）
+
+        合并日志后、删除日志前程序退出（或删除失败）时，日志中的记录已经在 history.json 中；
+        history.json 记录了合并的日志编号和记录数，这些记录只取一次。
+        """
+        history = []
+        merged_log = None
+        if os.path.exists(self.history_file):
+            try:
+                data = self.read_json_file(self.history_file)
+                history = data.get("history", [])
+                merged_log = data.get("merged_log")
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"读取历史记录文件失败: {e}")
+            except Exception as e:
+                print(f"加载历史记录时发生未知错误: {e}")
+
+        self.history_log_id, log_records = self.load_history_log()
+        self.history_log_records = len(log_records)
+        if merged_log and merged_log[0] == self.history_log_id:
+            log_records = log_records[merged_log[1] :]
+        self.history_log_count = len(log_records)
+        # 日志按时间顺序追加，而内存中的历史记录最新的在前
+        log_records.reverse()
+        return log_records + history
+
+    def load_history_log(self) -> Tuple[Optional[str], List[Dict]]:
+        """读取追加日志，返回 (日志编号, 历史记录)，记录按写入顺序排列
+
+        旧版本写入的日志没有编号，编号为 None。
+        """
+        log_id = None
+        records = []
+        if not os.path.exists(self.history_log_file):
+            return log_id, records
+        start = time.perf_counter()
+        try:
+            with open(self.history_log_file, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json_loads(line)
+                    except json.JSONDecodeError:
+                        # 写入中断时最后一行可能不完整，跳过即可
+                        print(f"跳过历史日志第 {line_no} 行的损坏记录")
+                        continue
+                    if line_no == 1 and "log_id" in record:
+                        log_id = record["log_id"]
+                    else:
+                        records.append(record)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"读取历史日志失败: {e}")
+        self.record_load_timing(os.path.basename(self.history_log_file), start)
+        return log_id, records
+
+    def append_history(self, record: Dict):
+        """追加一条历史记录，只写入一行而不重写整个历史文件"""
+        try:
+            # 确保数据目录存在
+            os.makedirs(self.data_dir, exist_ok=True)
+
+            new_log = not os.path.exists(self.history_log_file)
+            with open(self.history_log_file, "a", encoding="utf-8") as f:
+                if new_log:
+                    # 新日志的第一行是日志编号
+                    self.history_log_id = secrets.token_hex(8)
+                    self.history_log_records = 0
+                    f.write(json.dumps({"log_id": self.history_log_id}) + "\n")
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.history_log_count += 1
+            self.history_log_records += 1
+        except (OSError, IOError) as e:
+            print(f"追加历史记录失败: {e}")
+            return
+        except Exception as e:
+            print(f"追加历史记录时发生未知错误: {e}")
+            return
+
+        if self.history_log_count >= self.HISTORY_COMPACT_THRESHOLD:
+            self.compact_history()
+
+    def compact_history(self):
+        """将追加日志合并写回 history.json 并清空日志"""
+        if self.history_log_count == 0 and not os.path.exists(self.history_log_file):
+            return
+        self.save_history(self.history)
+
+    def save_history(self, history: List[Dict]):
+        """保存完整历史记录（已包含追加日志中的全部记录），并删除追加日志"""
+        try:
+            # 确保数据目录存在
+            os.makedirs(self.data_dir, exist_ok=True)
+
+            data = {"history": history, "timestamp": datetime.now().isoformat()}
+            if self.history_log_records:
+                # 记下已合并的日志记录，日志没能删除时下次加载跳过这些记录
+                data["merged_log"] = [self.history_log_id, self.history_log_records]
+            self.write_json_file(self.history_file, data)
+        except (OSError, IOError) as e:
+            print(f"保存历史记录失败: {e}")
+            return
+        except Exception as e:
+            print(f"保存历史记录时发生未知错误: {e}")
+            return
+
+        # history.json 已包含全部记录，日志可以安全删除
+        self.history_log_count = 0
+        try:
+            if os.path.exists(self.history_log_file):
+                os.remove(self.history_log_file)
+            self.history_log_id = None
+            self.history_log_records = 0
+        except OSError as e:
+            print(f"清空历史日志失败: {e}")
+
+    def load_config(self) -> Dict:
+        """加载配置"""
+        return load_config_file(self.config_file, self.load_timings)
+
+    def save_config(self, config: Dict):
+        """保存配置"""
+        try:
+            # 确保数据目录存在
+            os.makedirs(self.data_dir, exist_ok=True)
+
+            self.write_json_file(self.config_file, config)
+        except (OSError, IOError) as e:
+            print(f"保存配置失败: {e}")
+        except Exception as e:
+            print(f"保存配置时发生未知错误: {e}")
+
+    def load_selection_state(self) -> Dict:
+        """加载抽取方式的状态（各班级的洗牌进度、最近被点到的学生）"""
+        if os.path.exists(self.selection_file):
+            try:
+                return self.read_json_file(self.selection_file)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"读取抽取状态失败: {e}")
+            except Exception as e:
+                print(f"加载抽取状态时发生未知错误: {e}")
+        return {}
+
+    def save_selection_state(self):
+        """保存抽取方式的状态"""
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+
+            self.write_json_file(
+                self.selection_file, self.selection.to_dict(), compact=True
+            )
+        except (OSError, IOError) as e:
+            print(f"保存抽取状态失败: {e}")
+        except Exception as e:
+            print(f"保存抽取状态时发生未知错误: {e}")
+
+
+class SQLiteDataStorage(DataStorage):
+    """基于 SQLite 的数据存储，接口与 DataStorage 保持一致
+
+    姓名、学生、班级成员和点名记录分别保存在带索引的表中，每次保存都在一个事务内完成，
+    只写入新增的学生和发生变化的班级。配置和抽取状态仍保存在 config.json、selection.json 中。
+    首次打开时会一次性从 data/*.json 迁移已有数据，原 JSON 文件保留作为备份。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS classes (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            position INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS names (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS roster (
+            id INTEGER PRIMARY KEY,
+            name_id INTEGER NOT NULL REFERENCES names(id)
+        );
+        CREATE TABLE IF NOT EXISTS members (
+            class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            student_id INTEGER NOT NULL REFERENCES roster(id),
+            PRIMARY KEY (class_id, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_members_student ON members(student_id);
+        CREATE TABLE IF NOT EXISTS draws (
+            id INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            names TEXT NOT NULL,
+            student_ids TEXT,
+            draw_info TEXT,
+            roster TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_draws_date ON draws(date);
+    """
+
+    INSERT_DRAW_SQL = (
+        "INSERT INTO draws "
+        "(timestamp, date, time, names, student_ids, draw_info, roster) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        backup_count: int = 0,
+        config: Optional[Dict] = None,
+        load_timings: Optional[Dict[str, float]] = None,
+    ):
+        self.db_file = os.path.join(data_dir, "roll_call.db")
+        os.makedirs(data_dir, exist_ok=True)
+
+        # 延迟写入在后台线程执行，所有写操作都在 self._lock 下串行进行
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = FULL")  # 每次提交都落盘
+        self.conn.executescript(self.SCHEMA)
+
+        # 上次保存到数据库的班级快照和花名册大小，用于只写入有变化的部分
+        self._saved_classes: Dict[str, array] = {}
+        self._saved_current_class = None
+        self._saved_name_count = 0
+        self._saved_student_count = 0
+        self._saved_generation = None
+        self.upgrade_schema()
+
+        super().__init__(data_dir, backup_count, config, load_timings)
+
+    def upgrade_schema(self):
+        """升级旧版数据库：draws 增加 student_ids、draw_info、roster 列，按姓名保存的 students 表转换为花名册"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(draws)")}
+        for column in ("student_ids", "draw_info", "roster"):
+            if column not in columns:
+                with self.conn:
+                    self.conn.execute(f"ALTER TABLE draws ADD COLUMN {column} TEXT")
+
+        has_old_students = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students'"
+        ).fetchone()
+        if not has_old_students:
+            return
+
+        classes: Dict[str, List[str]] = {}
+        ids = {}
+        for class_id, name in self.conn.execute(
+            "SELECT id, name FROM classes ORDER BY position"
+        ):
+            classes[name] = []
+            ids[class_id] = name
+        for class_id, name in self.conn.execute(
+            "SELECT class_id, name FROM students ORDER BY class_id, position"
+        ):
+            classes[ids[class_id]].append(name)
+
+        roster, class_ids = Roster.from_classes(classes)
+        with self.conn:
+            self._write_roster(roster)
+            self._write_classes(class_ids, {})
+            self.conn.execute("DROP TABLE students")
+        print(f"已将 {len(roster)} 个学生转换为花名册")
+
+    def _get_meta(self, key: str):
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def migrate_from_json(self):
+        """一次性从 JSON 文件迁移班级和历史记录"""
+        roster, classes, current_class = DataStorage.load_classes_file(self)
+        history = DataStorage.load_history(self)
+
+        with self.conn:
+            self._write_roster(roster)
+            self._write_classes(classes, {})
+            self._set_meta("current_class", current_class)
+            # 内存中最新的记录在前，数据库按时间顺序插入
+            self.conn.executemany(
+                self.INSERT_DRAW_SQL,
+                [self._draw_row(record) for record in reversed(history)],
+            )
+            self._set_meta("migrated_from_json", datetime.now().isoformat())
+
+        print(f"已从JSON迁移 {len(classes)} 个班级和 {len(history)} 条历史记录")
+
+    def load_classes_file(self) -> Tuple[Roster, Dict[str, array], str]:
+        """从数据库读取 (花名册, 班级 -> 学生 ID 数组, 当前班级)"""
+        try:
+            if self._get_meta("migrated_from_json") is None:
+                self.migrate_from_json()
+
+            start = time.perf_counter()
+            names = self.conn.execute("SELECT name FROM names ORDER BY id")
+            student_names = self.conn.execute("SELECT name_id FROM roster ORDER BY id")
+            # 没有编号的是开始保存编号之前的数据库
+            generation = self._get_meta("roster_generation") or LEGACY_GENERATION
+            roster = Roster(
+                [name for (name,) in names],
+                (name_id for (name_id,) in student_names),
+                generation,
+            )
+            self._saved_generation = generation
+            classes: Dict[str, array] = {}
+            ids = {}
+            for class_id, name in self.conn.execute(
+                "SELECT id, name FROM classes ORDER BY position"
+            ):
+                classes[name] = id_array()
+                ids[class_id] = name
+            for class_id, student_id in self.conn.execute(
+                "SELECT class_id, student_id FROM members ORDER BY class_id, position"
+            ):
+                classes[ids[class_id]].append(student_id)
+            current_class = self._get_meta("current_class")
+            self.record_load_timing(os.path.basename(self.db_file), start)
+        except sqlite3.Error as e:
+            print(f"读取班级数据库失败: {e}")
+            roster = Roster()
+            classes = {}
+            current_class = None
+
+        if not classes:
+            classes = {"默认班级": id_array()}
+        self._saved_classes = {name: id_array(ids) for name, ids in classes.items()}
+        self._saved_current_class = current_class
+        self._saved_name_count = len(roster.names)
+        self._saved_student_count = len(roster)
+        return roster, classes, current_class or "默认班级"
+
+    def _write_roster(self, roster: Roster):
+        """在当前事务中写入上次保存后新增的姓名和学生"""
+        name_count = len(roster.names)
+        student_count = len(roster)
+        self.conn.executemany(
+            "INSERT INTO names (id, name) VALUES (?, ?)",
+            enumerate(
+                roster.names[self._saved_name_count : name_count],
+                self._saved_name_count,
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO roster (id, name_id) VALUES (?, ?)",
+            enumerate(
+                roster.student_names[self._saved_student_count : student_count],
+                self._saved_student_count,
+            ),
+        )
+        self._saved_name_count = name_count
+        self._saved_student_count = student_count
+        if roster.generation != self._saved_generation:
+            self._set_meta("roster_generation", roster.generation)
+            self._saved_generation = roster.generation
+
+    def _write_classes(self, classes: Dict[str, array], saved: Dict[str, array]):
+        """在当前事务中写入与快照相比有变化的班级"""
+        for name in saved.keys() - classes.keys():
+            self.conn.execute("DELETE FROM classes WHERE name = ?", (name,))
+
+        for position, (name, students) in enumerate(classes.items()):
+            self.conn.execute(
+                "INSERT INTO classes (name, position) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET position = excluded.position",
+                (name, position),
+            )
+            old_students = saved.get(name, [])
+            if old_students == students:
+                continue
+
+            # 只改写第一个不同位置之后的成员，追加学生时只插入新增部分
+            common = 0
+            for old, new in zip(old_students, students):
+                if old != new:
+                    break
+                common += 1
+
+            class_id = self.conn.execute(
+                "SELECT id FROM classes WHERE name = ?", (name,)
+            ).fetchone()[0]
+            self.conn.execute(
+                "DELETE FROM members WHERE class_id = ? AND position >= ?",
+                (class_id, common),
+            )
+            self.conn.executemany(
+                "INSERT INTO members (class_id, position, student_id) VALUES (?, ?, ?)",
+                [
+                    (class_id, i, student_id)
+                    for i, student_id in enumerate(students[common:], common)
+                ],
+            )
+
+    def save_classes(self):
+        """保存所有班级列表（单个事务，仅写入有变化的班级）"""
+        # 复制一份快照，避免后台写入时界面线程修改名单
+        classes = {name: id_array(ids) for name, ids in self.classes.items()}
+        current_class = self.current_class
+        saved_counts = (self._saved_name_count, self._saved_student_count)
+        try:
+            with self._lock, self.conn, self.performance.measure(
+                "save_classes", self.total_students()
+            ):
+                # 先写花名册，班级成员引用的学生 ID 都已存在
+                self._write_roster(self.roster)
+                self._write_classes(classes, self._saved_classes)
+                if current_class != self._saved_current_class:
+                    self._set_meta("current_class", current_class)
+            self._saved_classes = classes
+            self._saved_current_class = current_class
+        except sqlite3.Error as e:
+            # 事务已回滚，下次保存时重新写入这部分花名册
+            self._saved_name_count, self._saved_student_count = saved_counts
+            print(f"保存班级列表失败: {e}")
+
+    def save_students(self, students: List[str]):
+        """保存学生名单（当前选中班级的名单），每个姓名登记为一个新学生"""
+        self.set_current_student_ids(self.roster.add_students(students))
+
+    @staticmethod
+    def _draw_row(record: Dict) -> tuple:
+        student_ids = record.get("ids")
+        draw_info = record.get("draw")
+        return (
+            record["timestamp"],
+            record["date"],
+            record["time"],
+            json.dumps(record.get("names", []), ensure_ascii=False),
+            None if student_ids is None else json.dumps(student_ids),
+            None if draw_info is None else json.dumps(draw_info, ensure_ascii=False),
+            record.get("roster"),
+        )
+
+    def load_history(self) -> List[Dict]:
+        """加载历史记录（最新的在前）"""
+        start = time.perf_counter()
+        try:
+            rows = self.conn.execute(
+                "SELECT timestamp, date, time, names, student_ids, draw_info, roster "
+                "FROM draws ORDER BY id DESC"
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"读取历史记录数据库失败: {e}")
+            return []
+        history = []
+        for timestamp, date, time_str, names, student_ids, draw_info, roster in rows:
+            record = {"timestamp": timestamp, "date": date, "time": time_str}
+            names = json_loads(names)
+            # 只保存了学生 ID 的记录，姓名列为空列表
+            if student_ids is None or names:
+                record["names"] = names
+            if student_ids is not None:
+                record["ids"] = json_loads(student_ids)
+            if roster is not None:
+                record["roster"] = roster
+            if draw_info is not None:
+                record["draw"] = json_loads(draw_info)
+            history.append(record)
+        self.record_load_timing(os.path.basename(self.db_file), start)
+        return history
+
+    def append_history(self, record: Dict):
+        """追加一条历史记录"""
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    self.INSERT_DRAW_SQL,
+                    self._draw_row(record),
+                )
+        except sqlite3.Error as e:
+            print(f"追加历史记录失败: {e}")
+
+    def compact_history(self):
+        """SQLite 每条记录已提交，无需合并"""
+
+    def save_history(self, history: List[Dict]):
+        """用给定列表整体替换历史记录"""
+        try:
+            with self._lock, self.conn:
+                self.conn.execute("DELETE FROM draws")
+                self.conn.executemany(
+                    self.INSERT_DRAW_SQL,
+                    [self._draw_row(record) for record in reversed(history)],
+                )
+        except sqlite3.Error as e:
+            print(f"保存历史记录失败: {e}")
+
+
+def create_data_storage(data_dir: str = "data") -> DataStorage:
+    """根据 config.json 中的 storage_backend 和 backup_count 创建对应的数据存储
+
+    config.json 只解析一次，结果和读取耗时交给数据存储使用。
+    """
+    load_timings: Dict[str, float] = {}
+    config = load_config_file(os.path.join(data_dir, "config.json"), load_timings)
+    backup_count = config.get("backup_count", 0)
+    storage_class = DataStorage
+    if config.get("storage_backend", "json") == "sqlite":
+        storage_class = SQLiteDataStorage
+    return storage_class(data_dir, backup_count, config, load_timings)
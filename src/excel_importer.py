@@ -1,18 +1,49 @@
 """
 Excel导入器模块，负责处理Excel文件的导入和解析
+
+同时支持CSV、TSV和每行一个姓名的纯文本名单。
 """
 
-import pandas as pd
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import codecs
+import csv
 import os
 
+from name_validator import DEFAULT_VALIDATOR, ValidationSummary
+
+# pandas/openpyxl/xlrd 导入耗时较长，只在首次导入Excel时加载
+
+# 表格中一行数据都没有时的哨兵值
+_NO_ROWS = object()
+
+# 各扩展名对应的分隔符，None 表示每行一个姓名的纯文本
+TEXT_FORMATS = {".csv": ",", ".tsv": "\t", ".txt": None}
+EXCEL_FORMATS = (".xlsx", ".xls")
+
+# 检测编码时读取的字节数
+_ENCODING_SAMPLE_SIZE = 64 * 1024
+
 
 class ExcelImporter:
     """Excel导入器"""
 
+    # 解析结果的磁盘缓存（import_cache.ImportCache），None 表示不使用缓存
+    cache = None
+
     @staticmethod
-    def import_from_excel(file_path: str) -> List[str]:
-        """从Excel文件导入学生姓名"""
+    def preload():
+        """预先导入openpyxl，缩短首次导入名单时的等待"""
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError as e:
+            print(f"预加载Excel组件失败: {e}")
+
+    @staticmethod
+    def import_from_excel(file_path: str, streaming: bool = True) -> List[str]:
+        """从Excel文件导入学生姓名
+
+        默认逐行流式读取第一列，不构建DataFrame；streaming=False 时使用pandas读取。
+        """
         try:
             # 判断文件是否存在
             if not os.path.exists(file_path):
@@ -20,10 +51,15 @@ class ExcelImporter:
 
             # 判断文件扩展名
             _, ext = os.path.splitext(file_path.lower())
-            if ext not in [".xlsx", ".xls"]:
+            if ext not in EXCEL_FORMATS:
                 raise ValueError(f"不支持的文件格式: {ext}，仅支持.xlsx和.xls")
 
+            if streaming:
+                return list(ExcelImporter.iter_names_from_excel(file_path))
+
             # 尝试读取Excel文件
+            import pandas as pd
+
             df = pd.read_excel(file_path)
 
             # 假设第一列是学生姓名
@@ -39,74 +75,249 @@ class ExcelImporter:
             raise e
 
     @staticmethod
-    def validate_data(names: List[str], existing_names: Optional[List[str]] = None) -> dict:
-        """验证导入的数据"""
-        result = {
-            "valid": True,
-            "errors": [],
-            "warnings": [],
-            "count": len(names),
-            "duplicates": [],
-            "duplicates_list": [],  # 更详细的信息
-        }
-
-        # 检查内部重复
-        seen = set()
-        duplicates = []
-        duplicate_indices = {}
-
-        for i, name in enumerate(names):
-            if name in seen and name not in duplicates:
-                duplicates.append(name)
-                # 记录每个重复姓名的所有位置
-                duplicate_indices[name] = [j for j, n in enumerate(names) if n == name]
-            seen.add(name)
-
-        result["duplicates"] = duplicates
-        if duplicates:
-            result["warnings"].append(
-                f"导入列表内部发现 {len(duplicates)} 个重复姓名: {', '.join(duplicates[:5])}{'...' if len(duplicates) > 5 else ''}"
+    def import_from_file(file_path: str, column: Optional[str] = None) -> List[str]:
+        """按扩展名从Excel、CSV、TSV或纯文本文件导入学生姓名
+
+        column 为CSV/TSV的表头名称，不指定时取第一列。
+        设置了 cache 时，未修改的文件直接返回上次解析的结果。
+        """
+        _, ext = os.path.splitext(file_path.lower())
+        if ext in TEXT_FORMATS:
+            return ExcelImporter.load_cached(
+                file_path,
+                column,
+                lambda: ExcelImporter.import_from_text(file_path, column),
             )
+        return ExcelImporter.load_cached(
+            file_path, None, lambda: ExcelImporter.import_from_excel(file_path)
+        )
+
+    @staticmethod
+    def load_cached(
+        file_path: str, column: Optional[str], parse: Callable[[], List[str]]
+    ) -> List[str]:
+        """设置了 cache 时先查找缓存，未命中才调用 parse() 并缓存结果"""
+        if ExcelImporter.cache is None:
+            return parse()
+        return ExcelImporter.cache.load(file_path, column, parse)
 
-        # 记录详细的重复信息
-        result["duplicates_list"] = duplicate_indices
+    @staticmethod
+    def iter_names_from_file(
+        file_path: str, column: Optional[str] = None
+    ) -> Iterator[str]:
+        """按扩展名逐行读取姓名，检查与 import_from_file 相同，供后台导入报告进度"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"文件不存在: {file_path}")
 
-        # 检查与现有名单的重复（如果提供现有名单）
-        if existing_names:
-            existing_set = set(existing_names)
-            external_duplicates = [name for name in set(names) if name in existing_set]
-            if external_duplicates:
-                result["warnings"].append(
-                    f"与现有名单重复 {len(external_duplicates)} 个姓名: {', '.join(external_duplicates[:5])}{'...' if len(external_duplicates) > 5 else ''}"
-                )
+        _, ext = os.path.splitext(file_path.lower())
+        if ext in TEXT_FORMATS:
+            return ExcelImporter.iter_names_from_text(file_path, column)
+        if ext in EXCEL_FORMATS:
+            return ExcelImporter.iter_names_from_excel(file_path)
+        raise ValueError(
+            f"不支持的文件格式: {ext}，仅支持.xlsx、.xls、.csv、.tsv和.txt"
+        )
 
-        # 检查姓名长度和内容
-        for i, name in enumerate(names):
-            if len(name) > 50:
-                result["warnings"].append(
-                    f"第 {i + 1} 行姓名过长 (长度: {len(name)}): {name[:20]}..."
-                )
-            elif len(name.strip()) == 0:
-                result["errors"].append(f"第 {i + 1} 行姓名为空")
-            elif not any(c.isalpha() for c in name):
-                # 检查是否包含至少一个字母（中文也是字母）
-                result["warnings"].append(f"第 {i + 1} 行姓名可能无效: {name}")
-
-        # 检查特殊字符（可以根据需要调整）
-        import re
-
-        invalid_pattern = re.compile(r'[!@#$%^&*()+=\[\]{}|\\:";\'<>?,./]')
-        for i, name in enumerate(names):
-            if invalid_pattern.search(name):
-                result["errors"].append(f"第 {i + 1} 行姓名包含无效字符: {name}")
-
-        # 检查总体数量
-        if len(names) > 1000:
-            result["warnings"].append(
-                f"导入的学生数量过多 ({len(names)}个)，可能会影响性能"
-            )
+    @staticmethod
+    def import_from_text(file_path: str, column: Optional[str] = None) -> List[str]:
+        """从CSV、TSV或每行一个姓名的纯文本文件导入学生姓名"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+
+        _, ext = os.path.splitext(file_path.lower())
+        if ext not in TEXT_FORMATS:
+            raise ValueError(f"不支持的文件格式: {ext}，仅支持.csv、.tsv和.txt")
+
+        return list(ExcelImporter.iter_names_from_text(file_path, column))
+
+    @staticmethod
+    def detect_encoding(file_path: str) -> str:
+        """根据文件开头判断编码：带BOM或能按UTF-8解码时为UTF-8，否则按GBK（GB18030）处理"""
+        with open(file_path, "rb") as f:
+            sample = f.read(_ENCODING_SAMPLE_SIZE)
+
+        if sample.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        try:
+            # 样本末尾可能截断多字节字符，使用增量解码器且不要求完整结束
+            codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            return "gb18030"
+
+    @staticmethod
+    def read_text_header(file_path: str) -> List[str]:
+        """返回CSV/TSV表头各列的名称（已去除首尾空白），其他格式或空文件返回空列表"""
+        _, ext = os.path.splitext(file_path.lower())
+        delimiter = TEXT_FORMATS.get(ext)
+        if delimiter is None:
+            return []
+        encoding = ExcelImporter.detect_encoding(file_path)
+        with open(file_path, "r", encoding=encoding, newline="") as f:
+            header = next(csv.reader(f, delimiter=delimiter), None)
+        return [h.strip() for h in header or []]
+
+    @staticmethod
+    def iter_names_from_text(
+        file_path: str, column: Optional[str] = None, encoding: Optional[str] = None
+    ) -> Iterator[str]:
+        """逐行读取CSV/TSV指定列（第一行为表头）或纯文本每行的姓名"""
+        _, ext = os.path.splitext(file_path.lower())
+        delimiter = TEXT_FORMATS.get(ext)
+        encoding = encoding or ExcelImporter.detect_encoding(file_path)
+
+        with open(file_path, "r", encoding=encoding, newline="") as f:
+            if delimiter is None:
+                for line in f:
+                    name = line.strip()
+                    if name:
+                        yield name
+                return
 
-        if result["errors"]:
-            result["valid"] = False
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("文件至少需要一列数据")
 
+            index = 0
+            if column is not None:
+                stripped_header = [h.strip() for h in header]
+                if column not in stripped_header:
+                    raise ValueError(
+                        f"找不到列 '{column}'，可用的列: {', '.join(stripped_header)}"
+                    )
+                index = stripped_header.index(column)
+
+            for row in reader:
+                if len(row) > index:
+                    name = row[index].strip()
+                    if name:
+                        yield name
+
+    @staticmethod
+    def iter_names_from_excel(file_path: str) -> Iterator[str]:
+        """逐行读取第一个工作表第一列的姓名（跳过表头），内存占用与表格大小无关"""
+        _, ext = os.path.splitext(file_path.lower())
+        if ext == ".xls":
+            values = ExcelImporter._iter_xls_first_column(file_path)
+        else:
+            values = ExcelImporter._iter_xlsx_first_column(file_path)
+
+        # 第一行是表头（与pandas的默认行为一致）
+        if next(values, _NO_ROWS) is _NO_ROWS:
+            raise ValueError("Excel文件至少需要一列数据")
+        return ExcelImporter._names_from_column(values)
+
+    @staticmethod
+    def import_sheets(file_path: str) -> Dict[str, List[str]]:
+        """读取工作簿中每个工作表第一列的姓名（各自跳过表头），返回 工作表名 -> 姓名列表
+
+        工作簿只打开一次；没有任何数据的工作表对应空列表。
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+
+        _, ext = os.path.splitext(file_path.lower())
+        if ext not in EXCEL_FORMATS:
+            raise ValueError(f"不支持的文件格式: {ext}，仅支持.xlsx和.xls")
+
+        if ext == ".xls":
+            sheets = ExcelImporter._iter_xls_sheets(file_path)
+        else:
+            sheets = ExcelImporter._iter_xlsx_sheets(file_path)
+
+        result = {}
+        for sheet_name, values in sheets:
+            next(values, None)  # 跳过表头
+            result[sheet_name] = list(ExcelImporter._names_from_column(values))
         return result
+
+    @staticmethod
+    def _names_from_column(values: Iterator) -> Iterator[str]:
+        """把单元格的值转换为姓名，跳过空单元格"""
+        for value in values:
+            if value is None:
+                continue
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)  # .xls 中的数字均为浮点数，学号等去掉 ".0"
+            name = str(value).strip()
+            if name:
+                yield name
+
+    @staticmethod
+    def _iter_xlsx_first_column(file_path: str) -> Iterator:
+        """使用openpyxl只读模式逐行读取.xlsx第一列"""
+        for _, values in ExcelImporter._iter_xlsx_sheets(file_path, first_only=True):
+            yield from values
+
+    @staticmethod
+    def _iter_xlsx_sheets(
+        file_path: str, first_only: bool = False
+    ) -> Iterator[Tuple[str, Iterator]]:
+        """使用openpyxl只读模式依次产出 (工作表名, 第一列各行的值)"""
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheets = workbook.worksheets[:1] if first_only else workbook.worksheets
+            for sheet in sheets:
+                yield sheet.title, (
+                    row[0] if row else None
+                    for row in sheet.iter_rows(max_col=1, values_only=True)
+                )
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _iter_xls_first_column(file_path: str) -> Iterator:
+        """使用xlrd逐行读取.xls第一列"""
+        for _, values in ExcelImporter._iter_xls_sheets(file_path, first_only=True):
+            yield from values
+
+    @staticmethod
+    def _iter_xls_sheets(
+        file_path: str, first_only: bool = False
+    ) -> Iterator[Tuple[str, Iterator]]:
+        """使用xlrd依次产出 (工作表名, 第一列各行的值)"""
+        try:
+            import xlrd
+        except ImportError:
+            raise ValueError("读取.xls文件需要安装xlrd，或将文件另存为.xlsx")
+
+        def first_column(sheet):
+            for row_index in range(sheet.nrows):
+                if sheet.row_len(row_index) == 0:
+                    yield None
+                    continue
+                cell = sheet.cell(row_index, 0)
+                yield None if cell.ctype == xlrd.XL_CELL_EMPTY else cell.value
+
+        workbook = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            count = 1 if first_only else workbook.nsheets
+            for index in range(count):
+                sheet = workbook.sheet_by_index(index)
+                yield sheet.name, first_column(sheet)
+                workbook.unload_sheet(index)
+        finally:
+            workbook.release_resources()
+
+    @staticmethod
+    def validate_data(names: List[str], existing_names: Optional[List[str]] = None) -> dict:
+        """验证导入的数据"""
+        return DEFAULT_VALIDATOR.validate(names, existing_names)
+
+    @staticmethod
+    def summarize_validation(
+        names: List[str],
+        existing_names: Optional[List[str]] = None,
+        max_recommended_count: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> ValidationSummary:
+        """验证导入的数据，返回按规则汇总、示例数量有限的结果
+
+        progress(rows) 报告已检查的行数，见 NameValidator.iter_issues。
+        """
+        return DEFAULT_VALIDATOR.summarize(
+            names, existing_names, max_recommended_count, progress
+        )
@@ -0,0 +1,57 @@
+"""
+动画帧耗时统计模块
+
+记录每一帧与上一帧的间隔和该帧的处理耗时，动画结束后汇总，
+用于确认动画帧率稳定、每帧处理足够轻。
+"""
+
+import time
+from typing import Dict, List
+
+
+class FrameTimer:
+    """统计一段动画的帧间隔和每帧处理耗时（毫秒）"""
+
+    def __init__(self):
+        self.intervals: List[float] = []  # 相邻两帧开始时间的间隔
+        self.work: List[float] = []  # 每帧处理耗时
+        self._last = None
+
+    def start(self):
+        """动画开始时调用，清空上一段动画的数据"""
+        self.intervals = []
+        self.work = []
+        self._last = time.perf_counter()
+
+    def frame(self, frame_start: float):
+        """一帧处理完成后调用，frame_start 为该帧开始时的 time.perf_counter()"""
+        now = time.perf_counter()
+        if self._last is not None:
+            self.intervals.append((frame_start - self._last) * 1000)
+        self._last = frame_start
+        self.work.append((now - frame_start) * 1000)
+
+    def summary(self) -> Dict[str, float]:
+        """帧数、平均/最长帧间隔、平均/最长处理耗时"""
+        if not self.work:
+            return {}
+        return {
+            "frames": len(self.work),
+            "interval_avg": sum(self.intervals) / len(self.intervals)
+            if self.intervals
+            else 0.0,
+            "interval_max": max(self.intervals, default=0.0),
+            "work_avg": sum(self.work) / len(self.work),
+            "work_max": max(self.work),
+        }
+
+    def report(self) -> str:
+        """可直接输出的汇总文字"""
+        stats = self.summary()
+        if not stats:
+            return "没有动画帧"
+        return (
+            f"{stats['frames']} 帧，帧间隔平均 {stats['interval_avg']:.1f}ms"
+            f"（最长 {stats['interval_max']:.1f}ms），"
+            f"每帧处理平均 {stats['work_avg']:.3f}ms（最长 {stats['work_max']:.3f}ms）"
+        )
@@ -0,0 +1,230 @@
+"""
+导入缓存模块
+
+把名单文件解析出的姓名保存在磁盘上（默认 data/import_cache/），再次导入未修改的文件时直接返回，
+不再解析。每个文件（CSV/TSV 还包括列名）对应一个缓存文件，记录原文件的大小、修改时间和内容哈希：
+- 大小和修改时间都没变：直接使用缓存，不读取原文件
+- 修改时间变了但大小相同（复制、另存为、只是被打开保存过）：计算内容哈希，内容相同时仍使用缓存
+
+文件系统的时间精度有限（FAT32 为 2 秒），缓存写入前后极短时间内被修改的文件可能大小和修改时间
+都与缓存一致，因此修改时间离缓存写入时间过近的缓存总是核对内容哈希。
+
+缓存按最近使用时间淘汰：命中时更新缓存文件的修改时间，写入新缓存后总大小超过上限时删除最久未用的。
+没有共享的索引文件，缓存文件先写临时文件再替换，批量导入的多个进程可以同时使用。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import orjson  # 可选依赖，解析大文件更快
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# 缓存格式版本；解析规则变化时加一，使旧缓存失效
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_MB = 64
+DEFAULT_MAX_BYTES = DEFAULT_MAX_MB * 1024 * 1024
+# 计算内容哈希时每次读取的字节数
+_HASH_CHUNK_SIZE = 1024 * 1024
+# 原文件修改时间距缓存写入时间小于该值（纳秒）时，不能只凭修改时间判断文件未变
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class FileState(NamedTuple):
+    """原文件在解析前的状态"""
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def file_digest(path: str) -> str:
+    """文件内容的哈希（BLAKE2b，128 位）"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImportCache:
+    """名单文件解析结果的磁盘缓存，按最近使用时间淘汰，总大小不超过 max_bytes"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def load(
+        self, file_path: str, column: Optional[str], parse: Callable[[], List[str]]
+    ) -> List[str]:
+        """返回文件的姓名：缓存有效时直接返回，否则调用 parse() 解析并写入缓存
+
+        读写缓存失败时只输出提示，不影响导入；parse() 的异常原样抛出。
+        """
+        try:
+            state, names = self._lookup(file_path, column)
+        except OSError:
+            # 原文件不存在或无法读取，由 parse() 给出具体的错误
+            return parse()
+        if names is not None:
+            self.hits += 1
+            return names
+
+        self.misses += 1
+        names = parse()
+        self._store(file_path, column, state, names)
+        return names
+
+    def clear(self):
+        """删除所有缓存文件"""
+        for entry_path, _ in self._entries():
+            self._remove(entry_path)
+
+    def total_bytes(self) -> int:
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def _entry_path(self, file_path: str, column: Optional[str]) -> str:
+        key = f"{os.path.abspath(file_path)}\0{column or ''}"
+        name = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _read_entry(self, entry_path: str) -> Optional[Dict]:
+        try:
+            with open(entry_path, "rb") as f:
+                entry = json_loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"读取导入缓存失败，将重新解析: {e}")
+            return None
+        if entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        return entry
+
+    def _lookup(
+        self, file_path: str, column: Optional[str]
+    ) -> Tuple[Optional[FileState], Optional[List[str]]]:
+        """查找缓存，返回 (原文件状态, 姓名)；未命中时姓名为 None"""
+        stat = os.stat(file_path)
+        entry_path = self._entry_path(file_path, column)
+        entry = self._read_entry(entry_path)
+        same_size = entry is not None and entry["size"] == stat.st_size
+
+        if (
+            same_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["mtime_ns"] < entry["written_ns"] - _RACY_WINDOW_NS
+        ):
+            self._touch(entry_path)
+            return None, entry["names"]
+
+        state = FileState(stat.st_size, stat.st_mtime_ns, file_digest(file_path))
+        if same_size and entry["digest"] == state.digest:
+            # 内容未变：记录新的修改时间，下次不必再计算哈希
+            self._write_entry(entry_path, file_path, column, state, entry["names"])
+            return state, entry["names"]
+        return state, None
+
+    def _store(
+        self,
+        file_path: str,
+        column: Optional[str],
+        state: Optional[FileState],
+        names: List[str],
+    ):
+        if state is None or self.max_bytes <= 0:
+            return
+        entry_path = self._entry_path(file_path, column)
+        if self._write_entry(entry_path, file_path, column, state, names):
+            self._evict()
+
+    def _write_entry(
+        self,
+        entry_path: str,
+        file_path: str,
+        column: Optional[str],
+        state: FileState,
+        names: List[str],
+    ) -> bool:
+        """原子写入一个缓存文件；超过总大小上限的结果不缓存"""
+        entry = {
+            "version": CACHE_FORMAT_VERSION,
+            "path": os.path.abspath(file_path),
+            "column": column,
+            "size": state.size,
+            "mtime_ns": state.mtime_ns,
+            "digest": state.digest,
+            "written_ns": time.time_ns(),
+            "names": names,
+        }
+        data = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        if len(data) > self.max_bytes:
+            return False
+
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, entry_path)
+            return True
+        except OSError as e:
+            print(f"写入导入缓存失败: {e}")
+            if temp_path is not None:
+                self._remove(temp_path)
+            return False
+
+    def _entries(self) -> List[Tuple[str, os.stat_result]]:
+        try:
+            scanned = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return []
+        entries = []
+        for item in scanned:
+            if not item.name.endswith(".json"):
+                continue
+            try:
+                entries.append((item.path, item.stat()))
+            except FileNotFoundError:
+                pass  # 其他进程刚刚删除
+        return entries
+
+    def _evict(self):
+        """总大小超过上限时，按最近使用时间从旧到新删除缓存文件"""
+        entries = self._entries()
+        total = sum(stat.st_size for _, stat in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort(key=lambda item: item[1].st_mtime_ns)
+        for entry_path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(entry_path)
+            total -= stat.st_size
+
+    @staticmethod
+    def _touch(entry_path: str):
+        """更新缓存文件的修改时间，作为最近使用时间"""
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,164 @@
+"""
+后台导入模块
+
+在 QThreadPool 的工作线程中读取名单文件并验证，界面线程只负责显示进度和结果。
+读取和验证过程中通过信号报告已处理的行数（批量导入时为已解析的文件数），可随时取消；
+结果、异常和取消都通过信号交回界面线程（跨线程的信号自动排队到接收者所在的线程）。
+"""
+
+import threading
+import time
+from typing import List, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from bulk_import import (
+    BulkImportCancelled,
+    parse_class_files,
+    parse_workbook_sheets,
+)
+from excel_importer import ExcelImporter
+
+# 导入的阶段，作为 progress 信号的第一个参数
+STAGE_READ = "read"
+STAGE_VALIDATE = "validate"
+STAGE_PARSE_FILES = "parse_files"  # 批量导入：已解析的文件数
+STAGE_PARSE_SHEETS = "parse_sheets"  # 批量导入：正在读取多工作表的工作簿，没有中间进度
+
+
+class ImportCancelled(Exception):
+    """导入被用户取消"""
+
+
+class ImportSignals(QObject):
+    """ImportWorker 和 BulkImportWorker 的信号（QRunnable 不是 QObject，不能直接定义信号）"""
+
+    progress = pyqtSignal(str, int, int)  # 阶段、已处理数量、总数（未知时为 0）
+    finished = pyqtSignal(list, object)  # 姓名列表、ValidationSummary（批量导入为结果列表、None）
+    failed = pyqtSignal(object)  # 读取或验证时抛出的异常
+    cancelled = pyqtSignal()
+
+
+class ImportWorker(QRunnable):
+    """读取并验证一个名单文件；column 为CSV/TSV中姓名所在列的表头，None 表示第一列"""
+
+    # 读取阶段每隔多少行检查一次取消和报告进度
+    READ_CHECK_ROWS = 1000
+    # 两次进度信号的最短间隔（秒），避免大量信号堆积在界面线程的事件队列中
+    PROGRESS_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        file_path: str,
+        existing_names: Optional[List[str]] = None,
+        max_recommended_count: Optional[int] = None,
+        column: Optional[str] = None,
+    ):
+        super().__init__()
+        self.file_path = file_path
+        self.column = column
+        # 验证在工作线程中进行，使用调用时名单的副本
+        self.existing_names = list(existing_names or [])
+        self.max_recommended_count = max_recommended_count
+        self.signals = ImportSignals()
+        self._cancel = threading.Event()
+        self._last_progress = 0.0
+
+    def cancel(self):
+        """请求取消，工作线程在下一次检查时停止（可从任意线程调用）"""
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run(self):
+        try:
+            names = self._read()
+            summary = ExcelImporter.summarize_validation(
+                names,
+                self.existing_names,
+                self.max_recommended_count,
+                progress=lambda rows: self._report(STAGE_VALIDATE, rows, len(names)),
+            )
+            self._check_cancelled()
+        except ImportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(names, summary)
+
+    def _read(self) -> List[str]:
+        """读取姓名；文件未修改时直接使用导入缓存"""
+        names = ExcelImporter.load_cached(self.file_path, self.column, self._parse)
+        self._report(STAGE_READ, len(names), 0, force=True)
+        return names
+
+    def _parse(self) -> List[str]:
+        names = []
+        for name in ExcelImporter.iter_names_from_file(self.file_path, self.column):
+            names.append(name)
+            if len(names) % self.READ_CHECK_ROWS == 0:
+                self._report(STAGE_READ, len(names), 0)
+        return names
+
+    def _check_cancelled(self):
+        if self._cancel.is_set():
+            raise ImportCancelled()
+
+    def _report(self, stage: str, done: int, total: int, force: bool = False):
+        """检查取消，并按最短间隔发出进度信号"""
+        self._check_cancelled()
+        now = time.monotonic()
+        if force or done == total or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.signals.progress.emit(stage, done, total)
+
+
+class BulkImportWorker(QRunnable):
+    """批量导入班级：解析文件夹中的多个名单文件，或一个工作簿的所有工作表
+
+    finished 信号的第一个参数为 bulk_import.ClassImport 列表。
+    """
+
+    def __init__(
+        self,
+        paths: Optional[List[str]] = None,
+        workbook: Optional[str] = None,
+        workers: Optional[int] = None,
+    ):
+        super().__init__()
+        self.paths = list(paths or [])
+        self.workbook = workbook
+        self.workers = workers
+        self.signals = ImportSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """请求取消：已提交给进程池的文件解析完后停止，尚未开始的文件不再解析"""
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run(self):
+        try:
+            if self.workbook is not None:
+                self.signals.progress.emit(STAGE_PARSE_SHEETS, 0, 0)
+                results = parse_workbook_sheets(self.workbook)
+            else:
+                self.signals.progress.emit(STAGE_PARSE_FILES, 0, len(self.paths))
+                results = parse_class_files(self.paths, self.workers, self._report)
+            if self._cancel.is_set():
+                raise BulkImportCancelled()
+        except BulkImportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(results, None)
+
+    def _report(self, done: int, total: int):
+        if self._cancel.is_set():
+            raise BulkImportCancelled()
+        self.signals.progress.emit(STAGE_PARSE_FILES, done, total)
@@ -7,10 +7,13 @@
 
 import sys
 import os
-import json
+import csv
+import multiprocessing
 import random
+import threading
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, List, Optional
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -19,7 +22,8 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QPushButton,
     QLabel,
-    QListWidget,
+    QListView,
+    QLineEdit,
     QFileDialog,
     QMessageBox,
     QGroupBox,
@@ -28,219 +32,95 @@ from PyQt6.QtWidgets import (
     QTextEdit,
     QSplitter,
     QComboBox,
+    QProgressDialog,
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QStringListModel, QThreadPool
 from PyQt6.QtGui import QFont, QAction
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from excel_importer import ExcelImporter
-
-
-class DataStorage:
-    """数据存储类，管理学生名单和历史记录"""
-
-    def __init__(self, data_dir: str = "data"):
-        self.data_dir = data_dir
-        self.students_file = os.path.join(data_dir, "students.json")
-        self.classes_file = os.path.join(
-            data_dir, "classes.json"
-        )  # New file for multiple classes
-        self.history_file = os.path.join(data_dir, "history.json")
-        self.config_file = os.path.join(data_dir, "config.json")
-
-        # 确保数据目录存在
-        os.makedirs(data_dir, exist_ok=True)
-
-        # 初始化数据
-        self.classes = self.load_classes()  # Dictionary of class_name -> student_list
-        self.current_class = self.load_current_class()  # Track current active class
-        self.history = self.load_history()
-        self.config = self.load_config()
-
-    def load_students(self) -> List[str]:
-        """加载学生名单"""
-        if os.path.exists(self.students_file):
-            try:
-                with open(self.students_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return data.get("students", [])
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                print(f"读取学生名单文件失败: {e}")
-                return []
-            except Exception as e:
-                print(f"加载学生名单时发生未知错误: {e}")
-                return []
-        return []
-
-    def load_classes(self) -> Dict[str, List[str]]:
-        """加载所有班级列表"""
-        if os.path.exists(self.classes_file):
-            try:
-                with open(self.classes_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return data.get("classes", {})
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                print(f"读取班级列表文件失败: {e}")
-                # 尝试 loading from old format
-                return self.migrate_from_old_format()
-            except Exception as e:
-                print(f"加载班级列表时发生未知错误: {e}")
-                return self.migrate_from_old_format()
-        else:
-            # Migrate from old format if classes file doesn't exist
-            return self.migrate_from_old_format()
-
-    def migrate_from_old_format(self) -> Dict[str, List[str]]:
-        """从旧格式迁移数据到新格式"""
-        # If there's an existing students.json, move it to a default class
-        if os.path.exists(self.students_file):
-            try:
-                with open(self.students_file, "r", encoding="utf-8") as f:
-                    old_data = json.load(f)
-                    old_students = old_data.get("students", [])
-                    if old_students:
-                        return {"默认班级": old_students}
-            except Exception:
-                pass  # If migration fails, start fresh
-        return {"默认班级": []}
-
-    def load_current_class(self) -> str:
-        """加载当前选中的班级"""
-        if os.path.exists(self.classes_file):
-            try:
-                with open(self.classes_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return data.get("current_class", "默认班级")
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                print(f"读取当前班级失败: {e}")
-            except Exception as e:
-                print(f"加载当前班级时发生未知错误: {e}")
-        return "默认班级"
-
-    def save_classes(self):
-        """保存所有班级列表"""
-        try:
-            # 确保数据目录存在
-            os.makedirs(self.data_dir, exist_ok=True)
-
-            data = {
-                "classes": self.classes,
-                "current_class": self.current_class,
-                "timestamp": datetime.now().isoformat(),
-            }
-            with open(self.classes_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except (OSError, IOError) as e:
-            print(f"保存班级列表失败: {e}")
-        except Exception as e:
-            print(f"保存班级列表时发生未知错误: {e}")
-
-    def get_current_students(self) -> List[str]:
-        """获取当前班级的学生列表"""
-        if self.current_class in self.classes:
-            return self.classes[self.current_class]
-        else:
-            # If current class doesn't exist, create it with empty list
-            self.classes[self.current_class] = []
-            return []
-
-    def set_current_students(self, students: List[str]):
-        """设置当前班级的学生列表"""
-        self.classes[self.current_class] = students
-        self.save_classes()
-
-    def save_students(self, students: List[str]):
-        """保存学生名单（现在是当前选中班级的名单）"""
-        self.set_current_students(students)
-        # Also save to old format for compatibility (deprecated)
-        try:
-            # 确保数据目录存在
-            os.makedirs(self.data_dir, exist_ok=True)
-
-            data = {"students": students, "timestamp": datetime.now().isoformat()}
-            with open(self.students_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except (OSError, IOError) as e:
-            print(f"保存学生名单失败: {e}")
-        except Exception as e:
-            print(f"保存学生名单时发生未知错误: {e}")
-
-    def load_history(self) -> List[Dict]:
-        """加载历史记录"""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return data.get("history", [])
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                print(f"读取历史记录文件失败: {e}")
-                return []
-            except Exception as e:
-                print(f"加载历史记录时发生未知错误: {e}")
-                return []
-        return []
-
-    def save_history(self, history: List[Dict]):
-        """保存历史记录"""
-        try:
-            # 确保数据目录存在
-            os.makedirs(self.data_dir, exist_ok=True)
-
-            data = {"history": history, "timestamp": datetime.now().isoformat()}
-            with open(self.history_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except (OSError, IOError) as e:
-            print(f"保存历史记录失败: {e}")
-        except Exception as e:
-            print(f"保存历史记录时发生未知错误: {e}")
-
-    def load_config(self) -> Dict:
-        """加载配置"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                print(f"读取配置文件失败: {e}")
-            except Exception as e:
-                print(f"加载配置时发生未知错误: {e}")
-        return {
-            "num_students": 1,
-            "prevent_duplicate": True,
-            "window_geometry": [100, 100, 800, 600],
-        }
-
-    def save_config(self, config: Dict):
-        """保存配置"""
-        try:
-            # 确保数据目录存在
-            os.makedirs(self.data_dir, exist_ok=True)
-
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except (OSError, IOError) as e:
-            print(f"保存配置失败: {e}")
-        except Exception as e:
-            print(f"保存配置时发生未知错误: {e}")
+from import_cache import DEFAULT_MAX_MB, ImportCache
+from import_worker import (
+    STAGE_PARSE_FILES,
+    STAGE_PARSE_SHEETS,
+    STAGE_READ,
+    BulkImportWorker,
+    ImportWorker,
+)
+from bulk_import import collect_classes, list_class_files
+from data_storage import create_data_storage
+from roster import id_array
+from selection_engine import (
+    SELECTION_MODES,
+    DEFAULT_SELECTION_MODE,
+    REPLAY_MATCH,
+    REPLAY_MISMATCH,
+    REPLAY_UNVERIFIABLE,
+)
+from student_list_model import StudentListModel
+from roll_call_animation import (
+    DEFAULT_DURATION_MS,
+    DEFAULT_EASING,
+    RollCallAnimation,
+)
 
 
 class RandomRollCallApp(QMainWindow):
     """随机点名软件主窗口"""
 
+    # 搜索结果最多显示的姓名数，保证每次按键都能立即响应
+    FILTER_RESULT_LIMIT = 500
+    # 点名动画：帧数，以及各阶段的起始帧（各帧的显示时间由时长和缓动曲线决定）
+    ANIMATION_FRAMES = 30
+    ANIMATION_NAMES_FRAME = 10  # 开始滚动显示姓名
+    ANIMATION_SLOW_FRAME = 20  # 接近结束，显示完整人数的候选
+    # 动画时长选项（毫秒），0 为即时出结果
+    ANIMATION_DURATIONS = {0: "即时", 1000: "1 秒", 3000: "3 秒", 5000: "5 秒"}
+
     def __init__(self):
         super().__init__()
-        self.data_storage = DataStorage()
-        self.students = self.data_storage.get_current_students().copy()
+        self.data_storage = create_data_storage()
+        # 重新导入未修改的名单文件时直接使用上次解析的结果；"import_cache_mb" 为 0 时不缓存
+        cache_mb = self.data_storage.config.get("import_cache_mb", DEFAULT_MAX_MB)
+        if cache_mb > 0:
+            ExcelImporter.cache = ImportCache(
+                os.path.join(self.data_storage.data_dir, "import_cache"),
+                int(cache_mb * 1024 * 1024),
+            )
+        # 当前班级名单：学生 ID 数组与 data_storage.classes 共用，姓名列表随之更新
+        self.students_model = StudentListModel(
+            self.data_storage.roster, self.data_storage.get_current_student_ids()
+        )
         self.history = self.data_storage.history.copy()
         self.current_names = []
-        self.roll_call_timer = None
-        self.animation_counter = 0
         self.animation_names = []
+        # 点名动画只负责显示，播放完毕后再抽取最终结果
+        self.roll_call_animation = RollCallAnimation(self)
+        self.roll_call_animation.duration_ms = self.data_storage.config.get(
+            "animation_duration_ms", DEFAULT_DURATION_MS
+        )
+        self.roll_call_animation.set_easing(
+            self.data_storage.config.get("animation_easing", DEFAULT_EASING)
+        )
+        self.roll_call_animation.finished.connect(self.finish_roll_call)
         self.allow_duplicate_names = False  # 是否允许重复姓名
+        # 正在进行的后台导入及其进度对话框
+        self.import_worker = None
+        self.import_progress = None
 
         self.init_ui()
         self.load_settings()
 
+    @property
+    def students(self) -> List[str]:
+        """当前班级的学生姓名列表"""
+        return self.students_model.students
+
+    @property
+    def student_ids(self):
+        """当前班级的学生 ID 数组"""
+        return self.students_model.student_ids
+
     def init_ui(self):
         """初始化用户界面"""
         self.setWindowTitle("随机点名助手")
@@ -278,7 +158,7 @@ class RandomRollCallApp(QMainWindow):
             QPushButton#danger:hover {
                 background-color: #e44d38;
             }
-            QListWidget {
+            QListView {
                 background-color: #fffffe;
                 border: 2px solid #232323;  /* 更粗的边框 */
                 border-radius: 6px;
@@ -384,9 +264,33 @@ class RandomRollCallApp(QMainWindow):
         students_group = QGroupBox("学生名单")
         students_layout = QVBoxLayout(students_group)
 
-        self.students_list = QListWidget()
-        self.update_students_list()
+        # 搜索框：按姓名或拼音首字母前缀筛选
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("搜索姓名或拼音首字母（如 zs）")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.textChanged.connect(self.apply_student_filter)
+        students_layout.addWidget(self.filter_input)
+        self.filter_status_label = QLabel()
+        self.filter_status_label.hide()
+        students_layout.addWidget(self.filter_status_label)
+        self.filter_model = QStringListModel(self)
+        self.filter_rows: List[int] = []  # 搜索结果每一行在完整名单中的行号
+        self.filter_refresh_pending = False
+
+        # 视图只绘制可见的行
+        self.students_list = QListView()
+        # 所有行高度相同，布局无需逐项测量，大名单刷新更快
+        self.students_list.setUniformItemSizes(True)
+        self.students_list.setModel(self.students_model)
+        # 名单只能通过按钮修改，禁止在列表中直接编辑
+        self.students_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        # 支持 Shift/Ctrl 多选，一次移除多个姓名
+        self.students_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
         students_layout.addWidget(self.students_list)
+        # 名单变化时更新搜索结果
+        self.students_model.rowsInserted.connect(self.schedule_filter_refresh)
+        self.students_model.rowsRemoved.connect(self.schedule_filter_refresh)
+        self.students_model.modelReset.connect(self.schedule_filter_refresh)
 
         # 导入名单按钮
         import_btn = QPushButton("导入名单")
@@ -429,6 +333,41 @@ class RandomRollCallApp(QMainWindow):
         )
         settings_layout.addWidget(self.prevent_duplicate_cb)
 
+        # 抽取方式选择
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("抽取方式:"))
+        self.selection_mode_combo = QComboBox()
+        for mode, title in SELECTION_MODES.items():
+            self.selection_mode_combo.addItem(title, mode)
+        mode_index = self.selection_mode_combo.findData(
+            self.data_storage.config.get("selection_mode", DEFAULT_SELECTION_MODE)
+        )
+        self.selection_mode_combo.setCurrentIndex(max(mode_index, 0))
+        self.selection_mode_combo.currentIndexChanged.connect(
+            self.on_selection_mode_changed
+        )
+        mode_layout.addWidget(self.selection_mode_combo)
+        settings_layout.addLayout(mode_layout)
+
+        # 动画时长选择
+        duration_layout = QHBoxLayout()
+        duration_layout.addWidget(QLabel("动画时长:"))
+        self.animation_duration_combo = QComboBox()
+        for duration_ms, title in self.ANIMATION_DURATIONS.items():
+            self.animation_duration_combo.addItem(title, duration_ms)
+        duration_ms = self.roll_call_animation.duration_ms
+        if self.animation_duration_combo.findData(duration_ms) < 0:
+            # config.json 中手动设置的时长
+            self.animation_duration_combo.addItem(f"{duration_ms} 毫秒", duration_ms)
+        self.animation_duration_combo.setCurrentIndex(
+            self.animation_duration_combo.findData(duration_ms)
+        )
+        self.animation_duration_combo.currentIndexChanged.connect(
+            self.on_animation_duration_changed
+        )
+        duration_layout.addWidget(self.animation_duration_combo)
+        settings_layout.addLayout(duration_layout)
+
         left_layout.addWidget(settings_group)
 
         # 按钮区域
@@ -463,6 +402,8 @@ class RandomRollCallApp(QMainWindow):
         font.setPointSize(26)  # 增大字体
         font.setBold(True)
         self.current_result_label.setFont(font)
+        # 动画中和动画结束后的样式都在这里一次设置好，通过动态属性 state 切换，
+        # 动画每一帧只更新文字，不重新解析样式表
         self.current_result_label.setStyleSheet("""
             QLabel {
                 background-color: #fffffe;
@@ -472,8 +413,22 @@ class RandomRollCallApp(QMainWindow):
                 color: #232323;
                 qproperty-alignment: 'AlignCenter';
             }
+            QLabel[state="rolling"] {
+                background-color: #f45d48;
+                border-color: #232323;
+                color: #fffffe;
+                font-size: 32px;  /* 更大字体 */
+                font-weight: bold;
+            }
+            QLabel[state="done"] {
+                font-size: 28px;  /* 更大字体 */
+                font-weight: bold;
+            }
         """)
         current_layout.addWidget(self.current_result_label)
+        self.roll_call_animation.frameChanged.connect(
+            self.current_result_label.setText
+        )
 
         right_layout.addWidget(current_group)
 
@@ -528,6 +483,14 @@ class RandomRollCallApp(QMainWindow):
         import_action.triggered.connect(self.import_students)
         file_menu.addAction(import_action)
 
+        bulk_folder_action = QAction("批量导入班级（文件夹）", self)
+        bulk_folder_action.triggered.connect(self.bulk_import_folder)
+        file_menu.addAction(bulk_folder_action)
+
+        bulk_workbook_action = QAction("批量导入班级（多工作表文件）", self)
+        bulk_workbook_action.triggered.connect(self.bulk_import_workbook)
+        file_menu.addAction(bulk_workbook_action)
+
         file_menu.addSeparator()
 
         exit_action = QAction("退出", self)
@@ -545,6 +508,10 @@ class RandomRollCallApp(QMainWindow):
         clear_history_action.triggered.connect(self.clear_history)
         history_menu.addAction(clear_history_action)
 
+        verify_history_action = QAction("核对抽取记录", self)
+        verify_history_action.triggered.connect(self.verify_history)
+        history_menu.addAction(verify_history_action)
+
         # 工具菜单
         tools_menu = menubar.addMenu("工具")
 
@@ -552,10 +519,19 @@ class RandomRollCallApp(QMainWindow):
         stats_action.triggered.connect(self.show_statistics)
         tools_menu.addAction(stats_action)
 
+        group_action = QAction("随机分组", self)
+        group_action.triggered.connect(self.split_into_groups)
+        tools_menu.addAction(group_action)
+
         clear_all_action = QAction("清空学生名单", self)
         clear_all_action.triggered.connect(self.clear_all_students)
         tools_menu.addAction(clear_all_action)
 
+    def preload_excel_importer(self):
+        """窗口显示后在后台线程预加载Excel组件"""
+        if self.data_storage.config.get("preload_excel", True):
+            threading.Thread(target=ExcelImporter.preload, daemon=True).start()
+
     def load_settings(self):
         """加载设置"""
         config = self.data_storage.config
@@ -578,10 +554,8 @@ class RandomRollCallApp(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.students = []
+            self.data_storage.set_current_student_ids(id_array())
             self.update_students_list()
-            self.data_storage.set_current_students(self.students)  # Use the new method
-            self.data_storage.save_classes()  # Save all class data
             QMessageBox.information(self, "成功", "学生名单已清空！")
 
     def closeEvent(self, event):
@@ -589,27 +563,37 @@ class RandomRollCallApp(QMainWindow):
         # 保存当前配置
         self.save_settings()
         # 保存数据
-        self.data_storage.set_current_students(self.students)  # Use the new method
+        self.data_storage.set_current_student_ids(self.student_ids)
         self.data_storage.history = self.history
-        self.data_storage.save_classes()  # Save all class data
-        self.data_storage.save_history(self.history)
+        self.data_storage.flush()  # 同步写入所有待保存的数据
+        self.data_storage.compact_history()  # 退出时合并历史日志
 
         event.accept()
 
     def save_settings(self):
         """保存设置"""
-        config = {
-            "num_students": self.num_spinbox.value(),
-            "prevent_duplicate": self.prevent_duplicate_cb.isChecked(),
-            "window_geometry": [self.x(), self.y(), self.width(), self.height()],
-        }
+        # 保留 storage_backend 等界面之外的配置项
+        config = dict(self.data_storage.config)
+        config.update(
+            {
+                "num_students": self.num_spinbox.value(),
+                "prevent_duplicate": self.prevent_duplicate_cb.isChecked(),
+                "selection_mode": self.selection_mode_combo.currentData(),
+                "animation_duration_ms": self.roll_call_animation.duration_ms,
+                "window_geometry": [self.x(), self.y(), self.width(), self.height()],
+            }
+        )
         self.data_storage.config = config
-        self.data_storage.save_config(config)
+        self.data_storage.mark_dirty("config")
 
     def import_students(self):
         """导入学生名单"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择学生名单文件", "", "Excel文件 (*.xlsx *.xls)"
+            self,
+            "选择学生名单文件",
+            "",
+            "名单文件 (*.xlsx *.xls *.csv *.tsv *.txt);;Excel文件 (*.xlsx *.xls);;"
+            "CSV/TSV文件 (*.csv *.tsv);;文本文件 (*.txt)",
         )
 
         if not file_path:
@@ -620,93 +604,281 @@ class RandomRollCallApp(QMainWindow):
             QMessageBox.critical(self, "错误", f"文件不存在: {file_path}")
             return
 
-        try:
-            new_students = ExcelImporter.import_from_excel(file_path)
+        self.start_import(file_path)
 
-            # 验证数据，传入现有的学生名单进行重复检查
-            validation_result = ExcelImporter.validate_data(new_students, self.students)
+    def start_import(self, file_path: str):
+        """在后台线程读取并验证名单文件，期间显示可取消的进度对话框
 
-            if not validation_result["valid"]:
-                error_msg = "\n".join(validation_result["errors"])
-                QMessageBox.critical(
-                    self, "数据验证失败", f"导入的Excel文件包含错误:\n{error_msg}"
-                )
+        CSV/TSV 表头有多列时，先让用户选择姓名所在的列。
+        """
+        try:
+            header = ExcelImporter.read_text_header(file_path)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            QMessageBox.critical(self, "错误", f"读取表头失败: {e}")
+            return
+        column = None
+        if len(header) > 1:
+            index = self.choose_name_column(header)
+            if index is None:
                 return
+            # 第一列与不指定列相同，共用同一份导入缓存
+            column = header[index] if index > 0 else None
+
+        worker = ImportWorker(
+            file_path,
+            self.students,
+            self.data_storage.performance.recommended_limit(),
+            column,
+        )
+        worker.signals.finished.connect(self.on_import_finished)
+        self.run_import_worker(worker, "正在读取名单文件...")
 
-            if validation_result["warnings"]:
-                warning_msg = "\n".join(validation_result["warnings"])
-                # 显示警告但仍然允许导入
-                reply = QMessageBox.question(
-                    self,
-                    "数据验证警告",
-                    f"导入的Excel文件包含警告:\n{warning_msg}\n\n是否继续导入？",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+    def choose_name_column(self, header: List[str]) -> Optional[int]:
+        """让用户从表头中选择姓名所在的列，返回列的位置，取消时返回 None
+
+        列按表头名称查找，表头为空或与前面的列重名的列不可选（第一列除外）。
+        """
+        from PyQt6.QtWidgets import QInputDialog
+
+        choices = [
+            i
+            for i, name in enumerate(header)
+            if i == 0 or (name and name not in header[:i])
+        ]
+        items = [header[i] or "第 1 列（无表头）" for i in choices]
+        # 默认选中表头含“姓名”或 name 的列
+        default = next(
+            (
+                n
+                for n, i in enumerate(choices)
+                if "姓名" in header[i] or "name" in header[i].lower()
+            ),
+            0,
+        )
+        item, ok = QInputDialog.getItem(
+            self, "选择姓名列", "文件有多列，请选择姓名所在的列:", items, default, False
+        )
+        if not ok:
+            return None
+        return choices[items.index(item)]
+
+    def run_import_worker(self, worker, label: str):
+        """显示可取消的进度对话框，并在线程池中运行导入任务（结束信号由调用方连接）"""
+        progress = QProgressDialog(label, "取消", 0, 0, self)
+        progress.setWindowTitle("导入学生名单")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoReset(False)
+        progress.setAutoClose(False)
+        progress.canceled.connect(worker.cancel)
+
+        worker.signals.progress.connect(self.update_import_progress)
+        worker.signals.failed.connect(self.on_import_failed)
+        worker.signals.cancelled.connect(self.on_import_cancelled)
+        self.import_worker = worker
+        self.import_progress = progress
+        QThreadPool.globalInstance().start(worker)
+
+    def update_import_progress(self, stage: str, done: int, total: int):
+        """显示后台导入的进度：读取阶段总行数未知，只显示已读取的行数"""
+        if self.import_progress is None:
+            return
+        if stage == STAGE_READ:
+            self.import_progress.setLabelText(f"正在读取名单文件... 已读取 {done} 行")
+        elif stage == STAGE_PARSE_SHEETS:
+            self.import_progress.setLabelText("正在读取各工作表...")
+        else:
+            self.import_progress.setMaximum(max(total, 1))
+            self.import_progress.setValue(done)
+            if stage == STAGE_PARSE_FILES:
+                self.import_progress.setLabelText(f"正在读取名单文件... {done} / {total} 个")
+            else:
+                self.import_progress.setLabelText(f"正在检查姓名... {done} / {total} 行")
+
+    def end_import(self):
+        """关闭进度对话框（后台任务已经结束）"""
+        progress = self.import_progress
+        self.import_worker = None
+        self.import_progress = None
+        if progress is not None:
+            progress.canceled.disconnect()
+            progress.close()
+            progress.deleteLater()
+
+    def on_import_cancelled(self):
+        self.end_import()
+        print("已取消导入学生名单")
+
+    def on_import_failed(self, error: Exception):
+        self.end_import()
+        if isinstance(error, FileNotFoundError):
+            QMessageBox.critical(self, "文件错误", f"找不到指定文件: {str(error)}")
+        elif isinstance(error, ValueError):
+            QMessageBox.critical(self, "文件格式错误", f"名单文件格式不正确: {str(error)}")
+        else:
+            QMessageBox.critical(self, "错误", f"导入失败: {str(error)}")
+            import traceback
+
+            print(
+                "导入异常: "
+                + "".join(
+                    traceback.format_exception(type(error), error, error.__traceback__)
                 )
-                if reply == QMessageBox.StandardButton.No:
-                    return
+            )
+
+    def on_import_finished(self, new_students: List[str], validation_summary):
+        """后台读取和验证完成后，在界面线程确认并合并到当前班级"""
+        self.end_import()
+        if not validation_summary.valid:
+            error_msg = validation_summary.format_issues("error")
+            QMessageBox.critical(
+                self, "数据验证失败", f"导入的名单文件包含错误:\n{error_msg}"
+            )
+            return
 
-            if not new_students:
-                QMessageBox.warning(self, "警告", "Excel文件中没有找到有效学生姓名！")
+        if validation_summary.warning_count:
+            warning_msg = validation_summary.format_issues("warning")
+            # 显示警告但仍然允许导入
+            reply = QMessageBox.question(
+                self,
+                "数据验证警告",
+                f"导入的名单文件包含警告:\n{warning_msg}\n\n是否继续导入？",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            )
+            if reply == QMessageBox.StandardButton.No:
                 return
 
-            # 检查重复
-            existing_set = set(self.students)
-            new_set = set(new_students)
-            duplicates = existing_set.intersection(new_set)
+        if not new_students:
+            QMessageBox.warning(self, "警告", "文件中没有找到有效学生姓名！")
+            return
 
-            if duplicates:
-                reply = QMessageBox.question(
-                    self,
-                    "确认",
-                    f"发现 {len(duplicates)} 个重复姓名，是否继续导入（包括重复的）？\n重复姓名: {', '.join(list(duplicates)[:5])}{'...' if len(duplicates) > 5 else ''}",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                )
+        # 检查重复
+        existing_set = set(self.students)
+        new_set = set(new_students)
+        duplicates = existing_set.intersection(new_set)
 
-                if reply == QMessageBox.StandardButton.No:
-                    # 只导入不重复的学生
-                    new_students = [
-                        name for name in new_students if name not in existing_set
-                    ]
-                    # 仍然使用智能合并方法，但不保留重复项
-                    self.students = self.merge_student_lists(
-                        self.students, new_students, keep_duplicates=False
-                    )
-                else:
-                    # 导入所有学生，包括重复的
-                    self.students = self.merge_student_lists(
-                        self.students, new_students, keep_duplicates=True
-                    )
+        if duplicates:
+            reply = QMessageBox.question(
+                self,
+                "确认",
+                f"发现 {len(duplicates)} 个重复姓名，是否继续导入（包括重复的）？\n重复姓名: {', '.join(list(duplicates)[:5])}{'...' if len(duplicates) > 5 else ''}",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            )
+
+            if reply == QMessageBox.StandardButton.No:
+                # 只导入不重复的学生
+                new_students = [
+                    name for name in new_students if name not in existing_set
+                ]
+                # 仍然使用智能合并方法，但不保留重复项
+                merged = self.merge_student_lists(
+                    self.students, new_students, keep_duplicates=False
+                )
             else:
-                # 没有重复，直接导入
-                self.students = self.merge_student_lists(
+                # 导入所有学生，包括重复的
+                merged = self.merge_student_lists(
                     self.students, new_students, keep_duplicates=True
                 )
+        else:
+            # 没有重复，直接导入
+            merged = self.merge_student_lists(
+                self.students, new_students, keep_duplicates=True
+            )
 
-            # 更新界面
-            self.update_students_list()
-            self.data_storage.set_current_students(self.students)  # Use the new method
-            self.data_storage.save_classes()  # Save all class data
+        # 只追加新增部分，界面只插入对应的行
+        self.add_students(merged[len(self.students) :])
 
-            success_msg = f"成功导入 {len(new_students)} 个学生姓名！\n当前总人数: {len(self.students)}"
-            if validation_result["warnings"]:
-                success_msg += f"\n(包含{len(validation_result['warnings'])}个警告)"
+        success_msg = f"成功导入 {len(new_students)} 个学生姓名！\n当前总人数: {len(self.students)}"
+        if validation_summary.warning_count:
+            success_msg += f"\n(包含{validation_summary.warning_count}个警告)"
 
-            # 如果有重复姓名，在消息中显示详情
-            if validation_result["duplicates"]:
-                dup_msg = f"\n重复姓名: {', '.join(validation_result['duplicates'][:5])}{'...' if len(validation_result['duplicates']) > 5 else ''}"
-                success_msg += dup_msg
+        # 如果有重复姓名，在消息中显示详情
+        if validation_summary.duplicates:
+            dup_msg = f"\n重复姓名: {', '.join(validation_summary.duplicates[:5])}{'...' if len(validation_summary.duplicates) > 5 else ''}"
+            success_msg += dup_msg
 
-            QMessageBox.information(self, "成功", success_msg)
+        QMessageBox.information(self, "成功", success_msg)
 
-        except FileNotFoundError as e:
-            QMessageBox.critical(self, "文件错误", f"找不到指定文件: {str(e)}")
-        except ValueError as e:
-            QMessageBox.critical(self, "文件格式错误", f"Excel文件格式不正确: {str(e)}")
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"导入失败: {str(e)}")
-            import traceback
+    def bulk_import_folder(self):
+        """从文件夹批量导入班级：每个名单文件一个班级，班级名为文件名"""
+        folder = QFileDialog.getExistingDirectory(self, "选择包含各班名单文件的文件夹")
+        if not folder:
+            return
 
-            print(f"导入异常: {traceback.format_exc()}")
+        try:
+            paths = list_class_files(folder)
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"无法读取文件夹: {str(e)}")
+            return
+        if not paths:
+            QMessageBox.warning(self, "警告", "文件夹中没有名单文件（.xlsx .xls .csv .tsv .txt）！")
+            return
+
+        worker = BulkImportWorker(paths=paths)
+        worker.signals.finished.connect(self.on_bulk_import_finished)
+        self.run_import_worker(worker, f"正在读取 {len(paths)} 个名单文件...")
+
+    def bulk_import_workbook(self):
+        """从多工作表的Excel文件批量导入班级：每个工作表一个班级，班级名为工作表名"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择每个工作表为一个班级的Excel文件", "", "Excel文件 (*.xlsx *.xls)"
+        )
+        if not file_path:
+            return
+
+        worker = BulkImportWorker(workbook=file_path)
+        worker.signals.finished.connect(self.on_bulk_import_finished)
+        self.run_import_worker(worker, "正在读取各工作表...")
+
+    def on_bulk_import_finished(self, results: list, _):
+        """批量解析完成后确认，再一次写入所有班级"""
+        self.end_import()
+        classes, skipped = collect_classes(results)
+        skipped_msg = ""
+        if skipped:
+            lines = [
+                f"{os.path.basename(result.source)}: "
+                + " ".join(line.strip() for line in result.error.splitlines()[:2])
+                for result in skipped[:10]
+            ]
+            if len(skipped) > 10:
+                lines.append(f"…… 另有 {len(skipped) - 10} 个")
+            skipped_msg = f"\n\n以下 {len(skipped)} 个名单将被跳过:\n" + "\n".join(lines)
+
+        if not classes:
+            QMessageBox.warning(self, "警告", "没有可以导入的班级！" + skipped_msg)
+            return
+
+        existing = [name for name in classes if name in self.data_storage.classes]
+        existing_msg = ""
+        if existing:
+            existing_msg = (
+                f"\n其中 {len(existing)} 个班级已存在，名单将被替换: "
+                f"{', '.join(existing[:5])}{'...' if len(existing) > 5 else ''}"
+            )
+        total = sum(len(names) for names in classes.values())
+        reply = QMessageBox.question(
+            self,
+            "确认批量导入",
+            f"将导入 {len(classes)} 个班级，共 {total} 名学生。{existing_msg}{skipped_msg}"
+            "\n\n是否继续？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply == QMessageBox.StandardButton.No:
+            return
+
+        created, updated = self.data_storage.import_classes(classes)
+        current_class = self.data_storage.current_class
+        self.update_class_selector()
+        self.class_selector.setCurrentText(current_class)
+        self.update_students_list()
+
+        QMessageBox.information(
+            self,
+            "成功",
+            f"成功导入 {len(classes)} 个班级（新建 {len(created)} 个，更新 {len(updated)} 个），"
+            f"共 {total} 名学生！",
+        )
 
     def manual_input_student(self):
         """手动添加学生姓名"""
@@ -763,18 +935,22 @@ class RandomRollCallApp(QMainWindow):
                 return
 
             # 验证输入的姓名
-            validation_result = ExcelImporter.validate_data(new_names, self.students)
+            validation_summary = ExcelImporter.summarize_validation(
+                new_names,
+                self.students,
+                self.data_storage.performance.recommended_limit(),
+            )
 
-            if not validation_result["valid"]:
-                error_msg = "\n".join(validation_result["errors"])
+            if not validation_summary.valid:
+                error_msg = validation_summary.format_issues("error")
                 QMessageBox.critical(
                     self, "输入验证失败", f"输入包含错误:\n{error_msg}"
                 )
                 return
 
             # 询问是否保留重复姓名
-            if validation_result["warnings"]:
-                warning_msg = "\n".join(validation_result["warnings"])
+            if validation_summary.warning_count:
+                warning_msg = validation_summary.format_issues("warning")
                 reply = QMessageBox.question(
                     self,
                     "输入验证警告",
@@ -828,22 +1004,15 @@ class RandomRollCallApp(QMainWindow):
                 # 没有重复，全部导入
                 names_to_add = new_names
 
-            # 添加新姓名到列表
-            added_count = 0
-            for name in names_to_add:
-                self.students.append(name)  # 允许添加（包括可能的重复）
-                added_count += 1
-
-            # 更新界面
-            self.update_students_list()
-            self.data_storage.set_current_students(self.students)  # Use the new method
-            self.data_storage.save_classes()  # Save all class data
+            # 添加新姓名到列表（允许包括可能的重复），界面只插入新增的行
+            self.add_students(names_to_add)
+            added_count = len(names_to_add)
 
             success_msg = f"成功添加 {added_count} 个新学生姓名！\n当前总人数: {len(self.students)}"
 
             # 如果有重复姓名，在消息中显示详情
-            if validation_result["duplicates"]:
-                dup_msg = f"\n重复姓名已跳过: {', '.join(validation_result['duplicates'][:5])}{'...' if len(validation_result['duplicates']) > 5 else ''}"
+            if validation_summary.duplicates:
+                dup_msg = f"\n重复姓名已跳过: {', '.join(validation_summary.duplicates[:5])}{'...' if len(validation_summary.duplicates) > 5 else ''}"
                 success_msg += dup_msg
 
             QMessageBox.information(self, "成功", success_msg)
@@ -852,41 +1021,41 @@ class RandomRollCallApp(QMainWindow):
         """手动移除选中的学生姓名"""
         from PyQt6.QtWidgets import QMessageBox
 
-        # 获取选中的项目
-        selected_items = self.students_list.selectedItems()
+        # 获取选中的行
+        selected_rows = self.selected_student_rows()
 
-        if not selected_items:
+        if not selected_rows:
             QMessageBox.information(self, "提示", "请先选择要移除的学生姓名！")
             return
 
-        # 获取要移除的姓名
-        names_to_remove = [item.text() for item in selected_items]
+        # 获取要移除的姓名（只用于确认提示）
+        names_to_remove = [self.students[row] for row in selected_rows[:5]]
 
         # 确认删除
         reply = QMessageBox.question(
             self,
             "确认删除",
-            f"确定要删除选中的 {len(names_to_remove)} 个学生姓名吗？\n{', '.join(names_to_remove[:5])}{'...' if len(names_to_remove) > 5 else ''}",
+            f"确定要删除选中的 {len(selected_rows)} 个学生姓名吗？\n{', '.join(names_to_remove)}{'...' if len(selected_rows) > 5 else ''}",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            # 从学生列表中移除选中的姓名
-            for name in names_to_remove:
-                if name in self.students:
-                    self.students.remove(name)
-
-            # 更新界面
-            self.update_students_list()
-            self.data_storage.set_current_students(self.students)  # Use the new method
-            self.data_storage.save_classes()  # Save all class data
+            # 按行号移除选中的姓名，界面只删除对应的行
+            self.students_model.remove_rows(selected_rows)
+            self.data_storage.set_current_student_ids(self.student_ids)
 
             QMessageBox.information(
                 self,
                 "成功",
-                f"成功删除 {len(names_to_remove)} 个学生姓名！\n当前总人数: {len(self.students)}",
+                f"成功删除 {len(selected_rows)} 个学生姓名！\n当前总人数: {len(self.students)}",
             )
 
+    def add_students(self, names: List[str]):
+        """为每个姓名登记一个新学生，追加到当前班级"""
+        student_ids = self.data_storage.roster.add_students(names)
+        self.students_model.append_student_ids(student_ids)
+        self.data_storage.set_current_student_ids(self.student_ids)
+
     def merge_student_lists(
         self,
         existing_list: List[str],
@@ -923,18 +1092,14 @@ class RandomRollCallApp(QMainWindow):
     def on_class_changed(self, class_name: str):
         """班级选择改变时的处理"""
         if class_name and class_name != self.data_storage.current_class:
-            # Save current class data before switching
-            self.data_storage.set_current_students(self.students)
-
             # Update current class
             self.data_storage.current_class = class_name
 
             # Load new class data
-            self.students = self.data_storage.get_current_students().copy()
             self.update_students_list()
 
             # Save the updated current class setting
-            self.data_storage.save_classes()
+            self.data_storage.mark_dirty("classes")
 
     def add_class(self):
         """添加新班级"""
@@ -948,8 +1113,8 @@ class RandomRollCallApp(QMainWindow):
                 return
 
             # Add the new class with empty student list
-            self.data_storage.classes[new_class] = []
-            self.data_storage.save_classes()
+            self.data_storage.classes[new_class] = id_array()
+            self.data_storage.mark_dirty("classes")
 
             # Update the selector and switch to the new class
             self.update_class_selector()
@@ -978,14 +1143,15 @@ class RandomRollCallApp(QMainWindow):
                 return
 
             # Save current students before renaming
-            current_students = self.data_storage.get_current_students()
+            current_students = self.data_storage.get_current_student_ids()
 
             # Remove old class and add new one
             del self.data_storage.classes[current_class]
             self.data_storage.classes[new_name] = current_students
             self.data_storage.current_class = new_name
+            self.data_storage.selection.rename_class(current_class, new_name)
 
-            self.data_storage.save_classes()
+            self.data_storage.mark_dirty("classes", "selection")
 
             # Update UI
             self.update_class_selector()
@@ -1014,15 +1180,13 @@ class RandomRollCallApp(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             # Delete the class
             del self.data_storage.classes[current_class]
+            self.data_storage.selection.remove_class(current_class)
 
             # Switch to the first available class
             available_classes = list(self.data_storage.classes.keys())
             self.data_storage.current_class = available_classes[0]
 
-            # Update current students to the new class
-            self.students = self.data_storage.get_current_students().copy()
-
-            self.data_storage.save_classes()
+            self.data_storage.mark_dirty("classes", "selection")
 
             # Update UI
             self.update_class_selector()
@@ -1034,9 +1198,58 @@ class RandomRollCallApp(QMainWindow):
             )
 
     def update_students_list(self):
-        """更新学生名单列表"""
-        self.students_list.clear()
-        self.students_list.addItems(self.students)
+        """按当前班级整体刷新学生名单列表（切换班级、清空名单等）"""
+        student_ids = self.data_storage.get_current_student_ids()
+        with self.data_storage.performance.measure("list_refresh", len(student_ids)):
+            self.students_model.set_student_ids(student_ids)
+
+    def set_list_model(self, model):
+        """切换名单视图显示的模型（完整名单或搜索结果）"""
+        if self.students_list.model() is model:
+            return
+        old_selection = self.students_list.selectionModel()
+        self.students_list.setModel(model)
+        old_selection.deleteLater()
+
+    def apply_student_filter(self, text: str):
+        """按搜索框内容筛选名单，清空搜索框时显示完整名单"""
+        if not text.strip():
+            self.filter_status_label.hide()
+            self.set_list_model(self.students_model)
+            return
+
+        matches = self.students_model.search_rows(text, self.FILTER_RESULT_LIMIT)
+        self.filter_rows = matches
+        self.filter_model.setStringList([self.students[row] for row in matches])
+        self.set_list_model(self.filter_model)
+        if len(matches) >= self.FILTER_RESULT_LIMIT:
+            self.filter_status_label.setText(
+                f"仅显示前 {self.FILTER_RESULT_LIMIT} 个匹配，请输入更多字符"
+            )
+        else:
+            self.filter_status_label.setText(f"找到 {len(matches)} 人")
+        self.filter_status_label.show()
+
+    def schedule_filter_refresh(self, *args):
+        """名单变化后刷新搜索结果；同一轮事件中的多次变化只刷新一次"""
+        if self.filter_refresh_pending or not self.filter_input.text().strip():
+            return
+        self.filter_refresh_pending = True
+
+        def refresh():
+            self.filter_refresh_pending = False
+            self.apply_student_filter(self.filter_input.text())
+
+        QTimer.singleShot(0, refresh)
+
+    def selected_student_rows(self) -> List[int]:
+        """返回选中学生在完整名单中的行号"""
+        selection = self.students_list.selectionModel()
+        rows = [index.row() for index in selection.selectedRows()]
+        if self.students_list.model() is self.students_model:
+            return rows
+        # 搜索结果的每一行对应完整名单中的一行，重名的学生也能区分
+        return [self.filter_rows[row] for row in rows]
 
     def on_num_changed(self, value):
         """点名人数变化"""
@@ -1046,6 +1259,17 @@ class RandomRollCallApp(QMainWindow):
         """防重复选项变化"""
         self.save_settings()
 
+    def on_selection_mode_changed(self, index):
+        """抽取方式变化"""
+        self.save_settings()
+
+    def on_animation_duration_changed(self, index):
+        """动画时长变化"""
+        self.roll_call_animation.duration_ms = (
+            self.animation_duration_combo.currentData()
+        )
+        self.save_settings()
+
     def start_roll_call(self):
         """开始点名"""
         if not self.students:
@@ -1063,78 +1287,60 @@ class RandomRollCallApp(QMainWindow):
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
 
-        # 开始动画效果
-        self.animation_counter = 0
+        # 开始动画效果：先一次生成全部帧，动画播放时只切换文字；
+        # 即时模式下 start 会直接触发 finish_roll_call
         self.current_names = []
+        if self.roll_call_animation.duration_ms > 0:
+            self.set_result_state("rolling")
+        self.roll_call_animation.start(self.build_animation_frames())
+
+    def build_animation_frames(self) -> List[str]:
+        """生成点名动画每一帧显示的文字"""
+        student_ids = self.student_ids
+        names_of = self.data_storage.roster.names_of
+        num = min(self.num_spinbox.value(), len(student_ids))
+        frames = ["正在随机点名..."] * self.ANIMATION_NAMES_FRAME
+
+        # 滚动阶段：每帧最多显示 3 个随机姓名，一次抽出全部帧所需的姓名
+        per_frame = min(3, num)
+        rolling = self.ANIMATION_SLOW_FRAME - self.ANIMATION_NAMES_FRAME
+        names = names_of(random.choices(student_ids, k=rolling * per_frame))
+        frames.extend(
+            "\n".join(names[i : i + per_frame])
+            for i in range(0, len(names), per_frame)
+        )
 
-        if self.roll_call_timer:
-            self.roll_call_timer.stop()
-
-        self.roll_call_timer = QTimer(self)
-        self.roll_call_timer.timeout.connect(self.update_roll_call_animation)
-        self.roll_call_timer.start(100)  # 每100毫秒更新一次
-
-    def update_roll_call_animation(self):
-        """更新点名动画效果"""
-        if self.animation_counter < 30:  # 动画持续3秒 (30 * 100ms)
-            # 随机选择学生姓名作为动画效果，增加动画速度变化
-            if self.animation_counter < 10:
-                display_text = "正在随机点名..."
-            elif self.animation_counter < 20:
-                temp_names = random.choices(self.students, k=min(3, len(self.students)))
-                display_text = "\n".join(temp_names[: self.num_spinbox.value()])
-            else:
-                # 接近结束时放慢速度，增加紧张感
-                temp_names = random.choices(self.students, k=min(5, len(self.students)))
-                display_text = "\n".join(
-                    random.sample(
-                        self.students, min(self.num_spinbox.value(), len(self.students))
-                    )
-                )
-
-            self.current_result_label.setText(display_text)
-            # 改变样式以增强动画效果
-            self.current_result_label.setStyleSheet("""
-                QLabel {
-                    background-color: #f45d48;
-                    border: 4px solid #232323;
-                    border-radius: 20px;
-                    padding: 40px;
-                    color: #fffffe;
-                    font-size: 32px;  /* 更大字体 */
-                    font-weight: bold;
-                    qproperty-alignment: 'AlignCenter';
-                }
-            """)
-            self.animation_counter += 1
-        else:
-            # 停止动画并确定最终结果
-            self.select_random_students()
-            self.roll_call_timer.stop()
-            # 恢复正常样式
-            self.current_result_label.setStyleSheet("""
-                QLabel {
-                    background-color: #fffffe;
-                    border: 4px solid #078080;
-                    border-radius: 20px;
-                    padding: 40px;
-                    color: #232323;
-                    font-size: 28px;  /* 更大字体 */
-                    font-weight: bold;
-                    qproperty-alignment: 'AlignCenter';
-                }
-            """)
-            self.start_btn.setEnabled(True)
-            self.stop_btn.setEnabled(False)
-
-    def stop_roll_call(self):
-        """停止点名"""
-        if self.roll_call_timer:
-            self.roll_call_timer.stop()
-
+        # 接近结束时放慢速度，增加紧张感：每帧显示完整人数、不重复的候选
+        frames.extend(
+            "\n".join(names_of(random.sample(student_ids, num)))
+            for _ in range(self.ANIMATION_FRAMES - self.ANIMATION_SLOW_FRAME)
+        )
+        return frames
+
+    def set_result_state(self, state: str):
+        """切换结果标签的样式（"rolling" 动画中，"done" 已出结果）"""
+        label = self.current_result_label
+        label.setProperty("state", state)
+        # 动态属性改变后需要重新应用样式，每次点名只发生两次
+        label.style().unpolish(label)
+        label.style().polish(label)
+
+    def finish_roll_call(self):
+        """抽取最终结果，恢复正常样式；配置了 report_animation_timing 时输出动画耗时"""
         self.select_random_students()
+        self.set_result_state("done")
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
+        if (
+            self.data_storage.config.get("report_animation_timing", False)
+            and self.roll_call_animation.frame_timer.work
+        ):
+            print(f"点名动画: {self.roll_call_animation.report()}")
+
+    def stop_roll_call(self):
+        """停止点名"""
+        self.roll_call_animation.stop()
+        self.finish_roll_call()
 
     def select_random_students(self):
         """选择随机学生"""
@@ -1155,31 +1361,43 @@ class RandomRollCallApp(QMainWindow):
                 )
                 return
 
-            selected = random.sample(self.students, num_to_select)
-        else:
-            # 允许重复模式：可重复选择
-            selected = random.choices(self.students, k=num_to_select)
+        # 按所选抽取方式抽取；轮流点名、减少近期重复会记住本班之前的抽取情况
+        mode = self.selection_mode_combo.currentData()
+        selected_ids, draw_info = self.data_storage.selection.draw(
+            self.data_storage.current_class,
+            mode,
+            self.student_ids,
+            num_to_select,
+            prevent_duplicate,
+        )
+        self.data_storage.mark_dirty("selection")  # 保存抽取序号和策略状态
 
+        selected = self.data_storage.roster.names_of(selected_ids)
         self.current_names = selected
         self.current_result_label.setText("\n".join(selected))
 
         # 记录到历史
-        self.add_to_history(selected)
+        self.add_to_history(selected_ids, draw_info)
 
-    def add_to_history(self, names: List[str]):
-        """添加到历史记录"""
+    def add_to_history(self, student_ids: List[int], draw_info: Dict = None):
+        """添加到历史记录：学生 ID、花名册编号、用于复现的抽取信息，以及花名册重建后备用的姓名"""
         try:
             timestamp = datetime.now()
+            roster = self.data_storage.roster
             record = {
-                "names": names,
+                "ids": list(student_ids),
+                "names": roster.names_of(student_ids),
+                "roster": roster.generation,
                 "timestamp": timestamp.isoformat(),
                 "date": timestamp.strftime("%Y-%m-%d"),
                 "time": timestamp.strftime("%H:%M:%S"),
             }
+            if draw_info is not None:
+                record["draw"] = draw_info
 
             self.history.insert(0, record)
             self.data_storage.history = self.history
-            self.data_storage.save_history(self.history)
+            self.data_storage.append_history(record)
 
             # 更新历史记录显示
             self.update_history_display()
@@ -1200,7 +1418,7 @@ class RandomRollCallApp(QMainWindow):
         text = ""
 
         for record in recent_history:
-            names_str = ", ".join(record["names"])
+            names_str = ", ".join(self.data_storage.record_names(record))
             text += f"[{record['date']} {record['time']}] {names_str}\n"
 
         self.history_text.setPlainText(text)
@@ -1215,10 +1433,8 @@ class RandomRollCallApp(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.students = []
+            self.data_storage.set_current_student_ids(id_array())
             self.update_students_list()
-            self.data_storage.set_current_students(self.students)  # Use the new method
-            self.data_storage.save_classes()  # Save all class data
 
     def view_history(self):
         """查看详细历史记录"""
@@ -1237,7 +1453,7 @@ class RandomRollCallApp(QMainWindow):
 
         history_list = QListWidget()
         for record in self.history:
-            names_str = ", ".join(record["names"])
+            names_str = ", ".join(self.data_storage.record_names(record))
             item_text = f"[{record['date']} {record['time']}] {names_str}"
             history_list.addItem(item_text)
 
@@ -1263,6 +1479,9 @@ class RandomRollCallApp(QMainWindow):
             self.update_history_display()
             self.data_storage.history = self.history
             self.data_storage.save_history(self.history)
+            # 之后的抽取从全新状态开始，保证清空后的记录可以复现核对
+            self.data_storage.selection.reset_strategies()
+            self.data_storage.mark_dirty("selection")
 
     def show_statistics(self):
         """显示统计信息"""
@@ -1270,14 +1489,24 @@ class RandomRollCallApp(QMainWindow):
             QMessageBox.information(self, "统计信息", "暂无点名记录")
             return
 
-        # 统计每个学生被点名的次数
-        name_counts = {}
+        # 统计每个学生被点名的次数：按学生 ID 计数，重名的学生分开统计；
+        # 旧记录和学生 ID 已失效的记录按姓名计数
+        student_counts = Counter()
         for record in self.history:
-            for name in record["names"]:
-                name_counts[name] = name_counts.get(name, 0) + 1
+            student_ids = self.data_storage.record_student_ids(record)
+            if student_ids is None:
+                student_counts.update(self.data_storage.record_names(record))
+            else:
+                student_counts.update(student_ids)
 
         # 按次数排序
-        sorted_counts = sorted(name_counts.items(), key=lambda x: x[1], reverse=True)
+        sorted_counts = [
+            (
+                self.data_storage.roster.name(key) if isinstance(key, int) else key,
+                count,
+            )
+            for key, count in student_counts.most_common()
+        ]
 
         # 统计信息
         total_calls = len(self.history)
@@ -1301,6 +1530,68 @@ class RandomRollCallApp(QMainWindow):
 
         QMessageBox.information(self, "统计信息", stats_text)
 
+    def split_into_groups(self):
+        """把当前班级随机分成若干组"""
+        from PyQt6.QtWidgets import QInputDialog
+
+        if len(self.student_ids) < 2:
+            QMessageBox.warning(self, "警告", "学生人数不足，无法分组！")
+            return
+
+        groups, ok = QInputDialog.getInt(
+            self, "随机分组", "分成几组:", 2, 2, len(self.student_ids)
+        )
+        if not ok:
+            return
+
+        # NumPy 只在分组时才导入，不拖慢启动
+        from batch_draw import split_groups
+
+        roster = self.data_storage.roster
+        lines = []
+        for number, members in enumerate(split_groups(self.student_ids, groups), 1):
+            names = roster.names_of(members.tolist())
+            lines.append(f"第 {number} 组（{len(names)} 人）: {'、'.join(names)}")
+
+        from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("随机分组")
+        dialog.setGeometry(200, 200, 600, 400)
+
+        layout = QVBoxLayout(dialog)
+
+        groups_text = QTextEdit()
+        groups_text.setReadOnly(True)
+        groups_text.setPlainText("\n\n".join(lines))
+        layout.addWidget(groups_text)
+
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(dialog.close)
+        layout.addWidget(close_btn)
+
+        dialog.exec()
+
+    def verify_history(self):
+        """用保存的随机种子复现全部点名记录，核对结果是否一致"""
+        if not self.history:
+            QMessageBox.information(self, "核对抽取记录", "暂无点名记录")
+            return
+
+        results = Counter(self.data_storage.replay_history())
+        text = (
+            f"共 {len(self.history)} 条点名记录：\n\n"
+            f"复现一致: {results[REPLAY_MATCH]} 条\n"
+            f"复现不一致: {results[REPLAY_MISMATCH]} 条\n"
+            f"无法复现: {results[REPLAY_UNVERIFIABLE]} 条\n\n"
+            "无法复现的记录是旧版本的记录（没有保存抽取时的名单，且之后班级名单已经改变），\n"
+            "或起始抽取状态未知的记录（如清空历史记录前已经开始的轮次）。"
+        )
+        if results[REPLAY_MISMATCH]:
+            QMessageBox.warning(self, "核对抽取记录", text)
+        else:
+            QMessageBox.information(self, "核对抽取记录", text)
+
 
 def main():
     """主函数"""
@@ -1310,9 +1601,13 @@ def main():
 
     window = RandomRollCallApp()
     window.show()
+    # 等窗口绘制完成后再预加载，不拖慢首次显示
+    QTimer.singleShot(1000, window.preload_excel_importer)
 
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    # 打包后批量导入的进程池子进程会重新运行本程序，需要先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
     main()
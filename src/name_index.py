@@ -0,0 +1,187 @@
+"""
+姓名前缀索引模块
+
+为名单搜索框提供按前缀查找：姓名本身和拼音首字母（如 "张三" -> "zs"）都可以匹配。
+索引是按键排序的数组，查找只需两次二分；增删姓名时局部插入/删除，不重新扫描名单。
+"""
+
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from typing import Iterable, List
+
+try:
+    from pypinyin import Style, pinyin  # 可选依赖，覆盖全部汉字
+
+    def _pinyin_initial(char: str) -> str:
+        result = pinyin(char, style=Style.FIRST_LETTER, errors="ignore")
+        # pypinyin 没有读音的字被忽略，返回空列表，与无法识别的汉字一样处理
+        if not result or not result[0]:
+            return ""
+        return result[0][0][:1].lower()
+
+except ImportError:
+    pinyin = None
+
+# GB2312 一级汉字按拼音排序，以下是各首字母第一个汉字的区位码（未安装 pypinyin 时使用）
+_GB2312_INITIAL_STARTS = [
+    (0xB0A1, "a"), (0xB0C5, "b"), (0xB2C1, "c"), (0xB4EE, "d"), (0xB6EA, "e"),
+    (0xB7A2, "f"), (0xB8C1, "g"), (0xB9FE, "h"), (0xBBF7, "j"), (0xBFA6, "k"),
+    (0xC0AC, "l"), (0xC2E8, "m"), (0xC4C3, "n"), (0xC5B6, "o"), (0xC5BE, "p"),
+    (0xC6DA, "q"), (0xC8BB, "r"), (0xC8F6, "s"), (0xCBFA, "t"), (0xCDDA, "w"),
+    (0xCEF4, "x"), (0xD1B9, "y"), (0xD4D1, "z"),
+]
+_GB2312_CODES = [code for code, _ in _GB2312_INITIAL_STARTS]
+_GB2312_LEVEL1_END = 0xD7F9
+
+
+def char_initial(char: str) -> str:
+    """返回单个字符的拼音首字母；非汉字返回其小写形式，无法识别的汉字返回空串"""
+    if char.isspace():
+        return ""
+    if not "\u4e00" <= char <= "\u9fff":
+        return char.lower()
+    if pinyin is not None:
+        return _pinyin_initial(char)
+    try:
+        code = int.from_bytes(char.encode("gb2312"), "big")
+    except UnicodeEncodeError:
+        return ""
+    if not _GB2312_CODES[0] <= code <= _GB2312_LEVEL1_END:
+        return ""  # 二级汉字按部首排序，无法用区位码推算
+    return _GB2312_INITIAL_STARTS[bisect_right(_GB2312_CODES, code) - 1][1]
+
+
+# 首字母表中无法识别的汉字的占位符
+_UNKNOWN_INITIAL = "\0"
+
+
+class _InitialTable(dict):
+    """str.translate 用的字符 -> 首字母表，首次遇到某个字符时计算并缓存"""
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        initial = char_initial(char)
+        if not initial and _CJK_PATTERN.match(char):
+            initial = _UNKNOWN_INITIAL
+        self[code] = initial
+        return initial
+
+
+_CJK_PATTERN = re.compile("[\u4e00-\u9fff]")
+_INITIAL_TABLE = _InitialTable()
+
+
+def pinyin_initials(name: str) -> str:
+    """返回姓名的拼音首字母串，例如 "张三" -> "zs"
+
+    有无法识别首字母的汉字时（未安装 pypinyin 时的 GB2312 二级汉字和生僻字）返回空串：
+    缺了一个字的首字母串会与别人的首字母错位匹配，不如不提供。
+    """
+    initials = name.translate(_INITIAL_TABLE)
+    if _UNKNOWN_INITIAL in initials:
+        return ""
+    return initials
+
+
+def search_keys(name: str) -> List[str]:
+    """返回可用于前缀匹配的键：小写姓名，含汉字时再加上拼音首字母串"""
+    key = name.lower()
+    if _CJK_PATTERN.search(name):
+        initials = pinyin_initials(name)
+        if initials and initials != key:
+            return [key, initials]
+    return [key]
+
+
+class NameIndex:
+    """姓名前缀索引：按字典序排列的 "键\0姓名" 字符串数组"""
+
+    # 一次增删超过该数量的姓名时整体处理，比逐个插入/删除更快
+    BULK_THRESHOLD = 1000
+    _SEPARATOR = "\0"
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._entries: List[str] = []
+        self._counts: Counter = Counter()  # 姓名 -> 名单中出现的次数
+        self.rebuild(names)
+
+    def __len__(self) -> int:
+        return sum(self._counts.values())
+
+    def _entries_for(self, name: str) -> List[str]:
+        return [key + self._SEPARATOR + name for key in search_keys(name)]
+
+    def rebuild(self, names: Iterable[str]):
+        """根据完整名单重建索引"""
+        self._counts = Counter(names)
+        self._entries = [
+            entry for name in self._counts for entry in self._entries_for(name)
+        ]
+        self._entries.sort()
+
+    def add(self, names: Iterable[str]):
+        """加入新姓名，已存在的姓名只增加计数"""
+        new_names = []
+        for name in names:
+            if self._counts[name] == 0:
+                new_names.append(name)
+            self._counts[name] += 1
+        if len(new_names) > self.BULK_THRESHOLD:
+            self._entries.extend(
+                entry for name in new_names for entry in self._entries_for(name)
+            )
+            self._entries.sort()
+            return
+        for name in new_names:
+            for entry in self._entries_for(name):
+                insort(self._entries, entry)
+
+    def remove(self, names: Iterable[str]):
+        """移除姓名，计数归零时删除其索引项"""
+        dropped = []
+        for name in names:
+            if self._counts[name] > 1:
+                self._counts[name] -= 1
+                continue
+            if self._counts.pop(name, None) is not None:
+                dropped.append(name)
+        if len(dropped) > self.BULK_THRESHOLD:
+            # 大量删除时一次过滤整个数组，避免逐个删除时反复移动数组元素
+            dropped_entries = {
+                entry for name in dropped for entry in self._entries_for(name)
+            }
+            self._entries = [
+                entry for entry in self._entries if entry not in dropped_entries
+            ]
+            return
+        for name in dropped:
+            for entry in self._entries_for(name):
+                position = bisect_left(self._entries, entry)
+                if position < len(self._entries) and self._entries[position] == entry:
+                    del self._entries[position]
+
+    def search(self, prefix: str, limit: int = None) -> List[str]:
+        """
+        返回键以 prefix 开头的姓名，按键排序；重名按出现次数重复列出
+
+        Args:
+            prefix: 搜索前缀，不区分大小写
+            limit: 最多返回的姓名数，None 表示不限制
+        """
+        prefix = prefix.strip().lower().replace(self._SEPARATOR, "")
+        if not prefix:
+            return []
+        lo = bisect_left(self._entries, prefix)
+        hi = bisect_left(self._entries, prefix + "\U0010ffff", lo)
+        results = []
+        seen = set()
+        for position in range(lo, hi):
+            name = self._entries[position].split(self._SEPARATOR, 1)[1]
+            if name in seen:
+                continue
+            seen.add(name)
+            results.extend([name] * self._counts[name])
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+        return results
@@ -0,0 +1,373 @@
+"""
+姓名验证模块，提供可配置规则的姓名验证器
+
+验证结果以结构化记录（ValidationIssue）逐条产出，ValidationSummary 按规则
+计数并只保留少量示例，供界面显示，不会把几十万行错误拼成一条消息。
+
+少量输入（如手动添加）逐个检查；大批量输入（如从Excel导入的整张名单）
+在安装了NumPy时批量检查：正则在整段文本上扫描一次，用NumPy把匹配位置映射回行号，
+只对可能有问题的行逐个检查。重复姓名的分组两种方式相同，都是一次字典遍历。
+"""
+
+import re
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from roster_performance import DEFAULT_ROSTER_LIMIT
+
+# 姓名中不允许出现的特殊字符
+INVALID_NAME_PATTERN = re.compile(r'[!@#$%^&*()+=\[\]{}|\\:";\'<>?,./]')
+# 批量检查用：不含任何常见字母（拉丁字母、常用汉字）的行，需逐个精确检查
+NO_COMMON_LETTER_LINE = re.compile(r"^[^A-Za-z\u4e00-\u9fff\n]*$", re.MULTILINE)
+
+# 整体性检查（不属于单行规则）的标题
+AGGREGATE_RULE_TITLES = {
+    "duplicate": "导入列表内部重复",
+    "existing_duplicate": "与现有名单重复",
+    "too_many": "学生数量过多",
+}
+
+
+class ValidationIssue(NamedTuple):
+    """一条验证结果"""
+
+    rule: str  # 规则标识
+    severity: str  # "error" 或 "warning"
+    row: Optional[int]  # 行号（从0开始），整体性问题为 None
+    name: str
+    message: str
+    positions: Optional[List[int]] = None  # 重复姓名的所有出现位置
+
+
+class NameRule:
+    """逐行检查规则：check(row, name) 返回问题描述，没有问题时返回 None"""
+
+    def __init__(
+        self,
+        rule_id: str,
+        title: str,
+        severity: str,
+        check: Callable[[int, str], Optional[str]],
+    ):
+        self.rule_id = rule_id
+        self.title = title
+        self.severity = severity
+        self.check = check
+
+    def apply(self, row: int, name: str) -> Optional[ValidationIssue]:
+        message = self.check(row, name)
+        if message is None:
+            return None
+        return ValidationIssue(self.rule_id, self.severity, row, name, message)
+
+
+def default_rules(
+    max_length: int = 50, invalid_pattern: "re.Pattern" = INVALID_NAME_PATTERN
+) -> List[NameRule]:
+    """内置规则：姓名过长、为空、不含字母（三者互斥），以及包含特殊字符"""
+
+    def too_long(row: int, name: str) -> Optional[str]:
+        if len(name) > max_length:
+            return f"第 {row + 1} 行姓名过长 (长度: {len(name)}): {name[:20]}..."
+        return None
+
+    def empty(row: int, name: str) -> Optional[str]:
+        if len(name) <= max_length and len(name.strip()) == 0:
+            return f"第 {row + 1} 行姓名为空"
+        return None
+
+    def no_letter(row: int, name: str) -> Optional[str]:
+        # 检查是否包含至少一个字母（中文也是字母）
+        if (
+            len(name) <= max_length
+            and name.strip()
+            and not any(c.isalpha() for c in name)
+        ):
+            return f"第 {row + 1} 行姓名可能无效: {name}"
+        return None
+
+    def invalid_chars(row: int, name: str) -> Optional[str]:
+        if invalid_pattern.search(name):
+            return f"第 {row + 1} 行姓名包含无效字符: {name}"
+        return None
+
+    return [
+        NameRule("too_long", "姓名过长", "warning", too_long),
+        NameRule("empty", "姓名为空", "error", empty),
+        NameRule("no_letter", "姓名可能无效", "warning", no_letter),
+        NameRule("invalid_chars", "姓名包含无效字符", "error", invalid_chars),
+    ]
+
+
+class ValidationSummary:
+    """验证结果汇总：按规则计数，每条规则只保留前若干条示例"""
+
+    def __init__(self, count: int, titles: Dict[str, str], max_issues_per_rule: int):
+        self.count = count
+        self.titles = titles
+        self.max_issues_per_rule = max_issues_per_rule
+        self.error_count = 0
+        self.warning_count = 0
+        self.rule_counts: Dict[str, int] = {}
+        self.samples: Dict[str, List[ValidationIssue]] = {}
+        self.duplicates: List[str] = []
+        self.stopped_at_row: Optional[int] = None  # 错误过多提前停止时的行号
+
+    @property
+    def valid(self) -> bool:
+        return self.error_count == 0
+
+    def add(self, issue: ValidationIssue):
+        if issue.severity == "error":
+            self.error_count += 1
+        else:
+            self.warning_count += 1
+        if issue.rule == "duplicate":
+            self.duplicates.append(issue.name)
+
+        self.rule_counts[issue.rule] = self.rule_counts.get(issue.rule, 0) + 1
+        samples = self.samples.setdefault(issue.rule, [])
+        if len(samples) < self.max_issues_per_rule:
+            samples.append(issue)
+
+    def format_issues(self, severity: str, samples_per_rule: int = 5) -> str:
+        """生成指定级别问题的简短说明：每条规则一行计数加少量示例"""
+        lines = []
+        for rule, samples in self.samples.items():
+            if samples[0].severity != severity:
+                continue
+            total = self.rule_counts[rule]
+            lines.append(f"{self.titles.get(rule, rule)}（共 {total} 处）:")
+            shown = samples[:samples_per_rule]
+            lines.extend(f"  {issue.message}" for issue in shown)
+            if total > len(shown):
+                lines.append(f"  …… 另有 {total - len(shown)} 处")
+        if severity == "error" and self.stopped_at_row is not None:
+            lines.append(f"错误过多，已在第 {self.stopped_at_row + 1} 行停止检查")
+        return "\n".join(lines)
+
+
+class NameValidator:
+    """姓名验证器，规则在创建时编译，可重复用于多次验证"""
+
+    def __init__(
+        self,
+        rules: Optional[List[NameRule]] = None,
+        max_length: int = 50,
+        invalid_pattern: "re.Pattern" = INVALID_NAME_PATTERN,
+        max_recommended_count: int = DEFAULT_ROSTER_LIMIT,
+        batch_threshold: int = 2000,
+        max_issues_per_rule: int = 20,
+        max_errors: Optional[int] = 1000,
+        progress_interval: int = 10000,
+    ):
+        self.max_length = max_length
+        self.invalid_pattern = invalid_pattern
+        # 批量预筛选只对内置规则成立，自定义规则时逐行检查
+        self.prefilter = rules is None
+        self.rules = rules if rules is not None else default_rules(
+            max_length, invalid_pattern
+        )
+        self.max_recommended_count = max_recommended_count
+        # 输入数量达到该值时批量检查
+        self.batch_threshold = batch_threshold
+        # 汇总时每条规则保留的示例数，以及错误达到多少条后停止检查（None 表示不限）
+        self.max_issues_per_rule = max_issues_per_rule
+        self.max_errors = max_errors
+        # 逐行检查时每隔多少行报告一次进度
+        self.progress_interval = progress_interval
+
+    @property
+    def titles(self) -> Dict[str, str]:
+        titles = {rule.rule_id: rule.title for rule in self.rules}
+        titles.update(AGGREGATE_RULE_TITLES)
+        return titles
+
+    def iter_issues(
+        self,
+        names: Sequence[str],
+        existing_names: Optional[List[str]] = None,
+        max_recommended_count: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[ValidationIssue]:
+        """逐条产出验证结果：先按行序产出逐行问题，最后产出重复和数量等整体性问题
+
+        max_recommended_count 为导入后名单总人数的提示上限，不指定时使用验证器的设置。
+        progress(rows) 每检查 progress_interval 行调用一次，检查完所有行时再调用一次；
+        回调中抛出的异常会中止验证。
+        """
+        names = list(names)
+        if max_recommended_count is None:
+            max_recommended_count = self.max_recommended_count
+
+        use_batch = self.prefilter and len(names) >= self.batch_threshold
+        if use_batch:
+            try:
+                import numpy  # noqa: F401
+            except ImportError:
+                use_batch = False
+        if use_batch:
+            text = "\n".join(names)
+            # 姓名内部含有换行符时无法按行映射，退回逐个检查
+            use_batch = text.count("\n") == len(names) - 1
+
+        # 一次遍历：记录每个姓名的所有位置；逐个检查时同时检查每一行
+        positions: Dict[str, List[int]] = {}
+        duplicates = []
+        for i, name in enumerate(names):
+            if progress is not None and i and i % self.progress_interval == 0:
+                progress(i)
+            indices = positions.get(name)
+            if indices is None:
+                positions[name] = [i]
+            else:
+                indices.append(i)
+                if len(indices) == 2:
+                    duplicates.append(name)
+            if not use_batch:
+                yield from self._apply_rules(i, name)
+        if use_batch:
+            for i in self._scan_batch(names, text):
+                yield from self._apply_rules(i, names[i])
+        unique_names = list(positions)
+        duplicate_positions = {name: positions[name] for name in duplicates}
+        if progress is not None:
+            progress(len(names))
+
+        # 重复姓名按第二次出现的顺序产出
+        for name, indices in duplicate_positions.items():
+            rows_text = "、".join(str(i + 1) for i in indices[:5])
+            more = "…" if len(indices) > 5 else ""
+            yield ValidationIssue(
+                "duplicate",
+                "warning",
+                indices[1],
+                name,
+                f"{name} 出现 {len(indices)} 次（第 {rows_text}{more} 行）",
+                indices,
+            )
+
+        # 检查与现有名单的重复（如果提供现有名单）
+        if existing_names:
+            existing_set = set(existing_names)
+            for name in unique_names:
+                if name in existing_set:
+                    yield ValidationIssue(
+                        "existing_duplicate", "warning", None, name, f"{name} 已在名单中"
+                    )
+
+        # 检查导入后的名单总人数
+        total = len(names) + len(existing_names or [])
+        if total > max_recommended_count:
+            yield ValidationIssue(
+                "too_many",
+                "warning",
+                None,
+                "",
+                f"导入后名单共 {total} 人，超过本机可流畅处理的约 {max_recommended_count} 人，可能会影响性能",
+            )
+
+    def summarize(
+        self,
+        names: Sequence[str],
+        existing_names: Optional[List[str]] = None,
+        max_recommended_count: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> ValidationSummary:
+        """汇总验证结果；错误数达到 max_errors 时提前停止"""
+        summary = ValidationSummary(len(names), self.titles, self.max_issues_per_rule)
+        issues = self.iter_issues(
+            names, existing_names, max_recommended_count, progress
+        )
+        for issue in issues:
+            summary.add(issue)
+            if self.max_errors is not None and summary.error_count >= self.max_errors:
+                summary.stopped_at_row = issue.row
+                break
+        return summary
+
+    def validate(
+        self, names: Sequence[str], existing_names: Optional[List[str]] = None
+    ) -> dict:
+        """验证导入的数据，返回结构与 ExcelImporter.validate_data 相同（不截断）"""
+        result = {
+            "valid": True,
+            "errors": [],
+            "warnings": [],
+            "count": len(names),
+            "duplicates": [],
+            "duplicates_list": [],  # 更详细的信息
+        }
+
+        duplicate_positions = {}
+        external_duplicates = []
+        row_warnings = []
+        count_warnings = []
+        for issue in self.iter_issues(names, existing_names):
+            if issue.rule == "duplicate":
+                duplicate_positions[issue.name] = issue.positions
+            elif issue.rule == "existing_duplicate":
+                external_duplicates.append(issue.name)
+            elif issue.rule == "too_many":
+                count_warnings.append(issue.message)
+            elif issue.severity == "error":
+                result["errors"].append(issue.message)
+            else:
+                row_warnings.append(issue.message)
+
+        duplicates = list(duplicate_positions)
+        result["duplicates"] = duplicates
+        if duplicates:
+            result["warnings"].append(
+                f"导入列表内部发现 {len(duplicates)} 个重复姓名: {', '.join(duplicates[:5])}{'...' if len(duplicates) > 5 else ''}"
+            )
+
+        # 记录详细的重复信息：姓名 -> 所有出现位置
+        result["duplicates_list"] = duplicate_positions
+
+        if external_duplicates:
+            result["warnings"].append(
+                f"与现有名单重复 {len(external_duplicates)} 个姓名: {', '.join(external_duplicates[:5])}{'...' if len(external_duplicates) > 5 else ''}"
+            )
+
+        result["warnings"].extend(row_warnings)
+        result["warnings"].extend(count_warnings)
+
+        if result["errors"]:
+            result["valid"] = False
+
+        return result
+
+    def _apply_rules(self, row: int, name: str) -> Iterator[ValidationIssue]:
+        for rule in self.rules:
+            issue = rule.apply(row, name)
+            if issue is not None:
+                yield issue
+
+    def _scan_batch(self, names: List[str], text: str) -> List[int]:
+        """批量扫描：在所有姓名以换行拼成的文本上用预编译正则整体扫描一次，
+        再用NumPy把匹配位置映射回行号。
+
+        返回需要逐行检查的行号（按行序）。
+        """
+        import numpy as np
+
+        lengths = np.fromiter(map(len, names), dtype=np.int64, count=len(names))
+        line_starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+
+        def matched_rows(pattern: "re.Pattern") -> np.ndarray:
+            offsets = np.fromiter(
+                (m.start() for m in pattern.finditer(text)), dtype=np.int64
+            )
+            return np.searchsorted(line_starts, offsets, side="right") - 1
+
+        # 只有这些行可能触发内置规则：过长、不含常见字母（含空行）、含特殊字符
+        flagged = np.zeros(len(names), dtype=bool)
+        flagged |= lengths > self.max_length
+        flagged[matched_rows(NO_COMMON_LETTER_LINE)] = True
+        flagged[matched_rows(self.invalid_pattern)] = True
+
+        return np.flatnonzero(flagged).tolist()
+
+
+# 默认验证器，供 ExcelImporter.validate_data 复用
+DEFAULT_VALIDATOR = NameValidator()
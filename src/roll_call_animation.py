@@ -0,0 +1,106 @@
+"""
+点名动画模块
+
+按实际经过的时间推进动画，而不是数计时器触发了几次：QVariantAnimation 根据经过的时间
+和缓动曲线计算进度，再换算成应显示的帧。事件循环繁忙时跳过来不及显示的帧，总时长不变。
+
+动画只负责显示调用方预先生成的帧，不参与抽取；播放结束后发出 finished 信号，
+由调用方抽取并显示最终结果。时长为 0 时为即时模式，不播放动画直接结束。
+"""
+
+import time
+from typing import List
+
+from PyQt6.QtCore import (
+    QAbstractAnimation,
+    QEasingCurve,
+    QElapsedTimer,
+    QObject,
+    QVariantAnimation,
+    pyqtSignal,
+)
+
+from frame_timer import FrameTimer
+
+DEFAULT_DURATION_MS = 3000
+# 缓动曲线名称与 QEasingCurve.Type 一致，如 "Linear"、"OutCubic"、"OutQuart"
+DEFAULT_EASING = "Linear"
+
+
+def easing_curve(name: str) -> QEasingCurve:
+    """按名称返回缓动曲线，未知名称使用线性"""
+    curve_type = getattr(QEasingCurve.Type, name, None)
+    if not isinstance(curve_type, QEasingCurve.Type):
+        print(f"未知的动画缓动曲线: {name}，改用 {DEFAULT_EASING}")
+        curve_type = getattr(QEasingCurve.Type, DEFAULT_EASING)
+    return QEasingCurve(curve_type)
+
+
+class RollCallAnimation(QObject):
+    """按时间和缓动曲线依次显示预先生成的帧"""
+
+    frameChanged = pyqtSignal(str)  # 需要显示新的一帧
+    finished = pyqtSignal()  # 动画播放完毕（中途调用 stop 时不发出）
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self.duration_ms = DEFAULT_DURATION_MS
+        self.elapsed_ms = 0  # 上一次动画实际持续的时间
+        self.frame_timer = FrameTimer()
+        self._frames: List[str] = []
+        self._index = -1
+        self._elapsed = QElapsedTimer()
+        # 动画的值就是播放进度（0 到 1，已经过缓动曲线换算）
+        self._animation = QVariantAnimation(self)
+        self._animation.setStartValue(0.0)
+        self._animation.setEndValue(1.0)
+        self._animation.valueChanged.connect(self._on_progress)
+        self._animation.finished.connect(self._on_finished)
+        self.set_easing(DEFAULT_EASING)
+
+    def set_easing(self, name: str):
+        """设置缓动曲线，例如 "OutCubic" 表示越接近结束切换越慢"""
+        self._animation.setEasingCurve(easing_curve(name))
+
+    def is_running(self) -> bool:
+        return self._animation.state() == QAbstractAnimation.State.Running
+
+    def start(self, frames: List[str]):
+        """开始播放；时长为 0 或没有帧时立即发出 finished"""
+        self.stop()
+        self._frames = list(frames)
+        self._index = -1
+        self.frame_timer.start()
+        self._elapsed.start()
+        if self.duration_ms <= 0 or not self._frames:
+            self.elapsed_ms = 0
+            self.finished.emit()
+            return
+        self._animation.setDuration(self.duration_ms)
+        self._animation.start()
+
+    def stop(self):
+        """中途停止，不发出 finished 信号"""
+        if self.is_running():
+            self._animation.stop()
+            self.elapsed_ms = self._elapsed.elapsed()
+
+    def _on_progress(self, progress: float):
+        frame_start = time.perf_counter()
+        index = min(int(progress * len(self._frames)), len(self._frames) - 1)
+        if index == self._index:
+            return
+        self._index = index
+        self.frameChanged.emit(self._frames[index])
+        self.frame_timer.frame(frame_start)
+
+    def _on_finished(self):
+        self.elapsed_ms = self._elapsed.elapsed()
+        self.finished.emit()
+
+    def report(self) -> str:
+        """上一次动画的时长和帧耗时汇总"""
+        return (
+            f"时长 {self.elapsed_ms}ms（设定 {self.duration_ms}ms），"
+            f"{self.frame_timer.report()}"
+        )
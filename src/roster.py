@@ -0,0 +1,123 @@
+"""
+花名册模块
+
+每个学生有一个稳定的整数 ID，重名的学生也能区分；姓名去重后只保存一份。
+班级成员和点名记录只保存学生 ID（array('I')，每人 4 字节），需要显示时再换成姓名。
+"""
+
+import secrets
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 班级成员、学生表使用的数组类型：无符号 32 位整数
+ID_TYPECODE = "I"
+# 开始保存 generation 之前写入的花名册的编号；这些花名册（及其备份）的学生 ID 前后一致
+LEGACY_GENERATION = "legacy"
+
+
+def id_array(ids: Iterable[int] = ()) -> array:
+    """创建学生 ID 数组"""
+    return array(ID_TYPECODE, ids)
+
+
+class Roster:
+    """花名册：学生 ID -> 姓名编号 -> 姓名
+
+    学生 ID 只增不减：学生从班级移除后 ID 仍然保留，历史记录始终能查到姓名。
+    花名册文件损坏、丢失后重建时学生 ID 重新从 0 开始，generation 随之换新：
+    点名记录保存抽取时的 generation，不一致时记录中的学生 ID 不再可靠。
+    """
+
+    def __init__(
+        self,
+        names: List[str] = None,
+        student_names: Iterable[int] = (),
+        generation: Optional[str] = None,
+    ):
+        self.names: List[str] = list(names or [])  # 姓名表，按编号排列
+        self._name_ids: Dict[str, int] = {
+            name: name_id for name_id, name in enumerate(self.names)
+        }
+        self.student_names = id_array(student_names)  # 学生 ID -> 姓名编号
+        self.generation = generation or secrets.token_hex(8)
+
+    def __len__(self) -> int:
+        return len(self.student_names)
+
+    def intern(self, name: str) -> int:
+        """返回姓名的编号，新姓名加入姓名表"""
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def add_students(self, names: Iterable[str]) -> array:
+        """为每个姓名登记一个新学生，返回新学生的 ID 数组"""
+        first = len(self.student_names)
+        self.student_names.extend(self.intern(name) for name in names)
+        return id_array(range(first, len(self.student_names)))
+
+    def match_students(self, names: Iterable[str], student_ids: Iterable[int]) -> array:
+        """按姓名复用 student_ids 中的学生，返回与 names 一一对应的 ID 数组
+
+        重名的学生按原来的先后顺序依次对应；student_ids 中没有（或已用完）的姓名登记为新学生。
+        """
+        available: Dict[int, List[int]] = {}
+        for student_id in reversed(student_ids):
+            available.setdefault(self.student_names[student_id], []).append(student_id)
+        matched = id_array()
+        for name in names:
+            same_name = available.get(self._name_ids.get(name))
+            if same_name:
+                matched.append(same_name.pop())
+            else:
+                matched.append(len(self.student_names))
+                self.student_names.append(self.intern(name))
+        return matched
+
+    def knows(self, student_ids: Iterable[int]) -> bool:
+        """student_ids 是否都是本花名册中的学生"""
+        count = len(self.student_names)
+        return all(0 <= student_id < count for student_id in student_ids)
+
+    def name(self, student_id: int) -> str:
+        """返回学生的姓名"""
+        return self.names[self.student_names[student_id]]
+
+    def names_of(self, student_ids: Iterable[int]) -> List[str]:
+        """把学生 ID 序列换成姓名列表"""
+        names = self.names
+        student_names = self.student_names
+        return [names[student_names[student_id]] for student_id in student_ids]
+
+    def to_dict(self) -> Dict:
+        """转换为可写入 JSON 的字典"""
+        # 后台保存时界面线程可能正在登记学生：登记时先追加姓名再追加学生，
+        # 所以先复制学生再复制姓名，保证快照中学生引用的姓名都在姓名表中
+        students = self.student_names.tolist()
+        names = list(self.names)
+        return {
+            "generation": self.generation,
+            "names": names,
+            "students": students,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Roster":
+        return cls(
+            data.get("names", []),
+            data.get("students", []),
+            data.get("generation", LEGACY_GENERATION),
+        )
+
+    @classmethod
+    def from_classes(
+        cls, classes: Dict[str, List[str]]
+    ) -> Tuple["Roster", Dict[str, array]]:
+        """从旧格式（班级 -> 姓名列表）建立花名册，每个名单条目成为一个学生"""
+        roster = cls()
+        return roster, {
+            class_name: roster.add_students(names)
+            for class_name, names in classes.items()
+        }
@@ -0,0 +1,58 @@
+"""
+名单性能监测模块
+
+记录名单相关操作（列表刷新、保存等）在实际名单规模下的耗时，
+据此估算本机能保持界面流畅的最大名单人数，用于导入时的人数提示。
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+# 尚无测量数据时使用的人数上限（benchmarks/bench_large_roster.py 在普通笔记本上
+# 10万人时每次修改的列表刷新和保存均在 100ms 以内）
+DEFAULT_ROSTER_LIMIT = 100_000
+
+
+class RosterPerformance:
+    """按操作记录每个姓名的平均耗时，估算保持流畅的最大名单人数"""
+
+    # 每次修改名单后界面可接受的单项操作耗时（毫秒）
+    INTERACTIVE_BUDGET_MS = 100.0
+    # 名单太小时固定开销占主导，不参与估算
+    MIN_SAMPLE_SIZE = 5000
+    # 指数滑动平均的权重
+    SMOOTHING = 0.3
+
+    def __init__(self):
+        self.per_name_ms: Dict[str, float] = {}  # 操作 -> 每个姓名的平均耗时(ms)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, operation: str, size: int):
+        """测量一次操作的耗时，size 为该操作处理的姓名数量"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if size >= self.MIN_SAMPLE_SIZE:
+                self.record(operation, size, (time.perf_counter() - start) * 1000)
+
+    def record(self, operation: str, size: int, elapsed_ms: float):
+        cost = elapsed_ms / size
+        with self._lock:
+            previous = self.per_name_ms.get(operation)
+            if previous is not None:
+                cost = previous + self.SMOOTHING * (cost - previous)
+            self.per_name_ms[operation] = cost
+
+    def recommended_limit(self) -> int:
+        """最慢的操作恰好用完耗时预算时的名单人数"""
+        with self._lock:
+            if not self.per_name_ms:
+                return DEFAULT_ROSTER_LIMIT
+            slowest = max(self.per_name_ms.values())
+        if slowest <= 0:
+            return DEFAULT_ROSTER_LIMIT
+        return int(self.INTERACTIVE_BUDGET_MS / slowest)
@@ -0,0 +1,636 @@
+"""
+点名抽取引擎
+
+每种抽取方式是一个策略类，按班级各自保存状态，状态可以写入 JSON 跨会话保留：
+- random：每次独立随机抽取（原来的行为）
+- deck：洗牌后依次抽取，一轮内每人只被点到一次，全班点完后重新洗牌
+- weighted：最近被点到的学生被抽中的概率降低，隔得越久越接近正常
+- balanced：按累计被点到的次数加权，点得少的学生更容易被抽中
+- balanced_static：同样按次数加权，但权重在本次运行第一次使用时固定，抽取后不更新
+
+每次抽取只处理被抽中的学生，不扫描历史记录；名单变化后的第一次抽取才整体核对一次名单。
+
+每个班级有自己的随机种子，第 n 次抽取使用由（种子, n）确定的随机数生成器，
+种子、序号和名单摘要随点名记录一起保存，之后可以用 replay_draws 逐条复现核对。
+某个名单（按摘要区分）第一次用于抽取时，完整的学生 ID 列表也随这条记录保存一次，
+复现时从记录中还原当时的名单，班级名单之后再改动也不影响核对。
+
+有状态的抽取方式还记录状态检查点（轮次编号, 步数）：策略从全新状态开始时分配新的轮次编号，
+每抽取一次步数加一。复现时只有本地复现的状态正好处在记录的检查点上才核对结果，
+清空历史记录、抽取状态未及时保存等情况下起始状态未知的记录标为无法复现，而不是不一致。
+"""
+
+import hashlib
+import math
+import random
+import secrets
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from weighted_sampler import AliasSampler, FenwickSampler
+
+# 抽取方式 -> 界面上显示的名称
+SELECTION_MODES = {
+    "random": "完全随机",
+    "deck": "轮流点名（每轮每人一次）",
+    "weighted": "减少近期重复",
+    "balanced": "优先点名次数少的",
+    "balanced_static": "优先点名次数少的（本次打开时固定）",
+}
+DEFAULT_SELECTION_MODE = "random"
+
+# 复现核对的结果
+REPLAY_MATCH = "match"  # 复现结果与记录一致
+REPLAY_MISMATCH = "mismatch"  # 复现结果与记录不一致
+REPLAY_UNVERIFIABLE = "unverifiable"  # 没有抽取信息，或当时的名单已无法还原
+
+
+def draw_rng(seed: int, number: int) -> random.Random:
+    """班级种子为 seed 时第 number 次抽取使用的随机数生成器"""
+    return random.Random((seed << 32) | number)
+
+
+def new_seed() -> int:
+    """生成新的班级种子（64 位）"""
+    return secrets.randbits(64)
+
+
+def new_epoch() -> str:
+    """生成新的状态轮次编号"""
+    return secrets.token_hex(8)
+
+
+def pool_digest(student_ids: Sequence[int]) -> str:
+    """名单摘要：用于核对复现时使用的名单与抽取时一致"""
+    if not isinstance(student_ids, array):
+        student_ids = array("I", student_ids)
+    return hashlib.sha256(student_ids.tobytes()).hexdigest()[:16]
+
+
+class SelectionStrategy:
+    """抽取策略基类，一个实例对应一个班级
+
+    策略本身不保存随机数生成器，每次抽取由引擎传入，保证结果只取决于种子和抽取序号。
+    """
+
+    stateful = True  # 抽取结果是否依赖之前的抽取
+
+    def __init__(self):
+        self.stale = True  # 名单变化后需要在下次抽取前调用 sync
+        # 状态检查点：从全新状态开始时由引擎分配轮次编号，之后每次抽取步数加一；
+        # 旧版本保存的状态没有检查点（epoch 为 None），起始状态无从核对
+        self.epoch: Optional[str] = None
+        self.step = 0
+
+    def sync(self, rng: random.Random, student_ids: Sequence[int]):
+        """名单增删后调整内部状态"""
+
+    def select(
+        self, rng: random.Random, student_ids: Sequence[int], count: int, unique: bool
+    ) -> List[int]:
+        """从 student_ids 中抽取 count 名学生；unique 为 True 时同一次抽取不重复"""
+        raise NotImplementedError
+
+    def to_dict(self) -> Optional[Dict]:
+        """需要保存的状态，无状态的策略返回 None"""
+        return None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SelectionStrategy":
+        return cls()
+
+    @classmethod
+    def create(
+        cls, call_counts: Optional[Callable[[], Dict[int, int]]]
+    ) -> "SelectionStrategy":
+        """班级第一次使用该抽取方式时创建策略；call_counts 返回历史记录中每人被点到的次数"""
+        return cls()
+
+
+class RandomStrategy(SelectionStrategy):
+    """每次独立随机抽取"""
+
+    stateful = False
+
+    def select(
+        self, rng: random.Random, student_ids: Sequence[int], count: int, unique: bool
+    ) -> List[int]:
+        if unique:
+            return rng.sample(student_ids, count)
+        return rng.choices(student_ids, k=count)
+
+
+class DeckStrategy(SelectionStrategy):
+    """洗牌抽取：本轮未被抽到的学生组成一副牌，每次从牌顶取，取完重新洗牌"""
+
+    def __init__(self, remaining=(), drawn=()):
+        super().__init__()
+        self.remaining: List[int] = list(remaining)  # 本轮尚未抽到的学生，从末尾取
+        self.drawn = set(drawn)  # 本轮已经抽到的学生
+
+    def sync(self, rng: random.Random, student_ids: Sequence[int]):
+        members = set(student_ids)
+        self.remaining = [sid for sid in self.remaining if sid in members]
+        self.drawn &= members
+        known = self.drawn.union(self.remaining)
+        # 新加入的学生随机插入本轮尚未抽取的牌中
+        for sid in student_ids:
+            if sid not in known:
+                self.remaining.append(sid)
+                position = rng.randrange(len(self.remaining))
+                self.remaining[-1], self.remaining[position] = (
+                    self.remaining[position],
+                    sid,
+                )
+
+    def select(
+        self, rng: random.Random, student_ids: Sequence[int], count: int, unique: bool
+    ) -> List[int]:
+        picked = []
+        while len(picked) < count:
+            if not self.remaining:
+                # 一轮结束，重新洗牌；防重复时本次已抽到的学生留到下一轮
+                self._reshuffle(rng, student_ids, set(picked) if unique else ())
+                if not self.remaining:
+                    break
+            sid = self.remaining.pop()
+            self.drawn.add(sid)
+            picked.append(sid)
+        return picked
+
+    def _reshuffle(self, rng: random.Random, student_ids: Sequence[int], exclude):
+        self.remaining = [sid for sid in student_ids if sid not in exclude]
+        rng.shuffle(self.remaining)
+        self.drawn = set(exclude)
+
+    def to_dict(self) -> Dict:
+        return {"remaining": list(self.remaining), "drawn": list(self.drawn)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DeckStrategy":
+        return cls(data.get("remaining", []), data.get("drawn", []))
+
+
+class RecencyWeightedStrategy(SelectionStrategy):
+    """按最近被点到的时间降低权重
+
+    权重 = 1 - exp(-RECOVERY * 间隔人次 / 班级人数)：刚被点到时接近 0，
+    经过一整轮（全班人数次抽取）后恢复到约 63%，三轮后约 95%。从未被点到的学生权重为 1。
+    抽取时随机挑一名学生并按其权重决定是否接受（拒绝采样），期望尝试次数为平均权重的倒数。
+    """
+
+    RECOVERY = 1.0
+    # 单个名额的最大尝试次数，超过后在未抽中的学生中均匀抽取
+    MAX_ATTEMPTS = 64
+
+    def __init__(self, picks: int = 0, last_picked=None):
+        super().__init__()
+        self.picks = picks  # 累计抽取人次
+        self.last_picked: Dict[int, int] = dict(last_picked or {})  # 学生 -> 上次被抽中时的人次
+
+    def weight(self, student_id: int, class_size: int) -> float:
+        last = self.last_picked.get(student_id)
+        if last is None:
+            return 1.0
+        return 1.0 - math.exp(-self.RECOVERY * (self.picks - last) / class_size)
+
+    def sync(self, rng: random.Random, student_ids: Sequence[int]):
+        members = set(student_ids)
+        self.last_picked = {
+            sid: last for sid, last in self.last_picked.items() if sid in members
+        }
+
+    def select(
+        self, rng: random.Random, student_ids: Sequence[int], count: int, unique: bool
+    ) -> List[int]:
+        class_size = len(student_ids)
+        picked = []
+        chosen = set()
+        for _ in range(count):
+            for _ in range(self.MAX_ATTEMPTS):
+                sid = student_ids[rng.randrange(class_size)]
+                if unique and sid in chosen:
+                    continue
+                if rng.random() < self.weight(sid, class_size):
+                    break
+            else:
+                candidates = [s for s in student_ids if not (unique and s in chosen)]
+                sid = rng.choice(candidates)
+            picked.append(sid)
+            chosen.add(sid)
+            self.picks += 1
+            self.last_picked[sid] = self.picks
+        return picked
+
+    def to_dict(self) -> Dict:
+        last_picked = list(self.last_picked.items())
+        return {
+            "picks": self.picks,
+            "ids": [sid for sid, _ in last_picked],
+            "last": [last for _, last in last_picked],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RecencyWeightedStrategy":
+        return cls(data.get("picks", 0), zip(data.get("ids", []), data.get("last", [])))
+
+
+class BalancedStrategy(SelectionStrategy):
+    """按累计被点到的次数加权：权重 = 1 / (1 + 次数)^BIAS
+
+    权重保存在树状数组中，每抽中一人只更新他的权重，抽取和更新都是 O(log n)；
+    只有名单变化后才重建一次（O(n)）。
+    """
+
+    BIAS = 2
+
+    def __init__(self, counts=None):
+        super().__init__()
+        self.counts: Dict[int, int] = dict(counts or {})  # 学生 -> 被点到的次数
+        self._sampler: Optional[FenwickSampler] = None
+        self._student_ids: Sequence[int] = ()
+
+    def weight(self, student_id: int) -> float:
+        return 1.0 / (1 + self.counts.get(student_id, 0)) ** self.BIAS
+
+    def sync(self, rng: random.Random, student_ids: Sequence[int]):
+        members = set(student_ids)
+        self.counts = {sid: count for sid, count in self.counts.items() if sid in members}
+        self._student_ids = student_ids
+        self._sampler = FenwickSampler([self.weight(sid) for sid in student_ids])
+
+    def select(
+        self, rng: random.Random, student_ids: Sequence[int], count: int, unique: bool
+    ) -> List[int]:
+        if (
+            self._sampler is None
+            or student_ids is not self._student_ids
+            or len(student_ids) != len(self._sampler)
+        ):
+            self.sync(rng, student_ids)
+        self._sampler.rng = rng
+        picked = []
+        for position in self._sampler.samples(count, unique):
+            sid = student_ids[position]
+            self.counts[sid] = self.counts.get(sid, 0) + 1
+            self._sampler.update(position, self.weight(sid))
+            picked.append(sid)
+        return picked
+
+    def to_dict(self) -> Dict:
+        counts = list(self.counts.items())
+        return {
+            "ids": [sid for sid, _ in counts],
+            "counts": [count for _, count in counts],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BalancedStrategy":
+        return cls(zip(data.get("ids", []), data.get("counts", [])))
+
+    @classmethod
+    def create(
+        cls, call_counts: Optional[Callable[[], Dict[int, int]]]
+    ) -> "BalancedStrategy":
+        # 从历史记录中的点名次数开始计数，多余的学生在 sync 时去掉
+        return cls(call_counts() if call_counts else None)
+
+
+class StaticBalancedStrategy(SelectionStrategy):
+    """按本次运行第一次使用时的累计点名次数加权，之后权重不变
+
+    权重与 balanced 相同，但抽取后不更新：用别名表建表一次（O(n)），之后每次抽取 O(1)；
+    只有名单变化后才重建。状态不写入文件，下次启动时按届时的点名次数重新计算。
+    """
+
+    BIAS = BalancedStrategy.BIAS
+    # 同一次抽取不重复时，单个名额的最大尝试次数，超过后在未抽中的学生中按权重抽取
+    MAX_ATTEMPTS = 64
+
+    def __init__(self, counts=None):
+        super().__init__()
+        self.counts: Dict[int, int] = dict(counts or {})  # 学生 -> 创建时被点到的次数
+        self._sampler: Optional[AliasSampler] = None
+        self._student_ids: Sequence[int] = ()
+
+    def weight(self, student_id: int) -> float:
+        return 1.0 / (1 + self.counts.get(student_id, 0)) ** self.BIAS
+
+    def sync(self, rng: random.Random, student_ids: Sequence[int]):
+        self._student_ids = student_ids
+        self._sampler = AliasSampler([self.weight(sid) for sid in student_ids], rng)
+
+    def select(
+        self, rng: random.Random, student_ids: Sequence[int], count: int, unique: bool
+    ) -> List[int]:
+        if (
+            self._sampler is None
+            or student_ids is not self._student_ids
+            or len(student_ids) != len(self._sampler)
+        ):
+            self.sync(rng, student_ids)
+        self._sampler.rng = rng
+        picked = []
+        chosen = set()
+        for _ in range(count):
+            for _ in range(self.MAX_ATTEMPTS):
+                position = self._sampler.sample()
+                if not (unique and position in chosen):
+                    break
+            else:
+                candidates = [i for i in range(len(student_ids)) if i not in chosen]
+                position = rng.choices(
+                    candidates, [self.weight(student_ids[i]) for i in candidates]
+                )[0]
+            chosen.add(position)
+            picked.append(student_ids[position])
+        return picked
+
+    @classmethod
+    def create(
+        cls, call_counts: Optional[Callable[[], Dict[int, int]]]
+    ) -> "StaticBalancedStrategy":
+        return cls(call_counts() if call_counts else None)
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "deck": DeckStrategy,
+    "weighted": RecencyWeightedStrategy,
+    "balanced": BalancedStrategy,
+    "balanced_static": StaticBalancedStrategy,
+}
+
+
+class SelectionEngine:
+    """按班级和抽取方式管理抽取策略、随机种子及其状态"""
+
+    def __init__(
+        self,
+        state: Optional[Dict] = None,
+        call_counts: Optional[Callable[[], Dict[int, int]]] = None,
+    ):
+        state = state or {}
+        self.call_counts = call_counts  # 返回历史记录中每人被点到的次数
+        # 班级 -> 抽取方式 -> 策略
+        self._strategies: Dict[str, Dict[str, SelectionStrategy]] = {}
+        for class_name, modes in state.get("classes", {}).items():
+            for mode, data in modes.items():
+                if mode in STRATEGIES:
+                    strategy = STRATEGIES[mode].from_dict(data)
+                    strategy.epoch = data.get("epoch")
+                    strategy.step = data.get("step", 0)
+                    self._strategies.setdefault(class_name, {})[mode] = strategy
+        self.seeds: Dict[str, int] = dict(state.get("seeds", {}))  # 班级 -> 随机种子
+        self.draw_counts: Dict[str, int] = dict(state.get("draws", {}))  # 班级 -> 已抽取次数
+        self._pool_digests: Dict[str, str] = {}  # 班级 -> 名单摘要缓存
+        # 完整名单已随点名记录保存过的名单摘要
+        self.recorded_pools = set(state.get("pools", []))
+
+    def strategy(self, class_name: str, mode: str) -> SelectionStrategy:
+        """返回班级在某种抽取方式下的策略，不存在时创建"""
+        if mode not in STRATEGIES:
+            mode = DEFAULT_SELECTION_MODE
+        modes = self._strategies.setdefault(class_name, {})
+        if mode not in modes:
+            strategy = STRATEGIES[mode].create(self.call_counts)
+            strategy.epoch = new_epoch()
+            modes[mode] = strategy
+        return modes[mode]
+
+    def reset_strategy(self, class_name: str, mode: str):
+        """丢弃班级在某种方式下的状态，下次抽取时从全新状态开始"""
+        self._strategies.get(class_name, {}).pop(mode, None)
+
+    def reset_strategies(self):
+        """清空历史记录后调用：丢弃所有班级的抽取状态和已保存名单的记录，种子和抽取序号保留"""
+        self._strategies.clear()
+        self.recorded_pools.clear()
+
+    def seed(self, class_name: str) -> int:
+        """班级的随机种子，没有时生成一个"""
+        if class_name not in self.seeds:
+            self.set_seed(class_name, new_seed())
+        return self.seeds[class_name]
+
+    def set_seed(self, class_name: str, seed: int):
+        """指定班级的随机种子，抽取序号从 0 重新开始"""
+        self.seeds[class_name] = seed
+        self.draw_counts[class_name] = 0
+
+    def draw(
+        self,
+        class_name: str,
+        mode: str,
+        student_ids: Sequence[int],
+        count: int,
+        unique: bool,
+    ) -> Tuple[List[int], Dict]:
+        """按指定方式从班级中抽取学生 ID
+
+        Returns:
+            (抽中的学生 ID, 抽取信息)；抽取信息应随点名记录一起保存，供 replay_draws 复现
+        """
+        if mode not in STRATEGIES:
+            mode = DEFAULT_SELECTION_MODE
+        seed = self.seed(class_name)
+        number = self.draw_counts.get(class_name, 0)
+        self.draw_counts[class_name] = number + 1
+        digest = self._pool_digests.get(class_name)
+        if digest is None:
+            digest = self._pool_digests[class_name] = pool_digest(student_ids)
+        info = {
+            "class": class_name,
+            "mode": mode,
+            "seed": seed,
+            "number": number,
+            "count": count,
+            "unique": unique,
+            "pool": digest,
+        }
+        if digest not in self.recorded_pools:
+            # 名单第一次用于抽取：保存完整名单，复现时不依赖当前的班级名单
+            info["members"] = list(student_ids)
+            self.recorded_pools.add(digest)
+        strategy = self.strategy(class_name, mode)
+        if strategy.stateful and strategy.epoch is not None:
+            info["state"] = [strategy.epoch, strategy.step]
+        rng = draw_rng(seed, number)
+        picked = self._select(class_name, mode, student_ids, count, unique, rng)
+        strategy.step += 1
+        return picked, info
+
+    def select(
+        self,
+        class_name: str,
+        mode: str,
+        student_ids: Sequence[int],
+        count: int,
+        unique: bool,
+    ) -> List[int]:
+        """按指定方式从班级中抽取学生 ID（不需要抽取信息时使用）"""
+        return self.draw(class_name, mode, student_ids, count, unique)[0]
+
+    def _select(
+        self,
+        class_name: str,
+        mode: str,
+        student_ids: Sequence[int],
+        count: int,
+        unique: bool,
+        rng: random.Random,
+    ) -> List[int]:
+        strategy = self.strategy(class_name, mode)
+        if strategy.stale:
+            strategy.sync(rng, student_ids)
+            strategy.stale = False
+        return strategy.select(rng, student_ids, count, unique)
+
+    def resume(self, records: Iterable[Dict]):
+        """根据已保存的点名记录校正抽取序号和抽取状态
+
+        抽取状态延迟写入，程序异常退出时可能落后于已经写入的点名记录：
+        - 序号取两者中较大者，避免同一个（种子, 序号）被用于两次抽取
+        - 记录中已有从保存的状态之后的抽取时，保存的状态已经过时，丢弃后从全新状态开始，
+          之后的抽取仍可复现核对
+        """
+        for record in records:
+            info = record.get("draw")
+            if not info:
+                continue
+            class_name = info["class"]
+            if "members" in info:
+                self.recorded_pools.add(info["pool"])
+            checkpoint = info.get("state")
+            if checkpoint is not None:
+                strategy = self._strategies.get(class_name, {}).get(info["mode"])
+                if (
+                    strategy is not None
+                    and strategy.epoch == checkpoint[0]
+                    and checkpoint[1] >= strategy.step
+                ):
+                    self.reset_strategy(class_name, info["mode"])
+            if self.seeds.get(class_name) != info["seed"]:
+                continue
+            if info["number"] >= self.draw_counts.get(class_name, 0):
+                self.draw_counts[class_name] = info["number"] + 1
+
+    def students_changed(self, class_name: str):
+        """班级名单有增删，下次抽取前重新核对"""
+        self._pool_digests.pop(class_name, None)
+        for strategy in self._strategies.get(class_name, {}).values():
+            strategy.stale = True
+
+    def _class_tables(self) -> Tuple[Dict, ...]:
+        return (self._strategies, self.seeds, self.draw_counts, self._pool_digests)
+
+    def rename_class(self, old_name: str, new_name: str):
+        for table in self._class_tables():
+            if old_name in table:
+                table[new_name] = table.pop(old_name)
+
+    def remove_class(self, class_name: str):
+        for table in self._class_tables():
+            table.pop(class_name, None)
+
+    def to_dict(self) -> Dict:
+        """可写入 JSON 的状态，只包含有状态的策略"""
+        classes = {}
+        for class_name, modes in list(self._strategies.items()):
+            saved = {}
+            for mode, strategy in list(modes.items()):
+                data = strategy.to_dict()
+                if data is not None:
+                    if strategy.epoch is not None:
+                        data["epoch"] = strategy.epoch
+                        data["step"] = strategy.step
+                    saved[mode] = data
+            if saved:
+                classes[class_name] = saved
+        return {
+            "classes": classes,
+            "seeds": dict(self.seeds),
+            "draws": dict(self.draw_counts),
+            "pools": sorted(self.recorded_pools),
+        }
+
+
+def replay_draws(
+    records: Iterable[Dict], class_members: Dict[str, Sequence[int]]
+) -> List[str]:
+    """按时间顺序复现点名记录，逐条核对抽取结果
+
+    每条记录用其中保存的种子和序号，在抽取时的名单上重新抽取，与记录中的学生 ID 比较。
+    抽取时的名单从之前（含本条）记录中保存的完整名单还原，旧记录没有保存名单时使用当前班级名单。
+    轮流点名等有状态的抽取方式从检查点步数为 0 的记录（全新状态）开始依次复现；
+    复现的状态与记录的检查点不一致（历史记录被清空过、抽取状态未及时保存、
+    中间有记录无法复现）时，起始状态未知，记为无法复现，直到下一次从全新状态开始。
+    没有检查点的旧记录假定从该方式第一次出现时连续复现，结果不一致时也只记为无法复现。
+
+    Args:
+        records: 点名记录，按时间从早到晚排列
+        class_members: 当前的班级 -> 学生 ID 序列，用于复现没有保存名单、摘要与当前名单一致的记录
+
+    Returns:
+        与 records 一一对应的核对结果（REPLAY_MATCH / REPLAY_MISMATCH / REPLAY_UNVERIFIABLE）
+    """
+    called = Counter()  # 复现到当前记录之前，每人被点到的次数
+    engine = SelectionEngine(call_counts=lambda: Counter(called))
+    # 名单摘要 -> 学生 ID 序列：当前班级名单，以及记录中保存的名单
+    members_by_digest: Dict[str, Sequence[int]] = {
+        pool_digest(student_ids): student_ids
+        for student_ids in class_members.values()
+    }
+    pools: Dict[str, str] = {}  # 班级 -> 上一条记录的名单摘要
+    positions: Dict[Tuple[str, str], Tuple[str, int]] = {}  # 复现状态所处的检查点
+    broken = set()  # 状态未知、无法继续核对的（班级, 抽取方式）
+    results = []
+    for record in records:
+        info = record.get("draw")
+        status = REPLAY_UNVERIFIABLE
+        if info:
+            class_name, mode = info["class"], info["mode"]
+            key = (class_name, mode)
+            if "members" in info and info["pool"] not in members_by_digest:
+                saved = array("I", info["members"])
+                if pool_digest(saved) == info["pool"]:
+                    members_by_digest[info["pool"]] = saved
+            members = members_by_digest.get(info["pool"])
+            stateful = STRATEGIES.get(mode, RandomStrategy).stateful
+            checkpoint = info.get("state")
+            if pools.get(class_name) != info["pool"]:
+                pools[class_name] = info["pool"]
+                engine.students_changed(class_name)
+            if stateful and checkpoint is not None:
+                if checkpoint[1] == 0:
+                    # 抽取时是全新状态，复现也从全新状态开始
+                    engine.reset_strategy(class_name, mode)
+                    broken.discard(key)
+                elif positions.get(key) != tuple(checkpoint):
+                    broken.add(key)
+
+            if members is None or (stateful and key in broken):
+                if stateful:
+                    broken.add(key)
+            else:
+                picked = engine._select(
+                    class_name,
+                    mode,
+                    members,
+                    info["count"],
+                    info["unique"],
+                    draw_rng(info["seed"], info["number"]),
+                )
+                if picked == list(record.get("ids", ())):
+                    status = REPLAY_MATCH
+                elif stateful and checkpoint is None:
+                    # 旧记录的起始状态只是假定的，不一致不能说明记录被改过
+                    broken.add(key)
+                else:
+                    status = REPLAY_MISMATCH
+                if checkpoint is not None:
+                    positions[key] = (checkpoint[0], checkpoint[1] + 1)
+        results.append(status)
+        called.update(record.get("ids", ()))
+    return results
@@ -0,0 +1,140 @@
+"""
+学生名单列表模型
+
+配合 QListView 显示学生名单，添加和删除只发出对应行的插入/删除信号，
+不会为每个学生重建列表项；同时维护姓名前缀索引供搜索框使用。
+名单以学生 ID 数组为准（与 DataStorage.classes 中的是同一个对象），姓名列表随之更新。
+
+模型基于 QStringListModel（C++ 实现的 QAbstractListModel）：QListView 布局时
+会对每一行调用 rowCount/index，若在 Python 中实现，10万人时仅布局就要数百毫秒。
+"""
+
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Dict, Iterable, List, Optional
+
+from PyQt6.QtCore import QStringListModel
+
+from name_index import NameIndex
+from roster import Roster, id_array
+
+# 把 0/1 标记字节取反的转换表
+_INVERT_FLAGS = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+class StudentListModel(QStringListModel):
+    """学生名单模型，持有当前班级的学生 ID 数组和对应的姓名列表"""
+
+    # 一次追加超过该数量时直接整体刷新，逐行写入反而更慢
+    BULK_APPEND_THRESHOLD = 1000
+    # 删除的行分散成超过该数量的区间时，一次过滤整个名单后整体刷新
+    BULK_REMOVE_RANGES = 32
+
+    def __init__(
+        self, roster: Roster, student_ids: Optional[array] = None, parent=None
+    ):
+        super().__init__(parent)
+        self._roster = roster
+        self._student_ids = student_ids if student_ids is not None else id_array()
+        self._students: List[str] = roster.names_of(self._student_ids)
+        self._name_index: Optional[NameIndex] = None  # 首次搜索时才建立
+        # 姓名 -> 所在的行（升序），首次搜索时建立；删除行后行号改变，下次搜索时重建
+        self._name_rows: Optional[Dict[str, List[int]]] = None
+        self.setStringList(self._students)
+
+    @property
+    def students(self) -> List[str]:
+        """当前名单的姓名列表（只读，修改请使用本类的方法）"""
+        return self._students
+
+    @property
+    def student_ids(self) -> array:
+        """当前名单的学生 ID 数组"""
+        return self._student_ids
+
+    def set_student_ids(self, student_ids: array):
+        """整体替换名单（切换班级、清空等）"""
+        self._student_ids = student_ids
+        self._students = self._roster.names_of(student_ids)
+        self._name_index = None
+        self._name_rows = None
+        self.setStringList(self._students)
+
+    def append_student_ids(self, student_ids: Iterable[int]):
+        """在末尾追加学生，只通知新增的行"""
+        student_ids = id_array(student_ids)
+        if not student_ids:
+            return
+        names = self._roster.names_of(student_ids)
+        first = len(self._students)
+        self._student_ids.extend(student_ids)
+        self._students.extend(names)
+        if self._name_index is not None:
+            self._name_index.add(names)
+        if self._name_rows is not None:
+            for row, name in enumerate(names, first):
+                self._name_rows.setdefault(name, []).append(row)
+        if len(names) > self.BULK_APPEND_THRESHOLD:
+            self.setStringList(self._students)
+            return
+        self.insertRows(first, len(names))
+        for offset, name in enumerate(names):
+            self.setData(self.index(first + offset), name)
+
+    def remove_rows(self, rows: Iterable[int]):
+        """删除指定行，连续的行合并为一次删除通知；行号可以重复或无序"""
+        ranges = self._contiguous_ranges(rows)
+        self._name_rows = None
+        if len(ranges) > self.BULK_REMOVE_RANGES:
+            self._remove_rows_bulk(ranges)
+            return
+        # 从后往前删除，前面的行号不受影响
+        for first, last in reversed(ranges):
+            if self._name_index is not None:
+                self._name_index.remove(self._students[first : last + 1])
+            del self._student_ids[first : last + 1]
+            del self._students[first : last + 1]
+            self.removeRows(first, last - first + 1)
+
+    def _remove_rows_bulk(self, ranges: List[tuple]):
+        """一次遍历删除分散的大量行，耗时与名单长度成正比，与删除的行数无关"""
+        removed = bytearray(len(self._students))
+        for first, last in ranges:
+            removed[first : last + 1] = b"\x01" * (last - first + 1)
+        keep = removed.translate(_INVERT_FLAGS)
+        if self._name_index is not None:
+            self._name_index.remove(compress(self._students, removed))
+        # 原地替换，保持与数据存储共用同一个数组对象
+        self._student_ids[:] = id_array(compress(self._student_ids, keep))
+        self._students[:] = compress(self._students, keep)
+        self.setStringList(self._students)
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """按姓名或拼音首字母前缀搜索，返回匹配的姓名"""
+        if self._name_index is None:
+            self._name_index = NameIndex(self._students)
+        return self._name_index.search(prefix, limit)
+
+    def search_rows(self, prefix: str, limit: Optional[int] = None) -> List[int]:
+        """按姓名或拼音首字母前缀搜索，返回匹配的行号；顺序同 search，重名的行按名单顺序排列"""
+        matches = Counter(self.search(prefix, limit))
+        if self._name_rows is None:
+            self._name_rows = {}
+            for row, name in enumerate(self._students):
+                self._name_rows.setdefault(name, []).append(row)
+        rows = []
+        for name, count in matches.items():
+            rows.extend(self._name_rows[name][:count])
+        return rows
+
+    @staticmethod
+    def _contiguous_ranges(rows: Iterable[int]) -> List[tuple]:
+        """把行号合并为升序的 (起始行, 结束行) 区间"""
+        ranges = []
+        for row in sorted(set(rows)):
+            if ranges and row == ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], row)
+            else:
+                ranges.append((row, row))
+        return ranges
@@ -0,0 +1,138 @@
+"""
+加权抽样模块
+
+- AliasSampler：Walker 别名表，适合权重固定的情况，建表 O(n)，每次抽取 O(1)
+- FenwickSampler：树状数组（Fenwick 树），权重可随时修改，修改和抽取都是 O(log n)
+
+两者都返回位置下标（0 到 n-1），由调用方换成学生 ID。权重必须非负且总和大于 0。
+"""
+
+import random
+from typing import List, Sequence
+
+
+class AliasSampler:
+    """Walker 别名表：每个格子保存一个接受概率和一个“别名”位置"""
+
+    def __init__(self, weights: Sequence[float], rng: random.Random = None):
+        self.rng = rng or random.Random()
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("权重总和必须大于 0")
+
+        # 把权重缩放到平均值为 1，再把不足 1 的格子用超过 1 的格子补齐
+        scaled = [weight * n / total for weight in weights]
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large[-1]
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(large.pop())
+        # 剩下的格子因浮点误差略偏离 1，直接视为 1
+
+    def __len__(self) -> int:
+        return len(self.alias)
+
+    def sample(self) -> int:
+        """抽取一个位置"""
+        rng = self.rng
+        slot = rng.randrange(len(self.alias))
+        if rng.random() < self.probability[slot]:
+            return slot
+        return self.alias[slot]
+
+    def samples(self, count: int) -> List[int]:
+        """有放回地抽取 count 个位置"""
+        return [self.sample() for _ in range(count)]
+
+
+class FenwickSampler:
+    """树状数组加权抽样：按前缀和二分定位，支持单点修改权重"""
+
+    def __init__(self, weights: Sequence[float] = (), rng: random.Random = None):
+        self.rng = rng or random.Random()
+        self.weights: List[float] = [float(weight) for weight in weights]
+        n = len(self.weights)
+        # tree[i] 保存 weights[i - lowbit(i), i) 之和（下标从 1 开始），O(n) 建树
+        self.tree = [0.0] + self.weights
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                self.tree[parent] += self.tree[i]
+        self._top = 1 << (n.bit_length() - 1) if n else 0  # 不超过 n 的最大 2 的幂
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def total(self) -> float:
+        """全部权重之和"""
+        total = 0.0
+        i = len(self.weights)
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def update(self, position: int, weight: float):
+        """修改某个位置的权重"""
+        delta = weight - self.weights[position]
+        self.weights[position] = weight
+        i = position + 1
+        n = len(self.weights)
+        while i <= n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, target: float) -> int:
+        """返回前缀和首次超过 target 的位置"""
+        position = 0
+        step = self._top
+        n = len(self.weights)
+        tree = self.tree
+        while step:
+            nxt = position + step
+            if nxt <= n and tree[nxt] <= target:
+                position = nxt
+                target -= tree[nxt]
+            step >>= 1
+        # 浮点误差可能让 target 落在末尾之后，或落在权重为 0 的位置上
+        if position >= n or self.weights[position] <= 0:
+            return self._nearest_positive(min(position, n - 1))
+        return position
+
+    def _nearest_positive(self, position: int) -> int:
+        for i in range(position, -1, -1):
+            if self.weights[i] > 0:
+                return i
+        for i in range(position + 1, len(self.weights)):
+            if self.weights[i] > 0:
+                return i
+        raise ValueError("权重总和必须大于 0")
+
+    def sample(self) -> int:
+        """按权重抽取一个位置"""
+        return self.find(self.rng.random() * self.total())
+
+    def samples(self, count: int, unique: bool = False) -> List[int]:
+        """抽取 count 个位置；unique 为 True 时不重复（抽中后暂时把权重置 0）"""
+        if not unique:
+            return [self.sample() for _ in range(count)]
+        picked = []
+        saved = []
+        try:
+            for _ in range(count):
+                position = self.sample()
+                picked.append(position)
+                saved.append(self.weights[position])
+                self.update(position, 0.0)
+        finally:
+            for position, weight in zip(picked, saved):
+                self.update(position, weight)
+        return picked